@@ -0,0 +1,4 @@
+# Django 시작 시 Celery 앱도 함께 로드되도록 등록 (shared_task가 이 앱을 사용)
+from .celery import app as celery_app
+
+__all__ = ("celery_app",)
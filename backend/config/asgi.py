@@ -9,19 +9,26 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+# 앱 레지스트리를 먼저 초기화해야 consumer에서 모델을 import 할 수 있음
+django_asgi_app = get_asgi_application()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
+from utils.wsauth import JWTAuthMiddleware
 import partyassist.routing
 import game.routing
-
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+import notice.routing
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
+    "http": django_asgi_app,
+    # API와 같은 JWT로 연결할 때 한 번만 인증 (세션 인증은 프론트에서 쓰지 않음)
+    "websocket": JWTAuthMiddleware(
         URLRouter(
             partyassist.routing.websocket_urlpatterns 
             + game.routing.websocket_urlpatterns
+            + notice.routing.websocket_urlpatterns
         )
     ),
 })
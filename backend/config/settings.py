@@ -1,4 +1,5 @@
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -14,6 +15,18 @@ KAKAO_CLIENT_SECRET = os.getenv("KAKAO_CLIENT_SECRET", "")
 
 # AI 인증 키 (환경변수)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")  # 비워 두면 기본 OpenAI 주소
+
+# AI 호출 관문 (utils.aigateway) - 호출 제한 시간(초), 동시 호출 수, 빈 자리 대기 시간(초), 회로 차단 기준
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "15"))
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+AI_ACQUIRE_TIMEOUT = float(os.getenv("AI_ACQUIRE_TIMEOUT", "2"))
+AI_BREAKER_FAILURES = int(os.getenv("AI_BREAKER_FAILURES", "5"))  # 연속 실패 횟수
+AI_BREAKER_RESET = float(os.getenv("AI_BREAKER_RESET", "30"))  # 차단 유지 시간(초)
+
+# 같은 프롬프트의 AI 응답 재사용 (utils.aicache) - 보관 기간 / 최대 보관 개수
+AI_CACHE_TTL = timedelta(days=int(os.getenv("AI_CACHE_TTL_DAYS", "7")))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1000"))
 
 # 로그인 회원가입 기능 활성화 여부
 ENABLE_AUTH = os.getenv("ENABLE_AUTH", "True").lower() == "true"
@@ -62,6 +75,7 @@ INSTALLED_APPS = [
     'signup',
     'users',
     'reserve',
+    'utils',
     'corsheaders',
     "channels",
 ]
@@ -120,6 +134,14 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # 쓰기 잠금을 기다리는 최대 시간(초). 읽고 나서 쓰는 구간은 utils.db.lock_rows로 잠금을 먼저 잡음
+            'timeout': 20,
+        },
+        'TEST': {
+            # 동시성 테스트에서 여러 스레드가 같은 DB를 쓰도록 파일 DB 사용
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -183,6 +205,31 @@ CHANNEL_LAYERS = {
     },
 }
 
+# 캐시 (투표 집계, 라운드/대기실/파티 목록 버전 키 등)
+# 웹 프로세스와 Celery 워커가 같은 값을 봐야 하므로 운영에서는 반드시 CACHE_REDIS_URL(예: redis://127.0.0.1:6379/1) 지정.
+# 지정하지 않은 로컬 개발과 테스트(manage.py test)는 프로세스 메모리(LocMemCache) 사용
+# → 웹/워커를 여러 프로세스로 띄우면 서로 다른 값을 보므로 그때는 꼭 Redis로
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "")
+if CACHE_REDIS_URL and "test" not in sys.argv[1:2]:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Celery (비동기 작업 / 주기 작업)
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
+CELERY_TASK_ACKS_LATE = True  # 워커가 죽으면 작업이 재전달되어 체크포인트부터 이어서 실행
+# 워커 없이 로컬에서 확인할 때는 CELERY_TASK_ALWAYS_EAGER=True 로 즉시 실행
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False").lower() == "true"
+
 CELERY_BEAT_SCHEDULE = {
     "party_open_1day_notices": {
         "task": "notice.tasks.create_party_open_notices",
@@ -192,8 +239,45 @@ CELERY_BEAT_SCHEDULE = {
         "task": "notice.tasks.create_insufficient_party_notices",
         "schedule": 3600.0,  # 1시간마다 실행
     },
+    "party_reminders": {
+        "task": "notice.tasks.schedule_party_reminders",
+        "schedule": 600.0,  # 10분마다 실행
+    },
+    "expire_pending_holds": {
+        "task": "reserve.tasks.expire_pending_holds",
+        "schedule": 300.0,  # 5분마다 실행
+    },
+    "balance_question_pool": {
+        "task": "game.tasks.prefetch_balance_question_sets",
+        "schedule": 900.0,  # 15분마다 실행
+    },
+    "flush_vote_tallies": {
+        "task": "game.tasks.flush_vote_tallies",
+        "schedule": 5.0,  # 5초마다 실행
+    },
+    "close_finished_balance_rounds": {
+        "task": "game.tasks.close_finished_balance_rounds",
+        "schedule": 600.0,  # 10분마다 실행
+    },
 }
 
+# 결제 대기(PENDING_PAYMENT) 신청이 정원을 잡아 둘 수 있는 시간 → 지나면 스윕 작업이 취소 처리
+PARTICIPATION_HOLD_TTL = timedelta(minutes=int(os.getenv("PARTICIPATION_HOLD_TTL_MINUTES", "30")))
+
+# 시작까지 이 시간 이내로 남은 파티는 밸런스게임 문항 세트를 미리 만들어 둠
+BALANCE_POOL_HORIZON_HOURS = int(os.getenv("BALANCE_POOL_HORIZON_HOURS", "6"))
+
+# 파티 시작 후 이 시간이 지나면 밸런스게임 라운드를 종료 (집계 반영 대상에서도 제외)
+BALANCE_ROUND_MAX_HOURS = int(os.getenv("BALANCE_ROUND_MAX_HOURS", "6"))
+
+# 이 시간(초) 동안 들어온 투표를 라운드마다 모아 vote_update 한 번으로 전송
+VOTE_BROADCAST_WINDOW = float(os.getenv("VOTE_BROADCAST_WINDOW", "0.1"))
+# 파티마다 이 시간(초)에 한 번만 standby 인원 변경을 전송
+STANDBY_BROADCAST_WINDOW = float(os.getenv("STANDBY_BROADCAST_WINDOW", "0.2"))
+
+# 대기실 폴링(wait-state)이 바뀐 게 없을 때 다음 요청까지 기다리라고 알려 주는 시간(초, Retry-After)
+WAIT_STATE_RETRY_AFTER = int(os.getenv("WAIT_STATE_RETRY_AFTER", "3"))
+
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
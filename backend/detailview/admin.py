@@ -4,10 +4,21 @@ from django.urls import path
 from django.http import HttpResponseRedirect
 from django.utils.html import format_html
 
+from django import forms
+from django.contrib.admin.helpers import ActionForm
+
 from .models import Place, Tag, Party, Participation
+from .ai_batch import generate_ai_parties
+from .tags import set_party_tags
 from utils.partyAI import generate_party_by_ai
 
 
+class AIPartyBatchActionForm(ActionForm):
+    # 액션 선택 옆에 표시되는 입력칸 (일괄 생성 액션에서만 사용)
+    party_count = forms.IntegerField(label="생성 개수", min_value=1, max_value=200, initial=14, required=False)
+    days = forms.IntegerField(label="기간(일)", min_value=1, max_value=60, initial=7, required=False)
+
+
 @admin.register(Place)
 class PlaceAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'address', 'capacity')
@@ -16,6 +27,27 @@ class PlaceAdmin(admin.ModelAdmin):
 
     # 상단에 커스텀 버튼 추가
     change_list_template = "admin/detailview/place/change_list.html"
+    action_form = AIPartyBatchActionForm
+    actions = ["create_ai_parties_batch"]
+
+    @admin.action(description="선택한 장소에 AI 파티 일괄 생성")
+    def create_ai_parties_batch(self, request, queryset):
+        # ActionForm의 action 선택지는 목록 화면에서만 채워지므로 입력칸 값만 따로 검증
+        fields = AIPartyBatchActionForm.base_fields
+        try:
+            count = fields["party_count"].clean(request.POST.get("party_count")) or 14
+            days = fields["days"].clean(request.POST.get("days")) or 7
+        except forms.ValidationError as e:
+            self.message_user(request, f"입력값을 확인하세요: {' '.join(e.messages)}", level='error')
+            return
+
+        try:
+            result = generate_ai_parties(list(queryset.order_by("pk")), count, days=days)
+        except ValueError as e:
+            self.message_user(request, str(e), level='error')
+            return
+        level = 'success' if result.parties else 'error'
+        self.message_user(request, result.summary(), level=level)
 
     def get_urls(self):
         urls = super().get_urls()
@@ -47,10 +79,8 @@ class PlaceAdmin(admin.ModelAdmin):
                 max_participants=ai_data.get("max_participants", place.capacity or 4)
             )
 
-            # 태그 추가
-            for tag_name in ai_data.get("tags", []):
-                tag_obj, _ = Tag.objects.get_or_create(name=tag_name)
-                party.tags.add(tag_obj)
+            # 태그 추가 (조회/생성/연결을 한 번에)
+            set_party_tags({party: ai_data.get("tags", [])})
 
             self.message_user(request, f"랜덤 장소 '{place.name}'에 AI 파티가 생성되었습니다.")
         except Exception as e:
@@ -83,8 +113,9 @@ class PartyAdmin(admin.ModelAdmin):
     inlines = [ParticipationInline]
 
     def get_applied_count(self, obj):
-        return obj.participations.count()
+        return obj.applied_count
     get_applied_count.short_description = '신청 인원'
+    get_applied_count.admin_order_field = 'applied_count'
 
 
 @admin.register(Participation)
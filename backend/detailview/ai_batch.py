@@ -0,0 +1,117 @@
+"""
+AI 파티 일괄 생성 (관리자 액션 / generate_ai_parties 명령).
+AI 호출은 스레드로 동시에(최대 AI_MAX_CONCURRENCY개) 보내고,
+Party/태그 연결은 bulk_create로 한 번에 저장
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from notice.tasks import create_new_party_notices
+from utils.partyAI import generate_party_by_ai
+from .caching import bump_party_list_version
+from .models import Party
+from .tags import set_party_tags
+
+SLOT_HOURS = (18, 19, 20, 21)  # 파티 시작 시각 후보 (저녁 시간대)
+
+
+@dataclass
+class BatchResult:
+    requested: int
+    parties: list = field(default_factory=list)
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self):
+        """초당 생성한 파티 수"""
+        return len(self.parties) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f"AI 파티 {len(self.parties)}/{self.requested}개 생성 (실패 {self.failed}), "
+            f"{self.elapsed:.1f}초, 초당 {self.throughput:.1f}개"
+        )
+
+
+def plan_slots(places, count, days):
+    """
+    장소를 돌아가며 내일부터 days일 동안 저녁 시간대에 고르게 배치한 (장소, 시작 시각) 목록.
+    시각을 먼저 한 바퀴 모두 쓰고, 다음 바퀴에서는 장소를 한 칸씩 밀어서 (장소, 시각)이 겹치지 않게 함.
+    만들 수 있는 칸(장소 수 × days × 시간대 수)보다 많이 요청하면 ValueError
+    """
+    times = days * len(SLOT_HOURS)
+    if count > len(places) * times:
+        raise ValueError(
+            f"장소 {len(places)}곳, {days}일 동안 겹치지 않게 만들 수 있는 파티는 최대 {len(places) * times}개입니다."
+        )
+    tomorrow = timezone.localtime().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slots = []
+    for i in range(count):
+        round_, t = divmod(i, times)
+        slots.append((
+            places[(t + round_) % len(places)],
+            tomorrow.replace(hour=SLOT_HOURS[t // days]) + timedelta(days=t % days),
+        ))
+    return slots
+
+
+def _draft(slot):
+    place, start_time = slot
+    try:
+        # 일괄 생성은 매번 새 초안이 필요하므로 응답 캐시를 쓰지 않음 (다시 돌려도 같은 파티가 복제되지 않게)
+        return generate_party_by_ai(place, start_time=start_time, use_cache=False)
+    finally:
+        connection.close()  # 스레드에서 연 DB 연결 정리
+
+
+def _to_int(value, default):
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def generate_ai_parties(places, count, days=7, workers=None):
+    """places에 count개의 AI 파티를 만들고 BatchResult 반환 (칸이 모자라면 plan_slots의 ValueError)"""
+    started = time.monotonic()
+    result = BatchResult(requested=count)
+    slots = plan_slots(list(places), count, days)
+    workers = min(workers or settings.AI_MAX_CONCURRENCY, settings.AI_MAX_CONCURRENCY, max(count, 1))
+
+    # AI 호출만 동시에 (관문의 동시 호출 제한을 넘지 않게 스레드 수를 맞춤)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        drafts = list(pool.map(_draft, slots))
+
+    planned = []
+    for (place, start_time), data in zip(slots, drafts):
+        if not data:
+            result.failed += 1
+            continue
+        party = Party(
+            place=place,
+            title=str(data.get("title") or f"{place.name} AI 파티")[:50],
+            description=data.get("description") or "AI가 생성한 파티입니다.",
+            start_time=start_time,
+            max_participants=_to_int(data.get("max_participants"), place.capacity or 4),
+        )
+        planned.append((party, data.get("tags") or []))
+
+    with transaction.atomic():
+        parties = Party.objects.bulk_create([party for party, _ in planned])
+
+        set_party_tags({party: tags for party, tags in planned})
+
+        # bulk_create는 signal이 없으므로 새 파티 알림/목록 캐시 갱신을 직접 처리
+        create_new_party_notices(parties)
+        transaction.on_commit(bump_party_list_version)
+
+    result.parties = parties
+    result.elapsed = time.monotonic() - started
+    return result
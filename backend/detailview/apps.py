@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DetailviewConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'detailview'
+
+    def ready(self):
+        import detailview.signals
@@ -0,0 +1,66 @@
+"""
+파티 목록(home/map) 응답 캐시의 버전 관리.
+- 목록 전체 버전(party_list_version): 어떤 파티가 목록에 들어가는지/장소·태그 표시가 바뀔 때 (파티/장소/태그 변경, 드묾)
+- 파티별 버전(party_version:<id>): 목록에 보이는 신청 인원(applied_count)이 바뀔 때 (참가 신청/취소, 잦음)
+캐시 항목은 담긴 파티들의 버전을 함께 저장해 두고, 그중 하나라도 바뀌었을 때만 다시 만듦
+→ 한 파티의 참가 신청이 그 파티가 없는 목록(다른 장소/날짜/태그)까지 무효화하지 않음
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+PARTY_LIST_VERSION_KEY = "party_list_version"
+PARTY_LIST_CACHE_TTL = 60  # 지난 파티 제외(start_time >= now) 반영을 위해 짧게 유지
+PARTY_LIST_PARAMS = ("place_id", "date_from", "date_to", "tag", "ordering")
+
+
+def _incr_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:  # 키가 없으면 새로 시작
+        cache.add(key, 1, timeout=None)
+
+
+def _party_version_key(party_id):
+    return f"party_version:{party_id}"
+
+
+def get_party_list_version():
+    return cache.get_or_set(PARTY_LIST_VERSION_KEY, 1, timeout=None)
+
+
+def bump_party_list_version():
+    """파티/태그/장소가 바뀌면 호출 → 이전 버전으로 저장된 목록 캐시는 더 이상 사용되지 않음"""
+    _incr_version(PARTY_LIST_VERSION_KEY)
+
+
+def bump_party_version(*party_ids):
+    """파티의 신청 인원이 바뀌면 호출 → 이 파티가 들어 있는 목록 캐시만 다시 만듦"""
+    for party_id in party_ids:
+        _incr_version(_party_version_key(party_id))
+
+
+def get_party_versions(party_ids):
+    """{파티 id: 버전} (캐시 조회 1번, 아직 바뀐 적 없으면 None)"""
+    found = cache.get_many([_party_version_key(pid) for pid in party_ids])
+    return {pid: found.get(_party_version_key(pid)) for pid in party_ids}
+
+
+def party_list_cache_key(request):
+    # 사진 URL이 절대 주소로 나가므로 호스트도 키에 포함
+    params = [request.build_absolute_uri("/")]
+    params += [request.query_params.get(name, "") for name in PARTY_LIST_PARAMS]
+    digest = hashlib.md5("|".join(params).encode()).hexdigest()
+    return f"party_list:{get_party_list_version()}:{digest}"
+
+
+def make_etag(data):
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+    return '"%s"' % hashlib.md5(body.encode()).hexdigest()
+
+
+def etag_matches(request, etag):
+    header = request.headers.get("If-None-Match", "")
+    return header.strip() == "*" or etag in [t.strip() for t in header.split(",")]
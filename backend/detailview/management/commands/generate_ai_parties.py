@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from detailview.ai_batch import generate_ai_parties
+from detailview.models import Place
+
+
+class Command(BaseCommand):
+    help = "AI로 파티를 여러 개 한 번에 생성합니다. (장소를 돌아가며 앞으로 며칠 동안 저녁 시간대에 배치)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=20, help="생성할 파티 수")
+        parser.add_argument("--place", type=int, action="append", dest="places", help="장소 id (여러 번 지정 가능, 생략 시 전체)")
+        parser.add_argument("--days", type=int, default=7, help="파티를 배치할 기간(일)")
+        parser.add_argument("--workers", type=int, default=None, help="동시 AI 호출 수 (최대 AI_MAX_CONCURRENCY)")
+
+    def handle(self, *args, **options):
+        places = Place.objects.all()
+        if options["places"]:
+            places = places.filter(pk__in=options["places"])
+        places = list(places.order_by("pk"))
+        if not places:
+            raise CommandError("장소가 하나도 없습니다. 먼저 Place를 등록하세요.")
+        if options["count"] < 1 or options["days"] < 1:
+            raise CommandError("--count와 --days는 1 이상이어야 합니다.")
+
+        try:
+            result = generate_ai_parties(places, options["count"], days=options["days"], workers=options["workers"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(result.summary()))
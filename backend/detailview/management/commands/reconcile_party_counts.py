@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from detailview.caching import bump_party_version
+from detailview.models import Party
+
+
+class Command(BaseCommand):
+    help = "Party의 applied/confirmed/pending/standby_count를 실제 참가 기록 기준으로 다시 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="어긋난 파티 수만 출력하고 수정하지 않음")
+
+    def handle(self, *args, **options):
+        expected = Party.count_expressions()
+
+        mismatch = Q()
+        for field in expected:
+            mismatch |= ~Q(**{field: F(f"expected_{field}")})
+
+        drifted_ids = list(
+            Party.objects
+            .annotate(**{f"expected_{field}": expr for field, expr in expected.items()})
+            .filter(mismatch)
+            .values_list("pk", flat=True)
+        )
+        if not drifted_ids:
+            self.stdout.write("어긋난 인원 집계가 없습니다.")
+            return
+
+        if options["dry_run"]:
+            self.stdout.write(f"인원 집계가 어긋난 파티 {len(drifted_ids)}개: {drifted_ids}")
+            return
+
+        Party.objects.filter(pk__in=drifted_ids).update(**expected)
+        bump_party_version(*drifted_ids)
+        self.stdout.write(self.style.SUCCESS(f"파티 {len(drifted_ids)}개의 인원 집계를 복구했습니다."))
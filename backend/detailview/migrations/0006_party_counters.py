@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_party_counts(apps, schema_editor):
+    Party = apps.get_model("detailview", "Party")
+    Participation = apps.get_model("detailview", "Participation")
+
+    def count(**filters):
+        return Coalesce(Subquery(
+            Participation.objects
+            .filter(party=OuterRef("pk"), **filters)
+            .order_by()
+            .values("party")
+            .annotate(c=Count("pk"))
+            .values("c")
+        ), 0)
+
+    Party.objects.update(
+        applied_count=count(),
+        confirmed_count=count(status="CONFIRMED"),
+        standby_count=count(is_standby=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0005_place_map'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='party',
+            name='applied_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='신청 인원'),
+        ),
+        migrations.AddField(
+            model_name='party',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='확정 인원'),
+        ),
+        migrations.AddField(
+            model_name='party',
+            name='standby_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='대기 인원'),
+        ),
+        migrations.RunPython(backfill_party_counts, migrations.RunPython.noop),
+    ]
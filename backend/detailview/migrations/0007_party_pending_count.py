@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_pending_count(apps, schema_editor):
+    Party = apps.get_model("detailview", "Party")
+    Participation = apps.get_model("detailview", "Participation")
+
+    Party.objects.update(pending_count=Coalesce(Subquery(
+        Participation.objects
+        .filter(party=OuterRef("pk"), status="PENDING_PAYMENT")
+        .order_by()
+        .values("party")
+        .annotate(c=Count("pk"))
+        .values("c")
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0006_party_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='party',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='결제 대기 인원'),
+        ),
+        migrations.RunPython(backfill_pending_count, migrations.RunPython.noop),
+    ]
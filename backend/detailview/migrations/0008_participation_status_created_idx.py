@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:19
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_applied_without_canceled(apps, schema_editor):
+    Party = apps.get_model("detailview", "Party")
+    Participation = apps.get_model("detailview", "Participation")
+
+    Party.objects.update(applied_count=Coalesce(Subquery(
+        Participation.objects
+        .filter(party=OuterRef("pk"))
+        .exclude(status="CANCELED")
+        .order_by()
+        .values("party")
+        .annotate(c=Count("pk"))
+        .values("c")
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0007_party_pending_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['status', 'created_at'], name='detailview__status_d2ba44_idx'),
+        ),
+        migrations.RunPython(recount_applied_without_canceled, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,13 @@
 from django.db import models
+from django.db.models import F, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.templatetags.static import static
 
+from .caching import bump_party_version
+
 class Place(models.Model): # 장소에 대한 기본 정보 저장
     name = models.CharField(max_length=30)
     address = models.CharField(max_length=50, default="", blank=True)
@@ -41,9 +46,52 @@ class Party(models.Model): # AI와 Place를 연결하여 랜덤으로 파티 생
     created_at = models.DateTimeField(auto_now_add=True) # created_at을 기준으로 start_time이 더 이후여야 함
     is_approved = models.BooleanField(default=True)  # 해커톤에선 기본 True
     is_cancelled = models.BooleanField(default=False)  # ✅ 취소 여부
+
+    # 참가 인원 집계 (Participation 변경 시 F()로 함께 갱신, 어긋나면 reconcile_party_counts 명령으로 복구)
+    applied_count = models.PositiveIntegerField("신청 인원", default=0)
+    confirmed_count = models.PositiveIntegerField("확정 인원", default=0)
+    pending_count = models.PositiveIntegerField("결제 대기 인원", default=0)  # 만료 전까지 정원을 차지
+    standby_count = models.PositiveIntegerField("대기 인원", default=0)
     
     def __str__(self): return f"{self.title} @ {self.place.name}"
 
+    @property
+    def held_seats(self):
+        """정원 계산에 쓰이는 점유 좌석 수 (확정 + 결제 대기)"""
+        return self.confirmed_count + self.pending_count
+
+    @classmethod
+    def adjust_counts(cls, party_id, **deltas):
+        """
+        인원 집계를 DB에서 원자적으로 증감 (예: applied_count=1). 변화가 없으면 쿼리하지 않음.
+        목록에 보이는 신청 인원이 바뀌면 그 파티의 목록 캐시 버전도 올림
+        """
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if changes:
+            cls.objects.filter(pk=party_id).update(**changes)
+        if deltas.get("applied_count"):
+            bump_party_version(party_id)
+
+    @classmethod
+    def count_expressions(cls):
+        """실제 참가 기록 기준 인원 집계 (reconcile 용)"""
+        def count(**filters):
+            return Coalesce(Subquery(
+                Participation.objects
+                .filter(party=OuterRef("pk"), **filters)
+                .order_by()
+                .values("party")
+                .annotate(c=Count("pk"))
+                .values("c")
+            ), 0)
+
+        return {
+            "applied_count": count(status__in=Participation.ACTIVE_STATUSES),
+            "confirmed_count": count(status=Participation.Status.CONFIRMED),
+            "pending_count": count(status=Participation.Status.PENDING_PAYMENT),
+            "standby_count": count(is_standby=True, status__in=Participation.ACTIVE_STATUSES),
+        }
+
 
 class Participation(models.Model): # 개별 파티마다의 참여자 저장
     class Status(models.TextChoices):
@@ -58,8 +106,35 @@ class Participation(models.Model): # 개별 파티마다의 참여자 저장
     created_at = models.DateTimeField(auto_now_add=True) # 참여 신청 시각 (이걸기반으로 결제 대기 시간 제한)
     paid_at = models.DateTimeField("결제일시", null=True, blank=True) # 결제 완료 시각
 
+    # 취소(만료 포함)된 참가는 신청 인원/같은 날 신청 제한에서 제외
+    ACTIVE_STATUSES = [Status.PENDING_PAYMENT, Status.CONFIRMED]
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['party', 'user'], name='unique_participation_per_party')
         ]
-        
\ No newline at end of file
+        indexes = [
+            models.Index(fields=["status", "created_at"]),  # 결제 대기 만료 스윕용
+        ]
+
+    @classmethod
+    def expired_holds(cls, now=None):
+        """결제 대기 시간(PARTICIPATION_HOLD_TTL)이 지난 신청"""
+        cutoff = (now or timezone.now()) - settings.PARTICIPATION_HOLD_TTL
+        return cls.objects.filter(status=cls.Status.PENDING_PAYMENT, created_at__lt=cutoff)
+
+    @property
+    def is_hold_expired(self):
+        return (
+            self.status == self.Status.PENDING_PAYMENT
+            and self.created_at < timezone.now() - settings.PARTICIPATION_HOLD_TTL
+        )
+
+    def count_contribution(self):
+        """이 참가가 Party 인원 집계 컬럼마다 더하는 값"""
+        return {
+            "applied_count": 1 if self.status in self.ACTIVE_STATUSES else 0,
+            "confirmed_count": 1 if self.status == self.Status.CONFIRMED else 0,
+            "pending_count": 1 if self.status == self.Status.PENDING_PAYMENT else 0,
+            "standby_count": 1 if self.is_standby and self.status in self.ACTIVE_STATUSES else 0,
+        }
@@ -13,7 +13,7 @@ class PartyListSerializer(serializers.ModelSerializer):
     place_id = serializers.IntegerField(source="place.id", read_only=True)
     place_name = serializers.CharField(source="place.name", read_only=True)
     place_photo = serializers.SerializerMethodField()
-    applied_count = serializers.SerializerMethodField()
+    applied_count = serializers.IntegerField(read_only=True)
     max_participants = serializers.IntegerField(read_only=True)
     place_x_norm = serializers.FloatField(source="place.x_norm", read_only=True)
     place_y_norm = serializers.FloatField(source="place.y_norm", read_only=True)
@@ -40,13 +40,7 @@ class PartyListSerializer(serializers.ModelSerializer):
         url = obj.place.get_photo_url() if obj.place else None
         return request.build_absolute_uri(url) if (request and url) else url
 
-    def get_applied_count(self, obj):
-        val = getattr(obj, "applied_count", None)
-        if val is not None:
-            return val
-        return obj.participations.count()
 
-        
 class PartyDetailSerializer(serializers.ModelSerializer):
     place_id = serializers.IntegerField(source="place.id", read_only=True)
     place_photo = serializers.ImageField(source="place.photo", read_only=True)
@@ -56,7 +50,7 @@ class PartyDetailSerializer(serializers.ModelSerializer):
     place_map = serializers.ImageField(source="place.map", read_only=True)
     # --- SlugRelatedField를 TagSerializer로 변경 ---
     tags = TagSerializer(many=True, read_only=True)
-    applied_count = serializers.SerializerMethodField()
+    applied_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Party
@@ -80,12 +74,7 @@ class PartyDetailSerializer(serializers.ModelSerializer):
         url = obj.place.get_photo_url() if obj.place else None
         return request.build_absolute_uri(url) if (request and url) else url
 
-    def get_applied_count(self, obj):
-        val = getattr(obj, "applied_count", None)
-        if val is not None:
-            return val
-        return obj.participations.count()
-    
+
 class PartyCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Party
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_init, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Place, Tag, Party, Participation
+from .caching import bump_party_list_version
+from .tags import clear_tag_id_cache
+
+
+# 파티 목록(home/map)에 들어가는 파티나 장소/태그 표시가 바뀌면 목록 캐시 전체 버전 증가
+# (참가 변경은 신청 인원만 바꾸므로 Party.adjust_counts에서 그 파티 버전만 올림)
+@receiver([post_save, post_delete], sender=Party)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Place)
+def invalidate_party_list(sender, **kwargs):
+    bump_party_list_version()
+
+
+# 태그 이름 → id 캐시 비우기
+@receiver([post_save, post_delete], sender=Tag)
+def forget_cached_tag_ids(sender, **kwargs):
+    clear_tag_id_cache()
+
+
+@receiver(m2m_changed, sender=Party.tags.through)
+def invalidate_party_list_on_tags(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_party_list_version()
+
+
+# Party 인원 집계(applied/confirmed/pending/standby_count) 유지 - 값은 Participation.count_contribution 기준
+# - applied_count: 결제 대기(PENDING_PAYMENT, 정원을 잡아 둔 신청) + 확정(CONFIRMED)
+# - pending_count / confirmed_count: 각 상태의 인원
+# - standby_count: 위 두 상태 중 is_standby인 인원
+# 취소(CANCELED, 직접 취소/결제 대기 만료)로 바뀌면 모든 집계에서 빠짐
+# 불러온 시점의 상태를 기억해 두었다가 저장/삭제 시 차이만큼 F()로 증감
+# (queryset.update()/bulk_create는 signal이 없으므로 호출하는 쪽에서 Party.adjust_counts 사용
+#  - 예: 결제 대기 만료 스윕(reserve.tasks), standby 토글(partyassist.views))
+@receiver(post_init, sender=Participation)
+def remember_participation_counts(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._counted = {}
+    elif {"status", "is_standby"} & instance.get_deferred_fields():
+        instance._counted = None  # 상태를 모르면 집계하지 않음 (reconcile로 복구)
+    else:
+        instance._counted = instance.count_contribution()
+
+
+@receiver(post_save, sender=Participation)
+def update_party_counts_on_save(sender, instance, created, **kwargs):
+    before = {} if created else instance._counted
+    after = instance.count_contribution()
+    if before is not None:
+        Party.adjust_counts(
+            instance.party_id,
+            **{field: count - before.get(field, 0) for field, count in after.items()},
+        )
+    instance._counted = after
+
+
+@receiver(post_delete, sender=Participation)
+def update_party_counts_on_delete(sender, instance, **kwargs):
+    if instance._counted is not None:
+        Party.adjust_counts(
+            instance.party_id,
+            **{field: -count for field, count in instance._counted.items()},
+        )
@@ -0,0 +1,93 @@
+"""
+태그 이름 → Tag id 변환을 한 번에 처리하는 도우미.
+태그마다 get_or_create + tags.add 하던 것을 조회/생성/연결 각각 한 번의 쿼리로 줄임
+"""
+import re
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .caching import bump_party_list_version
+from .models import Party, Tag
+
+TAG_NAME_MAX_LENGTH = Tag._meta.get_field("name").max_length
+
+TAG_VERSION_KEY = "tag_registry_version"
+
+# 프로세스 안에서 재사용하는 이름 → id (태그는 거의 바뀌지 않으므로 변경/삭제 시 signals에서 통째로 비움)
+# 다른 프로세스(관리자 워커 등)에서 바뀐 것은 공유 캐시의 버전으로 알아채고 비움
+_tag_ids = {}
+_tag_ids_version = None
+
+
+def clear_tag_id_cache():
+    """이 프로세스의 캐시를 비우고 공유 버전을 올려 다른 프로세스도 다음 조회 때 비우게 함"""
+    _tag_ids.clear()
+    cache.add(TAG_VERSION_KEY, 0, None)
+    try:
+        cache.incr(TAG_VERSION_KEY)
+    except ValueError:  # 그 사이 캐시에서 지워진 경우
+        cache.set(TAG_VERSION_KEY, 1, None)
+
+
+def _sync_tag_id_cache():
+    """공유 버전이 마지막으로 본 값과 다르면 이 프로세스의 캐시를 비움 (캐시 조회 1번, DB 조회 없음)"""
+    global _tag_ids_version
+    version = cache.get(TAG_VERSION_KEY, 0)
+    if version != _tag_ids_version:
+        _tag_ids.clear()
+        _tag_ids_version = version
+
+
+def normalize_tag_name(name):
+    """'#EDM ' → 'EDM' (앞의 #, 연속 공백 정리, 최대 길이로 자름)"""
+    name = re.sub(r"\s+", " ", str(name or "")).strip().lstrip("#").strip()
+    return name[:TAG_NAME_MAX_LENGTH]
+
+
+def normalize_tag_names(names):
+    """정리한 이름 목록 (빈 이름 제거, 순서 유지하며 중복 제거)"""
+    return list(dict.fromkeys(n for n in map(normalize_tag_name, names or []) if n))
+
+
+def resolve_tag_ids(names):
+    """
+    정리된 태그 이름들의 {이름: id}. 없는 태그는 만듦.
+    캐시에 없는 이름만 조회 1번, 그래도 없으면 생성 1번(동시 생성은 무시) + 조회 1번
+    """
+    _sync_tag_id_cache()
+    resolved = {name: _tag_ids[name] for name in names if name in _tag_ids}
+    missing = [name for name in names if name not in resolved]
+    if missing:
+        found = dict(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+        to_create = [name for name in missing if name not in found]
+        if to_create:
+            Tag.objects.bulk_create([Tag(name=name) for name in to_create], ignore_conflicts=True)
+            found.update(Tag.objects.filter(name__in=to_create).values_list("name", "id"))
+        resolved.update(found)
+        # 롤백되면 없는 id가 캐시에 남으므로 커밋된 뒤에 캐시 (트랜잭션 밖이면 바로 실행)
+        transaction.on_commit(lambda: _tag_ids.update(found))
+    return resolved
+
+
+def set_party_tags(tags_by_party):
+    """
+    {party: [태그 이름, ...]}의 태그를 한 번에 연결 (through 테이블 bulk_create 1번).
+    m2m_changed가 없으므로 목록 캐시 버전은 여기서 올림
+    """
+    names_by_party = {party: normalize_tag_names(names) for party, names in tags_by_party.items()}
+    all_names = list(dict.fromkeys(n for names in names_by_party.values() for n in names))
+    if not all_names:
+        return
+
+    tag_ids = resolve_tag_ids(all_names)
+    PartyTag = Party.tags.through
+    PartyTag.objects.bulk_create(
+        [
+            PartyTag(party_id=party.pk, tag_id=tag_ids[name])
+            for party, names in names_by_party.items()
+            for name in names
+        ],
+        ignore_conflicts=True,
+    )
+    transaction.on_commit(bump_party_list_version)
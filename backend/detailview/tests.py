@@ -1,12 +1,19 @@
+from io import StringIO
 from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.core.cache import cache
 import datetime
 
-from .models import Place, Party, Tag
+from notice.models import Notice
+from .models import Place, Party, Tag, Participation
+from . import tags
+from .tags import clear_tag_id_cache, set_party_tags
 
 User = get_user_model()
 
@@ -52,8 +59,8 @@ class AIPartyCreateAPITest(APITestCase):
         self.assertEqual(party.max_participants, 8)
 
         # 3) 태그 생성 및 연결 검증
-        self.assertTrue(Tag.objects.filter(name="#EDM").exists())
-        self.assertTrue(Tag.objects.filter(name="#코딩").exists())
+        self.assertTrue(Tag.objects.filter(name="EDM").exists())  # AI가 붙인 #은 빼고 저장
+        self.assertTrue(Tag.objects.filter(name="코딩").exists())
         self.assertEqual(party.tags.count(), 2)
 
         # 4) 모킹 함수 호출 검증
@@ -93,4 +100,242 @@ class AIPartyCreateAPITest(APITestCase):
         response = self.client.post(self.url, {"place_id": self.place.id}, format='json')
         self.assertIn(response.status_code, {status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN})
         self.assertFalse(Party.objects.exists())
-        
\ No newline at end of file
+        
+
+class PartyListCacheTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='listuser', password='password123')
+        cls.place = Place.objects.create(name='테스트 장소', capacity=10)
+        cls.party = Party.objects.create(
+            place=cls.place,
+            title='캐시 파티',
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('homemap:home-parties')
+
+    def test_repeated_list_is_served_from_cache(self):
+        """같은 필터로 다시 조회하면 DB를 조회하지 않음"""
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_participation_write_invalidates_list(self):
+        """참가 신청이 생기면 applied_count가 바로 반영"""
+        self.assertEqual(self.client.get(self.url).data[0]['applied_count'], 0)
+
+        Participation.objects.create(party=self.party, user=self.user)
+
+        self.assertEqual(self.client.get(self.url).data[0]['applied_count'], 1)
+
+    def test_join_elsewhere_keeps_unrelated_lists_cached(self):
+        """다른 파티의 참가 신청은 그 파티가 없는 목록 캐시를 무효화하지 않음"""
+        other = Party.objects.create(
+            place=Place.objects.create(name='다른 장소', capacity=4),
+            title='다른 파티',
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+        params = {'place_id': self.place.id}
+        self.client.get(self.url, params)
+
+        Participation.objects.create(party=other, user=self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, params).data[0]['id'], self.party.id)
+
+    def test_unchanged_list_returns_304(self):
+        """If-None-Match가 현재 ETag와 같으면 304"""
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.party.tags.add(Tag.objects.create(name='새태그'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_filters_have_separate_cache_entries(self):
+        """필터 조합마다 따로 캐시"""
+        other_place = Place.objects.create(name='다른 장소', capacity=4)
+
+        self.assertEqual(len(self.client.get(self.url).data), 1)
+        self.assertEqual(len(self.client.get(self.url, {'place_id': other_place.id}).data), 0)
+
+
+class PartyCounterTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f'counter{i}', email=f'counter{i}@test.com', password='password123')
+            for i in range(3)
+        ]
+        cls.place = Place.objects.create(name='테스트 장소', capacity=10)
+
+    def setUp(self):
+        self.party = Party.objects.create(
+            place=self.place,
+            title='집계 파티',
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+
+    def _counts(self):
+        self.party.refresh_from_db()
+        return (self.party.applied_count, self.party.confirmed_count, self.party.standby_count)
+
+    def test_counts_follow_participation_transitions(self):
+        """신청 → 확정 → 대기 → 삭제 흐름마다 집계 컬럼 갱신"""
+        p1 = Participation.objects.create(party=self.party, user=self.users[0])
+        p2 = Participation.objects.create(party=self.party, user=self.users[1])
+        self.assertEqual(self._counts(), (2, 0, 0))
+
+        p1.status = Participation.Status.CONFIRMED
+        p1.save(update_fields=['status'])
+        p1.is_standby = True
+        p1.save()
+        self.assertEqual(self._counts(), (2, 1, 1))
+
+        p1.save()  # 변경 없음 → 그대로
+        self.assertEqual(self._counts(), (2, 1, 1))
+
+        Participation.objects.get(pk=p1.pk).delete()
+        p2.delete()
+        self.assertEqual(self._counts(), (0, 0, 0))
+
+    def test_reconcile_command_repairs_drift(self):
+        """reconcile_party_counts가 실제 참가 기록 기준으로 복구"""
+        Participation.objects.create(
+            party=self.party, user=self.users[0],
+            status=Participation.Status.CONFIRMED, is_standby=True,
+        )
+        Party.objects.filter(pk=self.party.pk).update(applied_count=7, confirmed_count=0, standby_count=3)
+
+        call_command('reconcile_party_counts', stdout=StringIO())
+
+        self.assertEqual(self._counts(), (1, 1, 1))
+
+
+class AIPartyBatchTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.places = [Place.objects.create(name=f'장소{i}', capacity=6) for i in range(2)]
+        Tag.objects.create(name='친목')
+
+    def setUp(self):
+        cache.clear()
+        clear_tag_id_cache()
+
+    @staticmethod
+    def _fake_ai(place, start_time=None, use_cache=True):
+        if place.name == '장소1' and start_time.day % 2:
+            return {}  # 일부 AI 실패
+        return {
+            'title': f'{place.name} 저녁 모임',
+            'description': '같이 놀아요',
+            'max_participants': '5',
+            'tags': ['친목', '보드게임', ' '],
+        }
+
+    @patch('detailview.ai_batch.generate_party_by_ai')
+    def test_command_bulk_creates_parties_tags_and_notices(self, mock_generate):
+        """여러 파티를 한 번에 만들고 태그 연결/새 파티 알림까지 처리"""
+        mock_generate.side_effect = self._fake_ai
+        out = StringIO()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('generate_ai_parties', '--count', '8', '--days', '4', stdout=out)
+
+        created = Party.objects.all()
+        failed = 8 - created.count()
+        self.assertEqual(mock_generate.call_count, 8)
+        self.assertIn(f'{created.count()}/8', out.getvalue())
+        self.assertIn(f'실패 {failed}', out.getvalue())
+        self.assertEqual(set(created.values_list('place__name', flat=True)) - {'장소1'}, {'장소0'})
+        self.assertTrue(all(p.max_participants == 5 for p in created))
+        self.assertEqual(len({p.start_time for p in created}), created.count())  # 시간대가 겹치지 않음
+        self.assertEqual(Tag.objects.filter(name__in=['친목', '보드게임']).count(), 2)
+        self.assertFalse(Tag.objects.filter(name='').exists())
+        self.assertTrue(all(p.tags.count() == 2 for p in created))
+        self.assertEqual(Notice.objects.filter(notice_type=Notice.PARTY_NEW).count(), created.count())
+        self.assertTrue(all(call.kwargs['use_cache'] is False for call in mock_generate.call_args_list))
+
+    @patch('detailview.ai_batch.generate_party_by_ai')
+    def test_slots_never_repeat_and_overflow_is_rejected(self, mock_generate):
+        """(장소, 시각) 칸이 겹치지 않고, 칸 수보다 많이 요청하면 AI를 부르기 전에 거절"""
+        from .ai_batch import SLOT_HOURS, plan_slots
+        capacity = len(self.places) * 2 * len(SLOT_HOURS)
+
+        slots = plan_slots(self.places, capacity, days=2)
+        self.assertEqual(len(set(slots)), capacity)
+
+        with self.assertRaises(CommandError):
+            call_command('generate_ai_parties', '--count', str(capacity + 1), '--days', '2', stdout=StringIO())
+        mock_generate.assert_not_called()
+
+    @patch('detailview.ai_batch.generate_party_by_ai')
+    def test_query_count_does_not_grow_with_batch_size(self, mock_generate):
+        """파티 수가 늘어도 저장 쿼리 수는 그대로"""
+        mock_generate.side_effect = self._fake_ai
+        Tag.objects.create(name='보드게임')
+        from .ai_batch import generate_ai_parties
+
+        with self.assertNumQueries(6):  # savepoint, 파티, 태그 조회, 태그 연결, 알림, release
+            generate_ai_parties([self.places[0]], 2)
+        with self.assertNumQueries(6):
+            generate_ai_parties([self.places[0]], 20)
+
+
+class TagRegistryTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        place = Place.objects.create(name='태그 장소', capacity=10)
+        start_time = timezone.now() + datetime.timedelta(days=2)
+        cls.parties = [Party.objects.create(place=place, title=f'태그 파티{i}', start_time=start_time) for i in range(2)]
+        Tag.objects.create(name='EDM')
+
+    def setUp(self):
+        clear_tag_id_cache()
+
+    def test_names_are_normalized_and_deduplicated(self):
+        """#과 공백을 정리하고 같은 태그는 한 번만 연결"""
+        set_party_tags({self.parties[0]: ['#EDM', 'EDM ', '#코딩', '', '#']})
+
+        self.assertEqual(sorted(self.parties[0].tags.values_list('name', flat=True)), ['EDM', '코딩'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_whole_tag_list_resolved_with_constant_queries(self):
+        """태그 수와 관계없이 조회/생성/재조회/연결 4번, 캐시가 채워지면 연결 1번"""
+        names = ['EDM'] + [f'태그{i}' for i in range(10)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(4):
+                set_party_tags({self.parties[0]: names})
+        with self.assertNumQueries(1):
+            set_party_tags({self.parties[1]: names})
+
+        self.assertEqual(self.parties[1].tags.count(), 11)
+
+    def test_tag_change_in_another_process_is_noticed(self):
+        """다른 프로세스에서 태그가 삭제/재생성되면 공유 버전으로 알아채고 다시 조회"""
+        with self.captureOnCommitCallbacks(execute=True):
+            set_party_tags({self.parties[0]: ['EDM']})
+
+        # 다른 프로세스: 태그를 지우고 다시 만듦 (이 프로세스의 캐시에는 옛 id가 남아 있다고 가정)
+        old_id = Tag.objects.get(name='EDM').id
+        Tag.objects.filter(name='EDM').delete()
+        new_id = Tag.objects.create(name='EDM').id
+        tags._tag_ids['EDM'] = old_id
+
+        set_party_tags({self.parties[1]: ['EDM']})
+
+        self.assertEqual(list(self.parties[1].tags.values_list('id', flat=True)), [new_id])
@@ -10,7 +10,14 @@ from django.db import transaction
 from detailview.models import Party, Place, Tag
 from utils.partyAI import generate_party_by_ai
 from django.utils import timezone
+from django.core.cache import cache
 from rest_framework import generics
+from reserve.models import Payment
+from users import points
+from users.models import PointTransaction
+from utils.db import lock_rows
+from .tags import set_party_tags
+from .caching import get_party_versions, party_list_cache_key, make_etag, etag_matches, PARTY_LIST_CACHE_TTL
 
 
 class PartyViewSet(viewsets.ReadOnlyModelViewSet):
@@ -24,8 +31,7 @@ class PartyViewSet(viewsets.ReadOnlyModelViewSet):
         qs =(
             Party.objects
             .select_related("place")
-            .prefetch_related("tags", "participations__user")
-            .annotate(applied_count=Count("participations",distinct=True))
+            .prefetch_related("tags")
             .filter(start_time__gte=timezone.now())   # ✅ 지난 파티 제외
         )
 
@@ -49,6 +55,24 @@ class PartyViewSet(viewsets.ReadOnlyModelViewSet):
 
         return qs
     
+    def list(self, request, *args, **kwargs):
+        # 같은 필터 조합은 목록 버전과 담긴 파티들의 버전이 그대로인 동안 캐시된 응답 사용
+        cache_key = party_list_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is not None and get_party_versions(list(cached[2])) != cached[2]:
+            cached = None  # 목록에 있는 파티의 신청 인원이 바뀜
+        if cached is None:
+            data = super().list(request, *args, **kwargs).data
+            # 조회와 버전 읽기 사이에 바뀐 경우는 TTL(PARTY_LIST_CACHE_TTL) 안에 다시 만들어짐
+            versions = get_party_versions([party["id"] for party in data])
+            cached = (make_etag(data), data, versions)
+            cache.set(cache_key, cached, PARTY_LIST_CACHE_TTL)
+
+        etag, data, _ = cached
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(data, headers={"ETag": etag})
+
     def get_serializer_class(self): # 파티 상세 정보 조회 가능
         if self.action == "retrieve":
             return PartyDetailSerializer
@@ -103,27 +127,35 @@ class PartyLeaveAPIView(APIView):
     def post(self, request, party_id):
         try:
             with transaction.atomic():
-                participation = Participation.objects.select_related('party', 'user').get(
-                    party_id=party_id, 
-                    user=request.user
-                )
-                
-                party = participation.party
-                user = participation.user
-
-                # 환불 로직: 확정 상태였고, 예약금이 있었던 경우
-                if participation.status == Participation.Status.CONFIRMED and party.deposit > 0:
-                    user.points = F("points") + party.deposit
-                    user.save(update_fields=["points"])
-                    
-                    # 결제 기록이 있다면 환불 상태로 변경 (선택적)
-                    if hasattr(participation, 'payment'):
-                        payment = participation.payment
-                        payment.status = 'REFUNDED'
-                        payment.save(update_fields=['status'])
-
-                # 참여 기록 삭제
-                participation.delete()
+                # 잠금 순서는 결제와 같게: 참가 → 유저 포인트 → 결제 기록
+                participation = lock_rows(Participation.objects.filter(
+                    party_id=party_id,
+                    user=request.user,
+                    status__in=Participation.ACTIVE_STATUSES,
+                )).select_related('party').get()
+
+                # 환불 로직: 확정 상태였고, 예약금을 결제한 경우 (결제 시각 기준 키로 결제 1건당 한 번만 환불)
+                if participation.status == Participation.Status.CONFIRMED:
+                    payment = Payment.objects.filter(
+                        participation=participation, status=Payment.Status.SUCCESS
+                    ).first()
+                    if payment and payment.amount > 0:
+                        paid_at = participation.paid_at or payment.created_at
+                        points.credit(
+                            participation.user_id,
+                            payment.amount,
+                            PointTransaction.Kind.REFUND,
+                            idempotency_key=f"refund:{participation.id}:{paid_at:%Y%m%d%H%M%S%f}",
+                            participation=participation,
+                        )
+                        payment.status = Payment.Status.REFUNDED
+                        payment.save(update_fields=["status"])
+
+                # 참여 취소 (결제 기록이 참가를 PROTECT 하므로 삭제 대신 취소 상태로 남김)
+                # 게임 대기(standby)도 함께 해제해서 과반 계산에서 빠지게 함
+                participation.status = Participation.Status.CANCELED
+                participation.is_standby = False
+                participation.save(update_fields=["status", "is_standby"])
 
                 return Response({"detail": "신청이 취소되었습니다."}, status=status.HTTP_200_OK)
 
@@ -160,11 +192,8 @@ class AIPartyCreateAPIView(APIView):
             is_approved=True
         )
 
-        # 태그 처리
-        tags = ai_data.get("tags", [])
-        for tag_name in tags:
-            tag, _ = Tag.objects.get_or_create(name=tag_name)
-            party.tags.add(tag)
+        # 태그 처리 (조회/생성/연결을 한 번에)
+        set_party_tags({party: ai_data.get("tags", [])})
 
         return Response({"message": "AI 파티 생성 완료", "party_id": party.id})
 
@@ -1,3 +1,30 @@
 from django.contrib import admin
+from .models import BalanceRound, BalanceQuestion, BalanceQuestionSet
+from .tally import close_round
 
-# Register your models here.
+
+class BalanceQuestionInline(admin.TabularInline):
+    model = BalanceQuestion
+    extra = 0
+    readonly_fields = ("vote_a_count", "vote_b_count")
+
+
+@admin.register(BalanceRound)
+class BalanceRoundAdmin(admin.ModelAdmin):
+    list_display = ("id", "party", "is_active", "created_at", "closed_at")
+    list_filter = ("is_active",)
+    inlines = [BalanceQuestionInline]
+    actions = ["close_rounds"]
+
+    @admin.action(description="선택한 라운드 종료 (투표 집계 확정)")
+    def close_rounds(self, request, queryset):
+        rounds = list(queryset.filter(is_active=True))
+        for balance_round in rounds:
+            close_round(balance_round)
+        self.message_user(request, f"{len(rounds)}개 라운드를 종료했습니다.")
+
+
+@admin.register(BalanceQuestionSet)
+class BalanceQuestionSetAdmin(admin.ModelAdmin):
+    list_display = ("id", "party", "model_used", "created_at", "claimed_at")
+    list_filter = ("claimed_at",)
@@ -0,0 +1,55 @@
+"""
+투표 집계 브로드캐스트 묶음 전송.
+투표마다 round_<id>에 보내면 N명이 투표할 때 N × N 프레임이 나가므로,
+라운드마다 VOTE_BROADCAST_WINDOW초 동안 바뀐 문항의 최신 집계를 모아 vote_update 한 번으로 보냄.
+메시지마다 라운드별 seq(1부터 1씩 증가)를 붙여 클라이언트가 빠진 메시지를 알 수 있게 함
+"""
+from django.core.cache import cache
+
+from utils.broadcast import DebouncedBroadcaster
+
+SEQ_TIMEOUT = 60 * 60 * 24
+
+
+def next_seq(round_id):
+    """라운드별 전송 번호 (여러 프로세스가 보내도 cache.incr로 겹치지 않음)"""
+    key = f"vote_broadcast_seq:{round_id}"
+    cache.add(key, 0, SEQ_TIMEOUT)
+    try:
+        return cache.incr(key)
+    except ValueError:  # 그 사이 만료/삭제된 경우
+        cache.set(key, 1, SEQ_TIMEOUT)
+        return 1
+
+
+class VoteBroadcaster(DebouncedBroadcaster):
+    """라운드별로 {question_id: (a, b)}를 모아 vote_update 한 번으로 전송"""
+    event_type = "vote_update"
+    window_setting = "VOTE_BROADCAST_WINDOW"
+
+    def group_name(self, round_id):
+        return f"round_{round_id}"
+
+    def queue(self, round_id, question_id, vote_a_count, vote_b_count):
+        super().queue(round_id, (question_id, vote_a_count, vote_b_count))
+
+    def merge(self, questions, item):
+        questions = questions or {}
+        question_id, vote_a_count, vote_b_count = item
+        # 동시에 들어온 투표의 순서가 바뀌어도 집계는 줄지 않으므로 큰 값을 유지
+        a, b = questions.get(question_id, (0, 0))
+        questions[question_id] = (max(a, vote_a_count), max(b, vote_b_count))
+        return questions
+
+    def build(self, round_id, questions):
+        return {
+            "round_id": round_id,
+            "seq": next_seq(round_id),
+            "questions": [
+                {"question_id": qid, "vote_a_count": a, "vote_b_count": b}
+                for qid, (a, b) in sorted(questions.items())
+            ],
+        }
+
+
+vote_broadcaster = VoteBroadcaster()
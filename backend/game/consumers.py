@@ -1,15 +1,26 @@
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from rest_framework import serializers
+
+from utils.wsauth import is_party_member
+from .models import BalanceRound
+from .serializers import BalanceQuestionReadSerializer, submit_vote
+
 
 class BalanceRoundConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
         """
-        클라이언트가 특정 라운드에 접속하면 round_id 기반 그룹에 가입
+        라운드 파티의 참가자가 접속하면 round_id 기반 그룹에 가입
+        인증/참가 확인은 연결할 때 한 번만 (JWTAuthMiddleware가 scope에 둔 user, party_ids),
+        이후 투표 메시지마다 다시 하지 않음
         """
         self.round_id = self.scope["url_route"]["kwargs"].get("round_id")
-        if not self.round_id:
+        party_id = await self._round_party_id() if self.round_id else None
+        if party_id is None or not is_party_member(self.scope, party_id):
             await self.close()
             return
 
+        self.user = self.scope.get("user")
         self.group_name = f"round_{self.round_id}"
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
@@ -18,15 +29,57 @@ class BalanceRoundConsumer(AsyncJsonWebsocketConsumer):
         """
         클라이언트 연결 종료 시 그룹에서 제거
         """
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        """
+        클라이언트 → 서버 투표
+        {"type": "vote", "id": <클라이언트가 붙인 메시지 id>, "question_id": 1, "choice": "A"}
+        → {"type": "vote_ack", "id": ..., "ok": true, "question": {...}}
+          또는 {"type": "vote_ack", "id": ..., "ok": false, "errors": <검증 오류>}
+        """
+        message_id = content.get("id") if isinstance(content, dict) else None
+        if not isinstance(content, dict) or content.get("type") != "vote":
+            await self._ack(message_id, errors=["지원하지 않는 메시지입니다."])
+            return
+        if not self.user or not self.user.is_authenticated:
+            await self._ack(message_id, errors=["인증된 사용자만 투표할 수 있습니다."])
+            return
+
+        try:
+            question = await self._submit_vote(content.get("question_id"), content.get("choice"))
+        except serializers.ValidationError as e:
+            await self._ack(message_id, errors=e.detail)
+            return
+        await self._ack(message_id, question=question)
+
+    @database_sync_to_async
+    def _round_party_id(self):
+        return BalanceRound.objects.filter(pk=self.round_id).values_list("party_id", flat=True).first()
+
+    @database_sync_to_async
+    def _submit_vote(self, question_id, choice):
+        # HTTP 투표(VoteCreateView)와 같은 검증/저장/브로드캐스트
+        q = submit_vote(self.user, question_id, choice)
+        return BalanceQuestionReadSerializer(q).data
+
+    async def _ack(self, message_id, question=None, errors=None):
+        payload = {"type": "vote_ack", "id": message_id, "ok": errors is None}
+        if errors is None:
+            payload["question"] = question
+        else:
+            payload["errors"] = errors
+        await self.send_json(payload)
 
     async def vote_update(self, event):
         """
         서버 → 클라이언트 브로드캐스트
-        (HTTP API에서 투표 처리 후 channel_layer.group_send로 호출됨)
+        (투표를 잠깐 모았다가 broadcast.VoteBroadcaster가 group_send로 호출)
+        data: {"round_id", "seq", "questions": [{"question_id", "vote_a_count", "vote_b_count"}, ...]}
+        seq가 1보다 크게 건너뛰면 빠진 메시지가 있는 것이므로 라운드를 다시 조회
         """
         await self.send_json({
             "type": "vote_update",
             "data": event["data"]
         })
-        
\ No newline at end of file
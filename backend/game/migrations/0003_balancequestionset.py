@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0008_participation_status_created_idx'),
+        ('game', '0002_roundstate_alter_balancequestion_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceQuestionSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('items', models.JSONField(verbose_name='문항')),
+                ('model_used', models.CharField(default='gpt-4o-mini', max_length=40, verbose_name='사용 모델')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='사용 시각')),
+                ('party', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_question_sets', to='detailview.party', verbose_name='파티')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['party', 'claimed_at'], name='game_balanc_party_i_a5105f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0003_balancequestionset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='balancequestion',
+            name='counts_version',
+            field=models.PositiveIntegerField(default=1, verbose_name='집계 변경 버전'),
+        ),
+    ]
@@ -27,6 +27,20 @@ class BalanceRound(models.Model):
         return f"{self.party.title} 파티 라운드"
 
 
+class RoundState(models.Model):
+    """라운드 상태 버전 (투표 집계 반영/라운드 종료 때마다 1씩 증가 → 라운드 스냅샷 캐시 키, ETag)"""
+    round = models.OneToOneField(
+        BalanceRound, on_delete=models.CASCADE,
+        related_name="state",
+        verbose_name="라운드",
+    )
+    version = models.PositiveIntegerField("상태 버전", default=1)
+    last_updated = models.DateTimeField("최종 업데이트", auto_now=True)
+
+    def __str__(self):
+        return f"{self.round_id} v{self.version}"
+
+
 class BalanceQuestion(models.Model):
     """라운드에 포함된 개별 문항"""
     round = models.ForeignKey(
@@ -39,6 +53,7 @@ class BalanceQuestion(models.Model):
     b_text = models.CharField("선택지 B", max_length=80)
     vote_a_count = models.PositiveIntegerField(default=0)
     vote_b_count = models.PositiveIntegerField(default=0)
+    counts_version = models.PositiveIntegerField("집계 변경 버전", default=1)  # 집계가 마지막으로 바뀐 RoundState.version
 
     class Meta:
         unique_together = ("round", "order")
@@ -71,4 +86,26 @@ class BalanceVote(models.Model):
 
     def __str__(self):
         return f"{self.user_id} -> Q{self.question_id} ({self.choice})"
-    
\ No newline at end of file
+    
+
+class BalanceQuestionSet(models.Model):
+    """
+    파티 시작 전에 미리 만들어 둔 문항 세트.
+    과반수가 대기하면 AI 호출 없이 세트 하나를 꺼내(claimed_at 기록) 바로 라운드를 만듦
+    """
+    party = models.ForeignKey(
+        "detailview.Party", on_delete=models.CASCADE,
+        related_name="balance_question_sets", verbose_name="파티",
+    )
+    items = models.JSONField("문항")  # [{"a": "...", "b": "..."}, ...]
+    model_used = models.CharField("사용 모델", max_length=40, default="gpt-4o-mini")
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField("사용 시각", null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["party", "claimed_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.party_id} 파티 문항 세트 ({len(self.items)}개)"
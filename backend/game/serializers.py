@@ -1,9 +1,10 @@
 from django.db import transaction, IntegrityError
-from django.db.models import F
 from rest_framework import serializers
 
 from .models import BalanceRound, BalanceQuestion, BalanceVote
-from detailview.models import Party  # party_id 유효성 체크용
+from .tally import apply_live_counts, record_vote
+from .broadcast import vote_broadcaster
+from detailview.models import Party, Participation  # party_id 유효성 체크용
 
 
 # 문항 시리얼라이저
@@ -11,20 +12,20 @@ class BalanceQuestionReadSerializer(serializers.ModelSerializer):
     """밸런스게임의 개별 질문 하나"""
     class Meta:
         model = BalanceQuestion
-        fields = ("id", "order", "a_text", "b_text", "vote_a_count", "vote_b_count")
+        fields = ("id", "order", "a_text", "b_text", "vote_a_count", "vote_b_count", "counts_version")
 
 
 # 라운드 시리얼라이저
 class BalanceRoundReadSerializer(serializers.ModelSerializer):
     """라운드 전체 + 문항 리스트"""
     questions = BalanceQuestionReadSerializer(many=True, read_only=True)
+    version = serializers.IntegerField(source="state.version", read_only=True)
 
     class Meta:
         model = BalanceRound
         fields = (
             "id", "party", "created_by", "model_used",
-            "safety_blocked", "safety_reason",
-            "is_active", "created_at", "closed_at", "questions",
+            "is_active", "created_at", "closed_at", "version", "questions",
         )
 
 
@@ -39,14 +40,15 @@ class RoundCreateAIRequestSerializer(serializers.Serializer):
         return value
 
 
-# 투표 생성 (1인 1표, 카운트 즉시 반영)
+# 투표 생성 (1인 1표, 카운트는 tally에 쌓았다가 주기적으로 반영)
 class VoteCreateSerializer(serializers.Serializer):
     question_id = serializers.IntegerField()
     choice = serializers.ChoiceField(choices=BalanceVote.Choice.choices)
 
     def validate(self, attrs):
+        # HTTP는 request.user, WebSocket은 연결할 때 인증된 user를 context로 받음
         request = self.context.get("request")
-        user = getattr(request, "user", None)
+        user = self.context.get("user") or getattr(request, "user", None)
 
         if not user or not user.is_authenticated:
             raise serializers.ValidationError("인증된 사용자만 투표할 수 있습니다.")
@@ -62,19 +64,17 @@ class VoteCreateSerializer(serializers.Serializer):
             raise serializers.ValidationError("종료된 라운드에는 투표할 수 없습니다.")
 
         # 파티 참가자 검증 (CONFIRMED 상태만 허용)
-        party = q.round.party
-        if not party.participations.filter(user=user, status="CONFIRMED").exists():
+        if not Participation.objects.filter(
+            party_id=q.round.party_id, user=user, status=Participation.Status.CONFIRMED
+        ).exists():
             raise serializers.ValidationError("해당 파티 참가자만 투표할 수 있습니다.")
 
-        # 중복 투표 방지
-        if BalanceVote.objects.filter(question=q, user=user).exists():
-            raise serializers.ValidationError("이미 이 문항에 투표했습니다.")
+        # 중복 투표는 create에서 unique 제약(question, user)으로 막음
 
         attrs["question_obj"] = q
         attrs["user_obj"] = user
         return attrs
 
-    @transaction.atomic
     def create(self, validated_data):
         q: BalanceQuestion = validated_data["question_obj"]
         user = validated_data["user_obj"]
@@ -82,15 +82,29 @@ class VoteCreateSerializer(serializers.Serializer):
 
         # 1인 1표 보장
         try:
-            vote = BalanceVote.objects.create(question=q, user=user, choice=choice)
+            with transaction.atomic():
+                vote = BalanceVote.objects.create(question=q, user=user, choice=choice)
         except IntegrityError:
             raise serializers.ValidationError("이미 이 문항에 투표했습니다.")
 
-        # 실시간 집계 반영
-        if choice == BalanceVote.Choice.A:
-            BalanceQuestion.objects.filter(pk=q.pk).update(vote_a_count=F("vote_a_count") + 1)
-        else:
-            BalanceQuestion.objects.filter(pk=q.pk).update(vote_b_count=F("vote_b_count") + 1)
-
+        # 집계: 문항 행을 잠그지 않고 tally만 올림
+        # (바깥 트랜잭션이 롤백돼 어긋난 표 수는 라운드 종료 때 BalanceVote 기준으로 바로잡힘)
+        record_vote(q.pk, choice)
         return vote
-    
\ No newline at end of file
+
+
+def submit_vote(user, question_id, choice):
+    """
+    HTTP/WebSocket 투표 공통 처리: 검증 → 저장 → 실시간 집계 → 묶음 브로드캐스트 예약.
+    집계가 반영된 문항을 반환하고, 실패하면 serializers.ValidationError
+    """
+    ser = VoteCreateSerializer(data={"question_id": question_id, "choice": choice}, context={"user": user})
+    ser.is_valid(raise_exception=True)
+
+    # DB 집계 + 반영 대기 표 수 (문항 행은 다시 읽지 않음)
+    q = ser.save().question
+    apply_live_counts([q])
+
+    # 투표 집계 결과를 WebSocket으로 브로드캐스트 (라운드별로 짧게 모아서 한 번에 전송)
+    vote_broadcaster.queue(q.round_id, q.id, q.vote_a_count, q.vote_b_count)
+    return q
@@ -0,0 +1,59 @@
+"""
+라운드 스냅샷: BalanceRoundReadSerializer 결과를 RoundState.version별로 한 번만 만들어 캐시.
+게임 시작 순간 참가자 전원이 같은 라운드를 조회해도 DB/직렬화는 버전마다 한 번.
+투표 집계 반영(tally.flush_*)과 라운드 종료(tally.close_round) 때 tally.bump_version()으로 버전을 올림
+"""
+from django.core.cache import cache
+
+from .models import BalanceRound, RoundState
+from .serializers import BalanceRoundReadSerializer
+from .tally import ROUND_VERSION_TIMEOUT, round_version_key
+
+SNAPSHOT_TIMEOUT = 60 * 60  # 버전이 키에 들어가므로 무효화 대신 만료로 정리
+
+
+def _snapshot_key(round_id, version):
+    return f"round_snapshot:{round_id}:{version}"
+
+
+def current_version(round_id):
+    """캐시에 있으면 DB 조회 없이, 없으면 RoundState에서 읽어 캐시 (라운드가 없으면 None)"""
+    version = cache.get(round_version_key(round_id))
+    if version is None:
+        version = RoundState.objects.filter(round_id=round_id).values_list("version", flat=True).first()
+        if version is None:
+            # 상태 행이 없던 이전 라운드
+            if not BalanceRound.objects.filter(pk=round_id).exists():
+                return None
+            version = RoundState.objects.get_or_create(round_id=round_id)[0].version
+        cache.add(round_version_key(round_id), version, ROUND_VERSION_TIMEOUT)
+    return version
+
+
+def get_round_snapshot(round_id):
+    """직렬화된 라운드 (version 포함). 없는 라운드면 None"""
+    version = current_version(round_id)
+    if version is None:
+        return None
+
+    snapshot = cache.get(_snapshot_key(round_id, version))
+    if snapshot is None:
+        round_obj = (
+            BalanceRound.objects
+            .select_related("state")
+            .prefetch_related("questions")
+            .get(pk=round_id)
+        )
+        snapshot = BalanceRoundReadSerializer(round_obj).data
+        # 조회 사이에 버전이 올라갔으면 실제로 읽은 버전의 키에 저장
+        cache.add(_snapshot_key(round_id, snapshot["version"]), snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def snapshot_delta(snapshot, since):
+    """since 버전 이후 집계가 바뀐 문항만 담은 스냅샷"""
+    return {
+        **snapshot,
+        "since": since,
+        "questions": [q for q in snapshot["questions"] if q["counts_version"] > since],
+    }
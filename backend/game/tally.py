@@ -0,0 +1,212 @@
+"""
+밸런스게임 투표 집계.
+투표마다 문항 행을 UPDATE 하면 한꺼번에 투표할 때 같은 행에서 줄을 서므로,
+아직 DB에 반영하지 않은 표 수(delta)를 공유 캐시(Redis)에서 원자적으로 올리고
+주기 작업(flush_vote_tallies)과 라운드 종료 시 vote_a_count/vote_b_count에 반영.
+반영과 종료는 캐시 잠금(FLUSH_LOCK_KEY)으로 한 번에 하나만 실행 (같은 delta를 두 번 더하지 않게).
+파티 시작 후 BALANCE_ROUND_MAX_HOURS가 지난 라운드는 주기 작업(close_finished_rounds)이 종료
+"""
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import BalanceQuestion, BalanceRound, BalanceVote, RoundState
+
+TALLY_TIMEOUT = 60 * 60 * 24  # 반영 안 된 delta 보관 시간 (주기 작업이 멈춰도 하루는 유지)
+ROUND_VERSION_TIMEOUT = 60 * 60
+FLUSH_LOCK_KEY = "vote_tally:flush_lock"
+FLUSH_LOCK_TIMEOUT = 60  # 반영 도중 프로세스가 죽어도 이 시간이 지나면 풀림
+
+
+def _key(question_id, choice):
+    return f"vote_tally:{question_id}:{choice}"
+
+
+def round_version_key(round_id):
+    return f"round_version:{round_id}"
+
+
+def bump_version(round_id, question_ids):
+    """
+    집계가 DB에 반영되면 라운드 버전을 1 올리고 question_ids 문항에 새 버전을 기록 (snapshot 캐시 키/ETag)
+    새 버전을 반환
+    """
+    with transaction.atomic():
+        state, _ = RoundState.objects.get_or_create(round_id=round_id)
+        RoundState.objects.filter(pk=state.pk).update(version=F("version") + 1)
+        version = RoundState.objects.values_list("version", flat=True).get(pk=state.pk)
+        if question_ids:
+            BalanceQuestion.objects.filter(pk__in=question_ids).update(counts_version=version)
+    # 커밋 전에 새 버전을 알리면 다른 요청이 이전 데이터로 새 버전 스냅샷을 만들 수 있음
+    transaction.on_commit(lambda: cache.set(round_version_key(round_id), version, ROUND_VERSION_TIMEOUT))
+    return version
+
+
+def record_vote(question_id, choice):
+    """반영 대기 중인 표 수 +1 (cache.incr은 원자적)"""
+    key = _key(question_id, choice)
+    cache.add(key, 0, TALLY_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:  # add와 incr 사이에 만료/삭제된 경우
+        cache.set(key, 1, TALLY_TIMEOUT)
+
+
+def pending_deltas(question_ids):
+    """{question_id: (A 대기 표 수, B 대기 표 수)}"""
+    keys = {
+        _key(qid, choice): (qid, choice)
+        for qid in question_ids
+        for choice in BalanceVote.Choice.values
+    }
+    found = cache.get_many(keys)
+    deltas = {qid: [0, 0] for qid in question_ids}
+    for key, count in found.items():
+        qid, choice = keys[key]
+        deltas[qid][0 if choice == BalanceVote.Choice.A else 1] += count
+    return {qid: tuple(d) for qid, d in deltas.items()}
+
+
+def apply_live_counts(questions):
+    """DB 값 + 반영 대기 표 수를 문항 객체에 채움 (응답/브로드캐스트용, 저장하지 않음)"""
+    questions = list(questions)
+    deltas = pending_deltas([q.pk for q in questions])
+    for q in questions:
+        a, b = deltas[q.pk]
+        q.vote_a_count += a
+        q.vote_b_count += b
+    return questions
+
+
+@contextmanager
+def flush_lock(wait=0):
+    """
+    반영/종료 잠금 (cache.add는 원자적). 잡았으면 True, wait초 안에 못 잡으면 False를 넘김.
+    잡은 쪽만 풀어서, 시간이 지나 다른 쪽이 새로 잡은 잠금은 건드리지 않음
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    acquired = cache.add(FLUSH_LOCK_KEY, token, FLUSH_LOCK_TIMEOUT)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.05)
+        acquired = cache.add(FLUSH_LOCK_KEY, token, FLUSH_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(FLUSH_LOCK_KEY) == token:
+            cache.delete(FLUSH_LOCK_KEY)
+
+
+def _decr(question_id, choice, count):
+    if not count:
+        return
+    try:
+        cache.decr(_key(question_id, choice), count)
+    except ValueError:  # 만료/삭제된 키 → 더 뺄 것 없음
+        pass
+
+
+def flush_questions(question_ids):
+    """
+    대기 중인 표 수를 DB에 반영하고 반영한 문항 id 목록을 반환.
+    다른 반영/종료가 진행 중이면 건너뛰고 빈 목록 (다음 주기에 처리).
+    문항마다 UPDATE 후 읽은 만큼만 decr 하므로 그 사이 들어온 표는 다음 반영 때 처리되고,
+    decr이 실패하면 UPDATE도 롤백되어 같은 표가 두 번 더해지지 않음.
+    이미 종료된 라운드의 문항은 건드리지 않음 (종료 시 BalanceVote 기준으로 확정됨).
+    반영한 문항이 있는 라운드는 버전을 올림
+    """
+    flushed = []
+    with flush_lock() as acquired:
+        if not acquired:
+            return flushed
+        for qid, (a, b) in pending_deltas(question_ids).items():
+            if not (a or b):
+                continue
+            with transaction.atomic():
+                updated = BalanceQuestion.objects.filter(pk=qid, round__is_active=True).update(
+                    vote_a_count=F("vote_a_count") + a,
+                    vote_b_count=F("vote_b_count") + b,
+                )
+                if not updated:
+                    continue
+                _decr(qid, BalanceVote.Choice.A, a)
+                _decr(qid, BalanceVote.Choice.B, b)
+            flushed.append(qid)
+
+    if flushed:
+        by_round = {}
+        for qid, round_id in BalanceQuestion.objects.filter(pk__in=flushed).values_list("id", "round_id"):
+            by_round.setdefault(round_id, []).append(qid)
+        for round_id, qids in by_round.items():
+            bump_version(round_id, qids)
+    return flushed
+
+
+def _finished_cutoff(now=None):
+    """파티 시작 시각이 이보다 이르면 끝난 파티"""
+    return (now or timezone.now()) - timedelta(hours=settings.BALANCE_ROUND_MAX_HOURS)
+
+
+def finished_rounds(now=None):
+    """아직 열려 있지만 파티가 끝났거나 취소된 라운드"""
+    return BalanceRound.objects.filter(is_active=True).filter(
+        Q(party__start_time__lt=_finished_cutoff(now)) | Q(party__is_cancelled=True)
+    )
+
+
+def flush_active_rounds():
+    """
+    진행 중인 라운드의 문항 반영 (주기 작업).
+    끝난 파티의 라운드는 제외 → 종료가 늦어져도 대상이 계속 늘지 않음 (남은 표는 close_round에서 다시 계산)
+    """
+    question_ids = list(
+        BalanceQuestion.objects
+        .filter(round__is_active=True, round__party__start_time__gte=_finished_cutoff())
+        .exclude(round__party__is_cancelled=True)
+        .values_list("id", flat=True)
+    )
+    return flush_questions(question_ids)
+
+
+def close_finished_rounds():
+    """끝난 파티의 라운드를 종료하고 종료한 라운드 id 목록을 반환 (주기 작업)"""
+    closed = []
+    for balance_round in finished_rounds().order_by("created_at"):
+        close_round(balance_round)
+        closed.append(balance_round.pk)
+    return closed
+
+
+def close_round(balance_round):
+    """
+    라운드 종료: BalanceVote 기준으로 집계를 다시 계산해 저장하고 대기 표 수를 비움
+    (캐시가 비워졌거나 반영 도중 실패했어도 종료 시점 집계는 정확).
+    진행 중인 반영이 끝나길 잠깐 기다림 (못 잡아도 종료된 라운드는 반영 대상에서 빠지므로 그대로 진행)
+    """
+    with flush_lock(wait=5), transaction.atomic():
+        questions = list(
+            balance_round.questions.annotate(
+                a=Count("votes", filter=Q(votes__choice=BalanceVote.Choice.A)),
+                b=Count("votes", filter=Q(votes__choice=BalanceVote.Choice.B)),
+            )
+        )
+        for q in questions:
+            q.vote_a_count, q.vote_b_count = q.a, q.b
+        BalanceQuestion.objects.bulk_update(questions, ["vote_a_count", "vote_b_count"])
+
+        balance_round.is_active = False
+        balance_round.closed_at = timezone.now()
+        balance_round.save(update_fields=["is_active", "closed_at"])
+
+        cache.delete_many([
+            _key(q.pk, choice) for q in questions for choice in BalanceVote.Choice.values
+        ])
+        bump_version(balance_round.pk, [q.pk for q in questions])
+    return questions
@@ -0,0 +1,160 @@
+from datetime import timedelta
+
+from celery import shared_task
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from detailview.models import Party
+from utils.db import lock_rows
+from utils.gameAI import generate_balance_by_ai, MODEL
+from .models import BalanceRound, BalanceQuestion, BalanceQuestionSet, RoundState
+from .tally import close_finished_rounds, flush_active_rounds
+
+# 라운드 생성 중 표시 (같은 파티에 생성 작업이 두 번 들어가지 않게 함)
+# 워커가 죽어도 영원히 막히지 않도록 만료 시간을 둠
+ROUND_PENDING_TIMEOUT = 120
+QUESTION_COUNT = 5
+PREFETCH_BATCH_SIZE = 50
+
+
+def round_pending_key(party_id):
+    return f"balance_round_pending:{party_id}"
+
+
+def mark_round_pending(party_id):
+    """생성 중 표시를 남기고, 이미 생성 중이면 False (cache.add는 키가 없을 때만 저장)"""
+    return cache.add(round_pending_key(party_id), True, ROUND_PENDING_TIMEOUT)
+
+
+def clear_round_pending(party_id):
+    cache.delete(round_pending_key(party_id))
+
+
+def is_round_pending(party_id):
+    return cache.get(round_pending_key(party_id)) is not None
+
+
+def _create_round(party_id, items, created_by_id):
+    """
+    라운드와 문항을 저장하고 커밋 후 party_<id> 그룹에 알림.
+    파티당 라운드는 하나(OneToOne)라서 이미 있으면 None
+    """
+    try:
+        with transaction.atomic():
+            new_round = BalanceRound.objects.create(
+                party_id=party_id,
+                created_by_id=created_by_id,
+                is_active=True,  # 명시적으로 활성화
+            )
+            RoundState.objects.create(round=new_round)
+            BalanceQuestion.objects.bulk_create([
+                BalanceQuestion(round=new_round, order=i + 1, a_text=it["a"], b_text=it["b"])
+                for i, it in enumerate(items)
+            ])
+    except IntegrityError:
+        return None  # 다른 요청/작업이 먼저 라운드를 만든 경우
+
+    def send():
+        # WebSocket broadcast: 게임 시작 알림
+        async_to_sync(get_channel_layer().group_send)(
+            f"party_{party_id}",
+            {
+                "type": "send_game_created",
+                "data": {"round_id": str(new_round.id)}
+            }
+        )
+
+    transaction.on_commit(send, robust=True)
+    return new_round
+
+
+def claim_pooled_round(party_id, created_by_id=None):
+    """미리 만들어 둔 문항 세트로 바로 라운드 생성 (AI 호출 없음). 남은 세트가 없으면 None"""
+    with transaction.atomic():
+        question_set = (
+            lock_rows(
+                BalanceQuestionSet.objects.filter(party_id=party_id, claimed_at__isnull=True),
+                skip_locked=True,
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if question_set is None:
+            return None
+
+        new_round = _create_round(party_id, question_set.items, created_by_id)
+        if new_round is not None:
+            question_set.claimed_at = timezone.now()
+            question_set.save(update_fields=["claimed_at"])
+        return new_round
+
+
+@shared_task
+def generate_balance_round(party_id, created_by_id=None):
+    """
+    (폴백) 준비된 문항 세트가 없을 때 AI로 문항을 만들어 라운드 생성.
+    AI 호출은 트랜잭션 밖에서 하고, 저장만 짧은 트랜잭션으로 처리
+    """
+    try:
+        try:
+            party = Party.objects.select_related("place").prefetch_related("tags").get(pk=party_id)
+        except Party.DoesNotExist:
+            return None
+
+        # 파티당 라운드는 하나 (OneToOne)
+        if BalanceRound.objects.filter(party_id=party_id).exists():
+            return None
+
+        items = generate_balance_by_ai(party, count=QUESTION_COUNT).get("items", [])
+        new_round = _create_round(party_id, items, created_by_id)
+        return str(new_round.id) if new_round else None
+    finally:
+        clear_round_pending(party_id)
+
+
+@shared_task
+def prefetch_balance_question_sets():
+    """
+    곧 시작하는 파티마다 문항 세트를 미리 만들어 둠
+    (라운드가 아직 없고 남은 세트도 없는 파티만, AI 호출은 파티마다 트랜잭션 밖에서)
+    AI 장애/회로 차단으로 폴백 문항이 나오면 저장하지 않음 → 다음 주기에 다시 시도
+    """
+    now = timezone.now()
+    parties = (
+        Party.objects
+        .filter(
+            start_time__range=(now, now + timedelta(hours=settings.BALANCE_POOL_HORIZON_HOURS)),
+            is_cancelled=False,
+            balance_round__isnull=True,
+        )
+        .exclude(pk__in=BalanceQuestionSet.objects.filter(claimed_at__isnull=True).values("party_id"))
+        .select_related("place")
+        .prefetch_related("tags")
+        .order_by("start_time")[:PREFETCH_BATCH_SIZE]
+    )
+
+    created = 0
+    for party in parties:
+        result = generate_balance_by_ai(party, count=QUESTION_COUNT)
+        items = result.get("items", [])
+        if items and not result.get("fallback"):
+            # 파티마다 바로 저장 → 중간에 워커가 죽어도 만든 세트는 남음
+            BalanceQuestionSet.objects.create(party=party, items=items, model_used=MODEL)
+            created += 1
+    return created
+
+
+@shared_task
+def flush_vote_tallies():
+    """진행 중인 라운드에 쌓인 투표 수를 vote_a_count/vote_b_count에 반영"""
+    return len(flush_active_rounds())
+
+
+@shared_task
+def close_finished_balance_rounds():
+    """파티가 끝났거나 취소된 라운드를 종료 (투표 집계 확정)"""
+    return len(close_finished_rounds())
@@ -1,3 +1,376 @@
-from django.test import TestCase
+import datetime
+import json
+import threading
+from types import SimpleNamespace
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from detailview.models import Place, Party, Participation
+from utils.wsauth import JWTAuthMiddleware
+from .broadcast import VoteBroadcaster, vote_broadcaster
+from .routing import websocket_urlpatterns
+from .models import BalanceRound, BalanceQuestion, BalanceVote
+from .serializers import VoteCreateSerializer
+from .tally import close_round, flush_active_rounds, flush_lock, pending_deltas
+from .tasks import close_finished_balance_rounds, flush_vote_tallies
+
+User = get_user_model()
+
+
+def make_round(users, title="게임 파티"):
+    party = Party.objects.create(
+        place=Place.objects.create(name="테스트 장소", capacity=10),
+        title=title,
+        start_time=timezone.now() + datetime.timedelta(hours=1),
+    )
+    Participation.objects.bulk_create([
+        Participation(party=party, user=user, status=Participation.Status.CONFIRMED) for user in users
+    ])
+    balance_round = BalanceRound.objects.create(party=party)
+    question = BalanceQuestion.objects.create(round=balance_round, order=1, a_text="산책", b_text="카페")
+    return balance_round, question
+
+
+class VoteTallyTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"voter{i}", email=f"voter{i}@test.com", password="password123")
+            for i in range(3)
+        ]
+        cls.round, cls.question = make_round(cls.users)
+
+    def setUp(self):
+        cache.clear()
+
+    def _vote(self, user, choice):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse("game:vote-create", args=[self.question.id]), {"choice": choice}, format="json")
+
+    def test_vote_counts_in_tally_until_flush(self):
+        """투표는 문항 행을 건드리지 않고, 응답/조회에는 반영 대기 표까지 포함"""
+        self.assertEqual(self._vote(self.users[0], "A").data["vote_a_count"], 1)
+        response = self._vote(self.users[1], "B")
+        self.assertEqual((response.data["vote_a_count"], response.data["vote_b_count"]), (1, 1))
+
+        self.question.refresh_from_db()
+        self.assertEqual((self.question.vote_a_count, self.question.vote_b_count), (0, 0))
+
+        self.assertEqual(pending_deltas([self.question.id])[self.question.id], (1, 1))
+
+        self.assertEqual(flush_vote_tallies(), 1)
+        self.question.refresh_from_db()
+        self.assertEqual((self.question.vote_a_count, self.question.vote_b_count), (1, 1))
+        self.assertEqual(pending_deltas([self.question.id])[self.question.id], (0, 0))
+        self.assertEqual(flush_active_rounds(), [])  # 더 반영할 표 없음
+
+    def test_flush_skips_while_another_flush_holds_the_lock(self):
+        """다른 반영이 잠금을 잡고 있으면 건너뛰고, 대기 표는 다음 반영 때 한 번만 더해짐"""
+        self._vote(self.users[0], "A")
+
+        with flush_lock() as acquired:
+            self.assertTrue(acquired)
+            self.assertEqual(flush_active_rounds(), [])
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.vote_a_count, 0)
+        self.assertEqual(pending_deltas([self.question.id])[self.question.id], (1, 0))
+
+        self.assertEqual(flush_active_rounds(), [self.question.id])
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.vote_a_count, 1)
+
+    def test_duplicate_vote_rejected_by_constraint(self):
+        self.assertEqual(self._vote(self.users[0], "A").status_code, status.HTTP_201_CREATED)
+        response = self._vote(self.users[0], "B")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(BalanceVote.objects.filter(question=self.question).count(), 1)
+        self.assertEqual(pending_deltas([self.question.id])[self.question.id], (1, 0))
+
+    def test_close_round_recounts_from_votes(self):
+        """종료 시에는 BalanceVote 기준으로 확정 (캐시가 비워져도 정확)"""
+        self._vote(self.users[0], "A")
+        self._vote(self.users[1], "A")
+        self._vote(self.users[2], "B")
+        cache.clear()  # 반영 전에 tally가 사라진 경우
+
+        close_round(self.round)
+
+        self.question.refresh_from_db()
+        self.round.refresh_from_db()
+        self.assertEqual((self.question.vote_a_count, self.question.vote_b_count), (2, 1))
+        self.assertFalse(self.round.is_active)
+        self.assertIsNotNone(self.round.closed_at)
+        self.assertEqual(self._vote(self.users[0], "B").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_finished_party_round_is_closed_and_not_flushed(self):
+        """파티가 끝난 라운드는 주기 반영 대상에서 빠지고, 종료 작업이 집계를 확정"""
+        self._vote(self.users[0], "A")
+        Party.objects.filter(pk=self.round.party_id).update(start_time=timezone.now() - datetime.timedelta(hours=7))
+
+        self.assertEqual(flush_active_rounds(), [])
+        self.assertEqual(close_finished_balance_rounds(), 1)
+        self.assertEqual(close_finished_balance_rounds(), 0)
+
+        self.round.refresh_from_db()
+        self.question.refresh_from_db()
+        self.assertFalse(self.round.is_active)
+        self.assertEqual((self.question.vote_a_count, self.question.vote_b_count), (1, 0))
+        self.assertEqual(pending_deltas([self.question.id])[self.question.id], (0, 0))
+
+
+@override_settings(VOTE_BROADCAST_WINDOW=60)
+class RoundSnapshotTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"viewer{i}", email=f"viewer{i}@test.com", password="password123")
+            for i in range(2)
+        ]
+        cls.round, cls.question = make_round(cls.users)
+        cls.other = BalanceQuestion.objects.create(round=cls.round, order=2, a_text="바다", b_text="산")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.users[0])
+        self.url = reverse("game:round-retrieve", args=[self.round.id])
+
+    def tearDown(self):
+        vote_broadcaster.flush(self.round.id)
+
+    def test_snapshot_cached_per_version_with_etag(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data["version"], 1)
+        self.assertEqual(first["ETag"], '"1"')
+        self.assertNotIn("safety_blocked", first.data)
+
+        with self.assertNumQueries(0):  # 같은 버전은 캐시에서
+            self.assertEqual(self.client.get(self.url).data, first.data)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH='"1"').status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_flush_bumps_version_and_delta_lists_changed_questions(self):
+        self.client.post(reverse("game:vote-create", args=[self.other.id]), {"choice": "B"}, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            flush_active_rounds()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(response.data["questions"][1]["vote_b_count"], 1)
+
+        delta = self.client.get(self.url, {"since": 1}).data
+        self.assertEqual([q["id"] for q in delta["questions"]], [self.other.id])
+        self.assertEqual(self.client.get(self.url, {"since": 2}).data["questions"], [])
+        self.assertEqual(self.client.get(self.url, {"since": "x"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            close_round(self.round)
+        closed = self.client.get(self.url).data
+        self.assertEqual(closed["version"], 3)
+        self.assertFalse(closed["is_active"])
+
+    def test_missing_round(self):
+        response = self.client.get(reverse("game:round-retrieve", args=["00000000-0000-0000-0000-000000000000"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(VOTE_BROADCAST_WINDOW=60)  # 예약 전송 대신 flush()를 직접 호출
+class VoteBroadcastTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"caster{i}", email=f"caster{i}@test.com", password="password123")
+            for i in range(3)
+        ]
+        cls.round, cls.question = make_round(cls.users)
+        cls.other = BalanceQuestion.objects.create(round=cls.round, order=2, a_text="바다", b_text="산")
+
+    def setUp(self):
+        cache.clear()
+        self.channel_layer = get_channel_layer()
+        self.channel_name = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(f"round_{self.round.id}", self.channel_name)
+
+    def tearDown(self):
+        vote_broadcaster.flush(self.round.id)
+
+    def _receive(self):
+        return async_to_sync(self.channel_layer.receive)(self.channel_name)
+
+    def test_votes_in_window_sent_as_one_message(self):
+        """같은 구간의 투표는 바뀐 문항의 최신 집계 한 번으로 전송, seq는 1씩 증가"""
+        for user, question, choice in [
+            (self.users[0], self.question, "A"),
+            (self.users[1], self.question, "B"),
+            (self.users[2], self.other, "A"),
+        ]:
+            self.client.force_authenticate(user=user)
+            self.client.post(reverse("game:vote-create", args=[question.id]), {"choice": choice}, format="json")
+
+        vote_broadcaster.flush(self.round.id)
+
+        message = self._receive()
+        self.assertEqual(message["type"], "vote_update")
+        self.assertEqual(message["data"]["seq"], 1)
+        self.assertEqual(message["data"]["questions"], [
+            {"question_id": self.question.id, "vote_a_count": 1, "vote_b_count": 1},
+            {"question_id": self.other.id, "vote_a_count": 1, "vote_b_count": 0},
+        ])
+        self.assertIsNone(vote_broadcaster.flush(self.round.id))  # 보낼 것이 없으면 전송 안 함
+
+        vote_broadcaster.queue(self.round.id, self.other.id, 2, 0)
+        vote_broadcaster.queue(self.round.id, self.other.id, 1, 0)  # 늦게 도착한 이전 집계
+        vote_broadcaster.flush(self.round.id)
+        message = self._receive()
+        self.assertEqual(message["data"]["seq"], 2)
+        self.assertEqual(message["data"]["questions"], [
+            {"question_id": self.other.id, "vote_a_count": 2, "vote_b_count": 0},
+        ])
+
+    def test_window_timer_flushes(self):
+        broadcaster = VoteBroadcaster(window=0.01)
+        sent = threading.Event()
+        flush = broadcaster.flush
+        broadcaster.flush = lambda round_id, loop: (flush(round_id, loop), sent.set())
+
+        broadcaster.queue(self.round.id, self.question.id, 1, 0)
+        self.assertTrue(sent.wait(5))  # 예약된 전송이 끝난 뒤 수신
+
+        message = self._receive()
+        self.assertEqual(message["data"]["questions"][0]["vote_a_count"], 1)
+        self.assertEqual(broadcaster._timers, {})
+
+
+class VoteTallyConcurrencyTest(TransactionTestCase):
+    VOTERS = 30
+
+    def setUp(self):
+        cache.clear()
+        self.users = User.objects.bulk_create([
+            User(username=f"rushvoter{i}", email=f"rushvoter{i}@test.com") for i in range(self.VOTERS)
+        ])
+        self.round, self.question = make_round(self.users)
+
+    def test_parallel_votes_all_counted(self):
+        """파티 전원이 동시에 투표해도 표 수가 빠짐없이 반영"""
+        start = threading.Barrier(self.VOTERS)
+
+        def vote(i, user):
+            serializer = VoteCreateSerializer(
+                data={"question_id": self.question.id, "choice": "A" if i % 3 else "B"},
+                context={"request": SimpleNamespace(user=user)},
+            )
+            try:
+                serializer.is_valid(raise_exception=True)
+                start.wait()
+                serializer.save()
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=vote, args=(i, u)) for i, u in enumerate(self.users)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        flush_active_rounds()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.vote_a_count, 20)
+        self.assertEqual(self.question.vote_b_count, 10)
+
+
+class SocketClient(ApplicationCommunicator):
+
+    async def send_json_to(self, data):
+        await self.send_input({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json_from(self, timeout=1):
+        return json.loads((await self.receive_output(timeout))["text"])
+
+    async def disconnect(self):
+        await self.send_input({"type": "websocket.disconnect", "code": 1000})
+        await self.wait(1)
+
+
+@override_settings(VOTE_BROADCAST_WINDOW=0.01)
+class WebSocketVoteTest(TransactionTestCase):
+    """consumer는 다른 스레드에서 DB를 쓰므로 TransactionTestCase"""
+
+    def setUp(self):
+        cache.clear()
+        self.users = User.objects.bulk_create([
+            User(username=f"socketvoter{i}", email=f"socketvoter{i}@test.com") for i in range(2)
+        ])
+        self.round, self.question = make_round(self.users)
+        self.outsider = User.objects.create(username="outsider", email="outsider@test.com")
+
+    async def _connect(self, user=None, accepted=True):
+        # channels.testing은 daphne가 필요하므로 asgiref의 ApplicationCommunicator를 직접 사용
+        query = f"token={AccessToken.for_user(user)}" if user is not None else ""
+        scope = {
+            "type": "websocket", "path": f"/ws/game/round/{self.round.id}/",
+            "query_string": query.encode(), "headers": [],
+        }
+        communicator = SocketClient(JWTAuthMiddleware(URLRouter(websocket_urlpatterns)), scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        output = await communicator.receive_output(1)
+        self.assertEqual(output["type"], "websocket.accept" if accepted else "websocket.close")
+        return communicator
+
+    async def test_vote_over_socket_acks_and_broadcasts(self):
+        communicator = await self._connect(self.users[0])
+
+        await communicator.send_json_to({"type": "vote", "id": 7, "question_id": self.question.id, "choice": "A"})
+        ack = await communicator.receive_json_from()
+        self.assertEqual(ack["type"], "vote_ack")
+        self.assertEqual(ack["id"], 7)
+        self.assertTrue(ack["ok"])
+        self.assertEqual(ack["question"]["vote_a_count"], 1)
+
+        update = await communicator.receive_json_from()
+        self.assertEqual(update["type"], "vote_update")
+        self.assertEqual(update["data"]["questions"][0]["vote_a_count"], 1)
+
+        # 같은 문항에 다시 투표하면 HTTP와 같은 검증 오류
+        await communicator.send_json_to({"type": "vote", "id": 8, "question_id": self.question.id, "choice": "B"})
+        ack = await communicator.receive_json_from()
+        self.assertFalse(ack["ok"])
+        self.assertEqual(ack["id"], 8)
+        await communicator.disconnect()
+
+    async def test_rejects_unauthenticated_and_non_participants(self):
+        """토큰이 없거나 라운드 파티 참가자가 아니면 그룹에 가입하지 않고 연결 거절"""
+        await self._connect(accepted=False)
+        await self._connect(self.outsider, accepted=False)
+
+    async def test_vote_checks_participation_that_ended_after_connect(self):
+        communicator = await self._connect(self.users[1])
+        await database_sync_to_async(
+            Participation.objects.filter(user=self.users[1]).update
+        )(status=Participation.Status.CANCELED)
+
+        await communicator.send_json_to({"type": "vote", "id": 2, "question_id": self.question.id, "choice": "A"})
+        ack = await communicator.receive_json_from()
+        self.assertFalse(ack["ok"])
+        self.assertIn("해당 파티 참가자만 투표할 수 있습니다.", str(ack["errors"]))
+        await communicator.disconnect()
@@ -1,65 +1,56 @@
-from django.db import transaction
-from django.shortcuts import get_object_or_404
-
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import BalanceRound, BalanceQuestion
-from .serializers import (
-    BalanceRoundReadSerializer,
-    BalanceQuestionReadSerializer,
-    VoteCreateSerializer,
-)
-
-# WebSocket 관련 임포트
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from .models import BalanceRound
+from .serializers import BalanceQuestionReadSerializer, submit_vote
+from .snapshot import get_round_snapshot, snapshot_delta
 
 
 class RoundRetrieveView(APIView):
-    """GET /api/v1/game/rounds/<round_id>/"""
+    """
+    GET /api/v1/game/rounds/<round_id>/
+    - 버전별로 캐시된 스냅샷을 반환 (집계는 주기적으로 반영된 값, 실시간 변화는 WebSocket vote_update)
+    - ETag = 라운드 버전 → If-None-Match가 같으면 304
+    - ?since=<버전>: 그 버전 이후 집계가 바뀐 문항만 반환
+    """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, round_id):
-        round_obj = (
-            BalanceRound.objects
-            .select_related("party", "created_by")
-            .prefetch_related("questions")
-            .get(pk=round_id)
-        )
-        return Response(BalanceRoundReadSerializer(round_obj).data, status=status.HTTP_200_OK)
+        snapshot = get_round_snapshot(round_id)
+        if snapshot is None:
+            return Response({"detail": "존재하지 않는 라운드입니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = f'"{snapshot["version"]}"'
+        if etag in _parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            since = request.query_params.get("since")
+            if since is None:
+                response = Response(snapshot, status=status.HTTP_200_OK)
+            else:
+                try:
+                    since = int(since)
+                except ValueError:
+                    return Response({"detail": "since는 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+                response = Response(snapshot_delta(snapshot, since), status=status.HTTP_200_OK)
+
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"  # 브라우저는 저장하되 매번 ETag로 확인
+        return response
+
+
+def _parse_etags(header):
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
 
 
 class VoteCreateView(APIView):
     """POST /api/v1/game/questions/<question_id>/vote/"""
     permission_classes = [permissions.IsAuthenticated]
 
-    @transaction.atomic
     def post(self, request, question_id: int):
-        payload = {"question_id": question_id, **request.data}
-        ser = VoteCreateSerializer(data=payload, context={"request": request})
-        ser.is_valid(raise_exception=True)
-        vote = ser.save()
-
-        q = vote.question
-        q.refresh_from_db(fields=["vote_a_count", "vote_b_count"])
-
-        # 투표 집계 결과를 WebSocket으로 브로드캐스트
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"round_{q.round_id}",
-            {
-                "type": "vote_update",
-                "data": {
-                    "question_id": q.id,
-                    "round_id": str(q.round_id),
-                    "vote_a_count": q.vote_a_count,
-                    "vote_b_count": q.vote_b_count,
-                }
-            }
-        )
-
+        # 실시간 게임 중에는 WebSocket(BalanceRoundConsumer)으로도 같은 처리를 함
+        q = submit_vote(request.user, question_id, request.data.get("choice"))
         return Response(BalanceQuestionReadSerializer(q).data, status=status.HTTP_201_CREATED)
 
 
@@ -0,0 +1,57 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .models import Notice
+from .serializers import NoticeSerializer
+
+BROADCAST_GROUP = "notice_broadcast"  # 전체 공지 수신 그룹
+CATCHUP_LIMIT = 100  # 재접속 시 한 번에 보내주는 놓친 알림 최대 개수
+
+
+def user_group_name(user_id):
+    return f"user_{user_id}"
+
+
+class NoticeConsumer(AsyncJsonWebsocketConsumer):
+    async def connect(self):
+        """
+        로그인한 유저를 개인 그룹(user_<id>)과 전체 공지 그룹에 가입.
+        ?since=<id> 가 있으면 그 이후 알림을 먼저 보내줌 (재접속 시 누락 방지)
+        """
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated:
+            await self.close()
+            return
+
+        self.group_names = [user_group_name(user.id), BROADCAST_GROUP]
+        for group_name in self.group_names:
+            await self.channel_layer.group_add(group_name, self.channel_name)
+        await self.accept()
+
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        since = (query.get("since") or [""])[0]
+        if since.isdigit():
+            for data in await self._notices_since(user, int(since)):
+                await self.send_json({"type": "notice", "data": data})
+
+    async def disconnect(self, code):
+        for group_name in getattr(self, "group_names", []):
+            await self.channel_layer.group_discard(group_name, self.channel_name)
+
+    async def notice_created(self, event):
+        """
+        서버 → 클라이언트 알림 push
+        (notice.tasks에서 알림 저장이 커밋되면 group_send로 호출됨)
+        """
+        await self.send_json({"type": "notice", "data": event["data"]})
+
+    @database_sync_to_async
+    def _notices_since(self, user, since):
+        qs = (
+            Notice.visible_to(user)
+            .filter(id__gt=since)
+            .order_by("id")[:CATCHUP_LIMIT]
+        )
+        return NoticeSerializer(qs, many=True).data
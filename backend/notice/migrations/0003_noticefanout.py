@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0005_place_map'),
+        ('notice', '0002_alter_notice_notice_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoticeFanout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_user_id', models.BigIntegerField(default=0)),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('is_done', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('party', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notice_fanout', to='detailview.party')),
+            ],
+        ),
+    ]
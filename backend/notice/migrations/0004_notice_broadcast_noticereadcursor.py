@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0005_place_map'),
+        ('notice', '0003_noticefanout'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoticeReadCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='noticefanout',
+            name='party',
+        ),
+        migrations.AlterField(
+            model_name='notice',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notices', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['user', '-created_at'], name='notice_noti_user_id_66a046_idx'),
+        ),
+        migrations.AddField(
+            model_name='noticereadcursor',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notice_read_cursor', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.DeleteModel(
+            name='NoticeFanout',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0005_place_map'),
+        ('notice', '0004_notice_broadcast_noticereadcursor'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartyReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('1day', '하루 전'), ('2hours', '2시간 전')], max_length=10)),
+                ('fire_at', models.DateTimeField()),
+                ('participation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='detailview.participation')),
+                ('party', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='detailview.party')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='party_reminders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'fire_at'], name='notice_part_user_id_2a88b8_idx')],
+                'constraints': [models.UniqueConstraint(fields=('participation', 'kind'), name='unique_reminder_per_participation')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0005_place_map'),
+        ('notice', '0005_partyreminder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartyNoticeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notice_type', models.CharField(choices=[('party_open_1day', '파티 오픈 1일 전'), ('party_insufficient', '인원 미달 오픈 1일 전'), ('party_new', '새 파티 생성'), ('party_applied', '파티 신청 완료'), ('party_canceled', '파티 신청 취소')], max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('party', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notice_logs', to='detailview.party')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('party', 'notice_type'), name='unique_notice_log_per_party')],
+            },
+        ),
+    ]
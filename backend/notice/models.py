@@ -1,4 +1,6 @@
+from datetime import timedelta
 from django.db import models
+from django.db.models import Q, F, Case, When, Value
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -19,7 +21,8 @@ class Notice(models.Model):
         (PARTY_CANCELED, "파티 신청 취소"),
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notices")
+    # user가 비어 있으면 전체 유저 대상 공지(broadcast) → 한 번만 저장, 읽음 여부는 NoticeReadCursor로 관리
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="notices")
     target_party = models.ForeignKey("detailview.Party", on_delete=models.CASCADE, null=True, blank=True, related_name="notices")
     notice_type = models.CharField(max_length=50, choices=NOTICE_TYPES)
     message = models.TextField()
@@ -28,7 +31,102 @@ class Notice(models.Model):
     
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
+
+    @property
+    def is_broadcast(self):
+        return self.user_id is None
+
+    @classmethod
+    def visible_to(cls, user):
+        """
+        user에게 보이는 알림: 개인 알림 + 가입 이후 전체 공지.
+        (user, created_at) 인덱스로 한 번에 조회하고, 전체 공지의 읽음 여부는 read_state로 계산.
+        """
+        last_read_id = (
+            NoticeReadCursor.objects
+            .filter(user=user)
+            .values_list("last_read_id", flat=True)
+            .first()
+        ) or 0
+
+        return (
+            cls.objects
+            .filter(Q(user=user) | Q(user__isnull=True, created_at__gte=user.date_joined))
+            .annotate(read_state=Case(
+                When(user__isnull=True, id__lte=last_read_id, then=Value(True)),
+                When(user__isnull=True, then=Value(False)),
+                default=F("is_read"),
+                output_field=models.BooleanField(),
+            ))
+        )
 
     def __str__(self):
+        if self.is_broadcast:
+            return f"전체 - {self.get_notice_type_display()}"
         return f"{self.user} - {self.get_notice_type_display()} ({'읽음' if self.is_read else '안읽음'})"
-    
\ No newline at end of file
+
+
+class NoticeReadCursor(models.Model):
+    """유저별 전체 공지 읽음 위치 (id가 last_read_id 이하인 전체 공지는 읽은 것으로 처리)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="notice_read_cursor")
+    last_read_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} - 전체 공지 {self.last_read_id}번까지 읽음"
+
+
+class PartyReminder(models.Model):
+    """
+    확정된 참가자의 파티 시작 전 리마인더 (미리 만들어 두고 fire_at 범위로 조회).
+    fire_at 부터 WINDOW 동안 upcoming 목록에 노출됨.
+    """
+    ONE_DAY = "1day"
+    TWO_HOURS = "2hours"
+
+    KINDS = [
+        (ONE_DAY, "하루 전"),
+        (TWO_HOURS, "2시간 전"),
+    ]
+
+    # 종류별로 파티 시작 몇 시간 전에 노출할지
+    LEAD_TIMES = {
+        ONE_DAY: timedelta(hours=24),
+        TWO_HOURS: timedelta(hours=2),
+    }
+    WINDOW = timedelta(hours=1)
+
+    participation = models.ForeignKey("detailview.Participation", on_delete=models.CASCADE, related_name="reminders")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="party_reminders")
+    party = models.ForeignKey("detailview.Party", on_delete=models.CASCADE, related_name="reminders")
+    kind = models.CharField(max_length=10, choices=KINDS)
+    fire_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["participation", "kind"], name="unique_reminder_per_participation")
+        ]
+        indexes = [
+            models.Index(fields=["user", "fire_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.party_id}번 파티 {self.get_kind_display()} ({self.fire_at})"
+
+
+class PartyNoticeLog(models.Model):
+    """파티 단위 알림 발송 기록 → 주기 작업이 같은 파티에 같은 알림을 다시 보내지 않도록 막음"""
+    party = models.ForeignKey("detailview.Party", on_delete=models.CASCADE, related_name="notice_logs")
+    notice_type = models.CharField(max_length=50, choices=Notice.NOTICE_TYPES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["party", "notice_type"], name="unique_notice_log_per_party")
+        ]
+
+    def __str__(self):
+        return f"{self.party_id}번 파티 - {self.get_notice_type_display()}"
@@ -3,9 +3,13 @@ from .models import Notice
 
 class NoticeSerializer(serializers.ModelSerializer):
     notice_type_display = serializers.CharField(source="get_notice_type_display", read_only=True)
-    target_party_id = serializers.IntegerField(source="target_party.id", read_only=True)
+    target_party_id = serializers.IntegerField(read_only=True)
+    # 전체 공지는 유저별 읽음 커서 기준으로 계산된 read_state 사용
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
         model = Notice
         fields = ["id", "notice_type", "notice_type_display", "message", "is_read", "created_at", "target_party_id"]
-        
\ No newline at end of file
+
+    def get_is_read(self, obj):
+        return getattr(obj, "read_state", obj.is_read)
@@ -1,16 +1,21 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from detailview.models import Party, Participation
-from .models import Notice
-from .tasks import create_new_party_notice, create_participation_status_notice
+from .models import Notice, PartyReminder
+from .tasks import create_new_party_notice, create_participation_status_notice, schedule_participation_reminders
 
 
 @receiver(post_save, sender=Party)
 def send_new_party_notice(sender, instance, created, **kwargs):
     if created:
-        # 개발/로컬 확인용
+        # 전체 공지 1건만 저장하면 되므로 요청 안에서 바로 처리
         create_new_party_notice(instance.id)
-        # 운영에서는 create_new_party_notice.delay(instance.id)
+    else:
+        # 시작 시각이 바뀌었을 수 있으니 리마인더 fire_at 재계산
+        for kind, lead_time in PartyReminder.LEAD_TIMES.items():
+            PartyReminder.objects.filter(party=instance, kind=kind).update(
+                fire_at=instance.start_time - lead_time
+            )
 
 
 @receiver(post_save, sender=Participation)
@@ -23,3 +28,9 @@ def send_participation_status_notice(sender, instance, created, **kwargs):
     elif not created and instance.status == Participation.Status.CANCELED:
         create_participation_status_notice(instance.id, Notice.PARTY_CANCELED)
         # create_participation_status_notice.delay(instance.id, Notice.PARTY_CANCELED)
+
+    # upcoming 리마인더: 참가 확정 시 생성, 취소 시 삭제
+    if instance.status == Participation.Status.CONFIRMED:
+        schedule_participation_reminders([instance])
+    elif instance.status == Participation.Status.CANCELED:
+        PartyReminder.objects.filter(participation=instance).delete()
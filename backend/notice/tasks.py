@@ -1,9 +1,78 @@
 from celery import shared_task
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import F, Count
+from django.db.models import F
 from detailview.models import Party, Participation
-from .models import Notice
+from .models import Notice, PartyNoticeLog, PartyReminder
+from .consumers import BROADCAST_GROUP, user_group_name
+from .serializers import NoticeSerializer
+
+
+def _push_notices(notices):
+    """
+    알림 저장이 커밋된 뒤 받는 사람의 WebSocket 그룹으로 push
+    (개인 알림 → user_<id>, 전체 공지 → notice_broadcast)
+    """
+    messages = [
+        (
+            BROADCAST_GROUP if n.is_broadcast else user_group_name(n.user_id),
+            dict(NoticeSerializer(n).data),
+        )
+        for n in notices
+    ]
+
+    def send():
+        channel_layer = get_channel_layer()
+        for group_name, data in messages:
+            async_to_sync(channel_layer.group_send)(
+                group_name, {"type": "notice_created", "data": data}
+            )
+
+    # push 실패(채널 레이어 장애 등)가 알림 저장을 되돌리지 않도록 robust 처리
+    transaction.on_commit(send, robust=True)
+
+
+def _notify_party_participants(parties, notice_type, message_template):
+    """
+    parties의 참가자 전원에게 알림을 한 번에 생성.
+    PartyNoticeLog에 먼저 기록해서 같은 파티에 같은 알림이 다시 나가지 않게 함
+    (주기 작업이 다시 돌아도 새로 조건을 만족한 파티만 처리)
+    """
+    with transaction.atomic():
+        party_titles = dict(
+            parties.exclude(notice_logs__notice_type=notice_type).values_list("id", "title")
+        )
+        if not party_titles:
+            return []
+
+        # 동시에 돌던 작업이 먼저 기록했다면 IntegrityError로 전체 롤백 → 중복 발송 없음
+        PartyNoticeLog.objects.bulk_create([
+            PartyNoticeLog(party_id=party_id, notice_type=notice_type)
+            for party_id in party_titles
+        ])
+
+        participants = Participation.objects.filter(
+            party_id__in=party_titles, status__in=Participation.ACTIVE_STATUSES
+        ).values_list("user_id", "party_id")
+
+        notices = Notice.objects.bulk_create(
+            [
+                Notice(
+                    user_id=user_id,
+                    target_party_id=party_id,
+                    notice_type=notice_type,
+                    message=message_template.format(title=party_titles[party_id]),
+                )
+                for user_id, party_id in participants
+            ],
+            batch_size=500,
+        )
+        _push_notices(notices)
+    return notices
+
 
 # 1. 파티 오픈 1일 전 알림
 @shared_task
@@ -12,21 +81,16 @@ def create_party_open_notices():
     target_start = now + timedelta(hours=23)
     target_end = now + timedelta(hours=25)
 
-    parties = Party.objects.annotate(
-        participant_count=Count("participations")
-    ).filter(
+    parties = Party.objects.filter(
         start_time__range=(target_start, target_end),
-        participant_count=F("max_participants")  # 정원 꽉 찬 경우
+        applied_count=F("max_participants")  # 정원 꽉 찬 경우
     )
 
-    for party in parties:
-        participants = Participation.objects.filter(party=party)
-        for p in participants:
-            Notice.objects.create(
-                user=p.user,
-                notice_type=Notice.PARTY_OPEN_1DAY,
-                message=f"신청하신 '{party.title}'가 곧 열릴 예정이에요. 파티 즐길 준비 됐나요?"
-            )
+    _notify_party_participants(
+        parties,
+        Notice.PARTY_OPEN_1DAY,
+        "신청하신 '{title}'가 곧 열릴 예정이에요. 파티 즐길 준비 됐나요?",
+    )
 
 
 @shared_task
@@ -35,21 +99,16 @@ def create_insufficient_party_notices():
     target_start = now + timedelta(hours=23)
     target_end = now + timedelta(hours=25)
     
-    parties = Party.objects.annotate(
-        participant_count=Count("participations")
-    ).filter(
+    parties = Party.objects.filter(
         start_time__range=(target_start, target_end),
-        participant_count__lt=(F("max_participants") * 2 / 3)  # 최소인원 기준
+        applied_count__lt=(F("max_participants") * 2 / 3)  # 최소인원 기준
     )
 
-    for party in parties:
-        participants = Participation.objects.filter(party=party)
-        for p in participants:
-            Notice.objects.create(
-                user=p.user,
-                notice_type=Notice.PARTY_INSUFFICIENT,
-                message=f"신청하신 '{party.title}'이(가) 신청 인원 미달로 취소됐어요. 다음에 더 재밌는 자리로 찾아올게요."
-            )
+    _notify_party_participants(
+        parties,
+        Notice.PARTY_INSUFFICIENT,
+        "신청하신 '{title}'이(가) 신청 인원 미달로 취소됐어요. 다음에 더 재밌는 자리로 찾아올게요.",
+    )
 
 
 # 3. 새 파티 생성 알림
@@ -60,16 +119,24 @@ def create_new_party_notice(party_id):
     except Party.DoesNotExist:
         return
 
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
+    create_new_party_notices([party])
 
-    # host 필드가 없으니까 모든 유저 대상으로 알림 생성
-    for user in User.objects.all():
-        Notice.objects.create(
-            user=user,
+
+def create_new_party_notices(parties):
+    """
+    새 파티 알림을 한 번에 생성 (bulk_create로 만든 파티는 signal이 없으므로 직접 호출)
+    host 필드가 없으니까 모든 유저 대상 → 유저별 복사 대신 파티마다 전체 공지 1건만 저장
+    """
+    notices = Notice.objects.bulk_create([
+        Notice(
+            user=None,
+            target_party=party,
             notice_type=Notice.PARTY_NEW,
             message=f"새로운 파티가 열렸어요! '{party.title}'에서 새로운 친구들을 만나보세요."
         )
+        for party in parties
+    ])
+    _push_notices(notices)
 
 # 4. 파티 신청/취소 알림
 @shared_task
@@ -89,9 +156,58 @@ def create_participation_status_notice(participation_id, notice_type):
         message = f"'{party_title}' 파티 신청이 취소되었습니다."
 
     if message:
-        Notice.objects.create(
+        notice = Notice.objects.create(
             user=user,
             target_party=participation.party,
             notice_type=notice_type,
             message=message
         )
+        _push_notices([notice])
+
+
+# 5. upcoming 리마인더 미리 생성
+REMINDER_HORIZON = timedelta(hours=25)  # 주기 작업이 다시 맞춰 주는 범위 (가장 긴 리마인더 + 여유)
+
+
+def schedule_participation_reminders(participations):
+    """확정된 참가들의 리마인더 행 생성 (이미 있으면 파티 시작 시각 기준으로 fire_at만 갱신)"""
+    PartyReminder.objects.bulk_create(
+        [
+            PartyReminder(
+                participation=p,
+                user_id=p.user_id,
+                party_id=p.party_id,
+                kind=kind,
+                fire_at=p.party.start_time - lead_time,
+            )
+            for p in participations
+            for kind, lead_time in PartyReminder.LEAD_TIMES.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["participation", "kind"],
+        update_fields=["fire_at"],
+        batch_size=500,
+    )
+
+
+@shared_task
+def schedule_party_reminders():
+    """
+    곧 시작하는 파티의 리마인더를 다시 맞추고, 필요 없어진 리마인더를 정리
+    (참가 확정/취소 시점에는 signals에서 바로 반영됨 → 여기서는 누락/변경분 보정)
+    """
+    now = timezone.now()
+    participations = (
+        Participation.objects
+        .filter(
+            status=Participation.Status.CONFIRMED,
+            party__start_time__range=(now, now + REMINDER_HORIZON),
+        )
+        .select_related("party")
+    )
+    schedule_participation_reminders(participations)
+
+    # 노출 시간이 지났거나 더 이상 확정 상태가 아닌 참가의 리마인더 삭제
+    PartyReminder.objects.filter(fire_at__lt=now - PartyReminder.WINDOW).delete()
+    PartyReminder.objects.exclude(participation__status=Participation.Status.CONFIRMED).delete()
+
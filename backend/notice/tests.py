@@ -1,3 +1,288 @@
-from django.test import TestCase
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+import datetime
 
-# Create your tests here.
+from detailview.models import Place, Party, Participation
+from .models import Notice, NoticeReadCursor, PartyReminder
+from .consumers import BROADCAST_GROUP, user_group_name
+from .tasks import (
+    create_participation_status_notice,
+    schedule_party_reminders,
+    create_party_open_notices,
+    create_insufficient_party_notices,
+)
+
+User = get_user_model()
+
+
+class BroadcastNoticeTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@test.com", password="password123")
+            for i in range(3)
+        ]
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def setUp(self):
+        self.url = reverse("notice-list")
+
+    def _create_party(self, title="새 파티"):
+        return Party.objects.create(
+            place=self.place,
+            title=title,
+            start_time=timezone.now() + datetime.timedelta(days=3),
+        )
+
+    def _get(self, user, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(self.url, params)
+
+    def test_new_party_stores_single_broadcast(self):
+        """새 파티 알림은 유저 수와 관계없이 전체 공지 1건만 저장"""
+        party = self._create_party()
+
+        notices = Notice.objects.filter(notice_type=Notice.PARTY_NEW)
+        self.assertEqual(notices.count(), 1)
+        self.assertIsNone(notices.get().user_id)
+        self.assertEqual(notices.get().target_party, party)
+
+    def test_list_merges_personal_and_broadcast(self):
+        """목록은 내 개인 알림과 전체 공지를 함께 보여주고, 다른 유저 알림은 제외"""
+        self._create_party()
+        Notice.objects.create(user=self.users[0], notice_type=Notice.PARTY_APPLIED, message="내 알림")
+        Notice.objects.create(user=self.users[1], notice_type=Notice.PARTY_APPLIED, message="남의 알림")
+
+        response = self._get(self.users[0])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        types = sorted(n["notice_type"] for n in response.data)
+        self.assertEqual(types, [Notice.PARTY_APPLIED, Notice.PARTY_NEW])
+
+        paged = self._get(self.users[0], limit=1)
+        self.assertEqual(paged.data["count"], 2)
+        self.assertEqual(len(paged.data["results"]), 1)
+
+    def test_broadcast_hidden_from_users_joined_later(self):
+        """가입 이전에 만들어진 전체 공지는 보이지 않음"""
+        self._create_party()
+        late_user = User.objects.create_user(username="late", email="late@test.com", password="password123")
+
+        response = self._get(late_user)
+
+        self.assertEqual(response.data, [])
+
+    def test_reading_broadcast_moves_only_my_cursor(self):
+        """전체 공지 읽음 처리는 내 읽음 커서만 이동"""
+        self._create_party("첫 파티")
+        self._create_party("둘째 파티")
+        older, newer = Notice.objects.filter(user__isnull=True).order_by("id")
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.patch(reverse("notice-detail", args=[newer.id]), {"is_read": True})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_read"])
+        self.assertEqual(NoticeReadCursor.objects.get(user=self.users[0]).last_read_id, newer.id)
+        self.assertTrue(all(n["is_read"] for n in self._get(self.users[0]).data))
+        self.assertFalse(any(n["is_read"] for n in self._get(self.users[1]).data))
+
+        # 커서는 뒤로 가지 않음
+        self.client.force_authenticate(user=self.users[0])
+        self.client.patch(reverse("notice-detail", args=[older.id]), {"is_read": True})
+        self.assertEqual(NoticeReadCursor.objects.get(user=self.users[0]).last_read_id, newer.id)
+
+    def test_broadcast_cannot_be_deleted_by_user(self):
+        """전체 공지는 유저가 삭제할 수 없음"""
+        self._create_party()
+        broadcast = Notice.objects.get(user__isnull=True)
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.delete(reverse("notice-detail", args=[broadcast.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Notice.objects.filter(id=broadcast.id).exists())
+
+
+class NoticePushTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="pushuser", email="push@test.com", password="password123")
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def setUp(self):
+        self.channel_layer = get_channel_layer()
+
+    def _listen(self, group_name):
+        channel_name = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(group_name, channel_name)
+        return channel_name
+
+    def _receive(self, channel_name):
+        return async_to_sync(self.channel_layer.receive)(channel_name)
+
+    def test_notices_pushed_to_groups_after_commit(self):
+        """커밋 이후 개인 알림은 user_<id>, 전체 공지는 broadcast 그룹으로 push"""
+        personal = self._listen(user_group_name(self.user.id))
+        broadcast = self._listen(BROADCAST_GROUP)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            party = Party.objects.create(
+                place=self.place, title="새 파티",
+                start_time=timezone.now() + datetime.timedelta(days=3),
+            )
+            participation = Participation.objects.create(party=party, user=self.user)
+
+        message = self._receive(broadcast)
+        self.assertEqual(message["type"], "notice_created")
+        self.assertEqual(message["data"]["notice_type"], Notice.PARTY_NEW)
+
+        message = self._receive(personal)
+        self.assertEqual(message["data"]["notice_type"], Notice.PARTY_APPLIED)
+        self.assertEqual(message["data"]["target_party_id"], participation.party_id)
+
+    def test_nothing_pushed_before_commit(self):
+        """커밋 전에는 push 하지 않고 on_commit 콜백만 등록"""
+        party = Party.objects.create(
+            place=self.place, title="새 파티",
+            start_time=timezone.now() + datetime.timedelta(days=3),
+        )
+        participation = Participation.objects.create(party=party, user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            create_participation_status_notice(participation.id, Notice.PARTY_CANCELED)
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_list_since_returns_only_newer_notices(self):
+        """재접속 시 ?since=<id> 로 놓친 알림만 조회"""
+        first = Notice.objects.create(user=self.user, notice_type=Notice.PARTY_APPLIED, message="첫 알림")
+        second = Notice.objects.create(user=self.user, notice_type=Notice.PARTY_CANCELED, message="둘째 알림")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("notice-list"), {"since": first.id})
+
+        self.assertEqual([n["id"] for n in response.data], [second.id])
+
+
+class UpcomingReminderTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reminder", email="reminder@test.com", password="password123")
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def setUp(self):
+        self.url = reverse("notice-upcoming")
+        self.client.force_authenticate(user=self.user)
+
+    def _join(self, starts_in, status=Participation.Status.CONFIRMED):
+        party = Party.objects.create(
+            place=self.place, title=f"{starts_in} 뒤 파티",
+            start_time=timezone.now() + starts_in,
+        )
+        return Participation.objects.create(party=party, user=self.user, status=status)
+
+    def test_confirmed_participation_shows_reminder_in_window(self):
+        """확정 참가는 하루 전/2시간 전 구간에 리마인더 노출"""
+        day = self._join(datetime.timedelta(hours=23, minutes=30))
+        soon = self._join(datetime.timedelta(hours=1, minutes=30))
+        self._join(datetime.timedelta(hours=10))  # 어느 구간에도 속하지 않음
+        self._join(datetime.timedelta(hours=-30))  # 이미 지난 파티
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {(n["party_id"], n["when"]) for n in response.data},
+            {(day.party_id, "1day"), (soon.party_id, "2hours")},
+        )
+
+    def test_unconfirmed_or_canceled_participation_has_no_reminder(self):
+        """결제 대기/취소 참가는 리마인더 없음"""
+        self._join(datetime.timedelta(hours=23, minutes=30), status=Participation.Status.PENDING_PAYMENT)
+        canceled = self._join(datetime.timedelta(hours=1, minutes=30))
+        canceled.status = Participation.Status.CANCELED
+        canceled.save()
+
+        self.assertEqual(self.client.get(self.url).data, [])
+        self.assertFalse(PartyReminder.objects.exists())
+
+    def test_upcoming_is_single_query(self):
+        """기록이 많아도 upcoming은 쿼리 1번"""
+        for hours in range(30, 40):
+            self._join(datetime.timedelta(hours=-hours))
+        self._join(datetime.timedelta(hours=23, minutes=30))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 1)
+
+    def test_scheduler_follows_start_time_and_cleans_up(self):
+        """주기 작업은 바뀐 시작 시각을 반영하고 지난 리마인더를 정리"""
+        participation = self._join(datetime.timedelta(hours=10))
+        old = self._join(datetime.timedelta(hours=-30))
+        Party.objects.filter(pk=participation.party_id).update(
+            start_time=timezone.now() + datetime.timedelta(hours=23, minutes=30)
+        )
+
+        schedule_party_reminders()
+
+        self.assertEqual([n["when"] for n in self.client.get(self.url).data], ["1day"])
+        self.assertFalse(PartyReminder.objects.filter(participation=old).exists())
+
+
+class PartyReminderJobTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"job{i}", email=f"job{i}@test.com", password="password123")
+            for i in range(6)
+        ]
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def _party(self, max_participants, joined):
+        party = Party.objects.create(
+            place=self.place, title=f"{max_participants}인 파티",
+            max_participants=max_participants,
+            start_time=timezone.now() + datetime.timedelta(hours=24),
+        )
+        for u in joined:
+            Participation.objects.create(party=party, user=u)
+        return party
+
+    def test_open_notice_sent_once_per_full_party(self):
+        """정원이 찬 파티 참가자에게만 (취소한 유저 제외), 재실행해도 한 번만 발송"""
+        full = self._party(2, self.users[:2])
+        self._party(4, self.users[2:5])
+        Participation.objects.create(party=full, user=self.users[5], status=Participation.Status.CANCELED)
+
+        create_party_open_notices()
+        create_party_open_notices()
+
+        notices = Notice.objects.filter(notice_type=Notice.PARTY_OPEN_1DAY)
+        self.assertEqual(
+            set(notices.values_list("user_id", flat=True)),
+            {u.id for u in self.users[:2]},
+        )
+        self.assertTrue(all(n.target_party_id == full.id for n in notices))
+
+    def test_insufficient_notice_query_count_is_constant(self):
+        """파티/참가자 수와 관계없이 쿼리 수 고정, 재실행은 조회 1번으로 끝"""
+        for i in range(3):
+            self._party(9, self.users[i * 2:i * 2 + 2])
+
+        with self.assertNumQueries(6):  # savepoint, 파티 조회, 기록, 참가자 조회, 알림 생성, release
+            create_insufficient_party_notices()
+        self.assertEqual(Notice.objects.filter(notice_type=Notice.PARTY_INSUFFICIENT).count(), 6)
+
+        with self.assertNumQueries(3):
+            create_insufficient_party_notices()
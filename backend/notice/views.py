@@ -2,97 +2,81 @@ from django.shortcuts import render
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import Notice
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import PermissionDenied
+from .models import Notice, NoticeReadCursor, PartyReminder
 from .serializers import NoticeSerializer
-# import time, json
-# from django.http import StreamingHttpResponse
 from django.utils import timezone
-# from rest_framework.decorators import api_view, permission_classes, authentication_classes
-# from django.db import close_old_connections
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 
 from rest_framework.decorators import action
-from datetime import timedelta
-from detailview.models import Participation
 
+UPCOMING_LIMIT = 20  # upcoming 응답 최대 개수
 
-# @api_view(["GET"])
-# @permission_classes([IsAuthenticated])
-# @authentication_classes([SessionAuthentication, JWTAuthentication]) 
-# def notice_stream(request):
-#     def event_stream():
-#         last_check = timezone.now()
-#         while True:
-#             close_old_connections()
-#             new_notices = Notice.objects.filter(
-#                 user=request.user,
-#                 created_at__gt=last_check
-#             ).order_by("created_at")
-
-#             if new_notices.exists():
-#                 for n in new_notices:
-#                     payload = {
-#                         "id": n.id,
-#                         "message": n.message,
-#                         "type": n.notice_type,
-#                         "target_party_id": n.target_party_id,
-#                         "created_at": n.created_at.isoformat(),
-#                     }
-#                     yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
-
-#                 last_check = new_notices.last().created_at  # 마지막 알림 기준으로 갱신
-
-#             time.sleep(3)  # 3초마다 체크
-
-#     return StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+UPCOMING_MESSAGES = {
+    PartyReminder.ONE_DAY: "‘{title}’ 파티가 하루 뒤 열려요.",
+    PartyReminder.TWO_HOURS: "‘{title}’ 파티가 2시간 뒤 시작해요.",
+}
 
 
 class NoticeViewSet(viewsets.ModelViewSet):
     serializer_class = NoticeSerializer
     permission_classes = [IsAuthenticated]
+    # ?limit=&offset= 를 주면 페이지 단위로, 주지 않으면 기존처럼 전체 목록 반환
+    pagination_class = LimitOffsetPagination
+    # 알림은 서버에서만 생성/수정 → 조회, 읽음 처리, 삭제만 허용
+    http_method_names = ["get", "patch", "delete", "head", "options"]
 
     def get_queryset(self):
-        return Notice.objects.filter(user=self.request.user)
+        qs = Notice.visible_to(self.request.user)
+
+        # 재접속 시 놓친 알림만 받아가기: ?since=<마지막으로 받은 알림 id>
+        since = self.request.query_params.get("since")
+        if since and since.isdigit():
+            qs = qs.filter(id__gt=int(since))
+        return qs
 
     @action(detail=False, methods=["get"])
     def upcoming(self, request):
-        participations = (
-            Participation.objects
-            .filter(user=request.user, status=Participation.Status.CONFIRMED)
+        # 미리 만들어 둔 리마인더 중 지금 노출 구간에 있는 것만 (user, fire_at) 인덱스로 조회
+        now = timezone.now()
+        reminders = (
+            PartyReminder.objects
+            .filter(user=request.user, fire_at__range=(now - PartyReminder.WINDOW, now))
             .select_related("party")
+            .order_by("fire_at")[:UPCOMING_LIMIT]
         )
 
-        now = timezone.now()
         notices = []
-        for p in participations:
-            start = p.party.start_time
-            delta = start - now
-
-            if timedelta(hours=23) <= delta <= timedelta(hours=24):
-                notices.append({
-                    "party_id": p.party.id,
-                    "title": p.party.title,
-                    "message": f"‘{p.party.title}’ 파티가 하루 뒤 열려요.",
-                    "when": "1day",
-                    "start_time": start,
-                })
-            elif timedelta(hours=1) <= delta <= timedelta(hours=2):
-                notices.append({
-                    "party_id": p.party.id,
-                    "title": p.party.title,
-                    "message": f"‘{p.party.title}’ 파티가 2시간 뒤 시작해요.",
-                    "when": "2hours",
-                    "start_time": start,
-                })
+        for r in reminders:
+            party = r.party
+            notices.append({
+                "party_id": party.id,
+                "title": party.title,
+                "message": UPCOMING_MESSAGES[r.kind].format(title=party.title),
+                "when": r.kind,
+                "start_time": party.start_time,
+            })
 
         return Response(notices)
 
     # 읽음 처리 (PATCH)
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.is_read = True
-        instance.save()
+        if instance.is_broadcast:
+            # 전체 공지는 공지 자체가 아니라 내 읽음 커서를 앞으로 이동
+            cursor, _ = NoticeReadCursor.objects.get_or_create(user=request.user)
+            NoticeReadCursor.objects.filter(
+                pk=cursor.pk, last_read_id__lt=instance.id
+            ).update(last_read_id=instance.id)
+        else:
+            instance.is_read = True
+            instance.save()
+        instance.read_state = True
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+
+    def perform_destroy(self, instance):
+        if instance.is_broadcast:
+            raise PermissionDenied("전체 공지는 삭제할 수 없습니다.")
+        instance.delete()
     
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PartyassistConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'partyassist'
+
+    def ready(self):
+        import partyassist.signals
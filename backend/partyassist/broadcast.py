@@ -0,0 +1,22 @@
+"""
+standby 인원 브로드캐스트 묶음 전송.
+여러 명이 연달아 토글해도 파티마다 STANDBY_BROADCAST_WINDOW초에 한 번, 가장 최신(version이 큰) 상태만 party_<id>로 보냄
+"""
+from utils.broadcast import DebouncedBroadcaster
+
+
+class StandbyBroadcaster(DebouncedBroadcaster):
+    event_type = "send_standby_update"
+    window_setting = "STANDBY_BROADCAST_WINDOW"
+
+    def group_name(self, party_id):
+        return f"party_{party_id}"
+
+    def merge(self, pending, item):
+        # 요청 순서와 관계없이 PartyWaitState.version이 큰 상태가 최신
+        if pending is None or item["version"] >= pending["version"]:
+            return item
+        return pending
+
+
+standby_broadcaster = StandbyBroadcaster()
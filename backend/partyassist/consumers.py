@@ -1,9 +1,16 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from utils.wsauth import is_party_member
+
+
 class PartyConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.party_id = self.scope["url_route"]["kwargs"]["party_id"]
+        # 참가자만 파티 그룹에 가입 (참가 파티는 연결할 때 JWTAuthMiddleware가 읽어 둠)
+        if not is_party_member(self.scope, self.party_id):
+            await self.close()
+            return
         self.room_group_name = f"party_{self.party_id}"
 
         # 그룹에 가입
@@ -15,6 +22,8 @@ class PartyConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         # 그룹 탈퇴
+        if not hasattr(self, "room_group_name"):
+            return
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
@@ -25,5 +34,9 @@ class PartyConsumer(AsyncWebsocketConsumer):
         pass
 
     # 서버에서 브로드캐스트 호출 시 실행
+    # 클라이언트(Balancewait.jsx)는 두 메시지 모두 {type, data} 형태로 받아 type으로 구분
     async def send_standby_update(self, event):
-        await self.send(text_data=json.dumps(event["data"]))
+        await self.send(text_data=json.dumps({"type": "send_standby_update", "data": event["data"]}))
+
+    async def send_game_created(self, event):
+        await self.send(text_data=json.dumps({"type": "send_game_created", "data": event["data"]}))
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class PartyWaitState(models.Model):
+    """
+    대기실 상태 버전 (standby 토글, 참가자 변경, 라운드 생성/종료 때마다 1씩 증가)
+    폴링(PartyWaitStateView)은 이 버전만 보고 바뀌었는지 판단
+    """
+    party = models.OneToOneField(
+        "detailview.Party",
+        on_delete=models.CASCADE,
+        related_name="wait_state",
+        verbose_name="파티",
+    )
+    version = models.PositiveIntegerField("상태 버전", default=1)
+    last_updated = models.DateTimeField("최종 업데이트", auto_now=True)
+
+    def __str__(self):
+        return f"{self.party_id} 파티 대기 상태 v{self.version}"
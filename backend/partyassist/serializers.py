@@ -38,43 +38,85 @@ class PartyParticipantSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "is_standby", "is_reported"]
 
     def get_is_reported(self, obj):
+        # 목록이면 view에서 reported_user_ids(한 번 조회한 집합)를 context로 넘김
+        reported = self.context.get("reported_user_ids")
+        if reported is not None:
+            return obj.user_id in reported
+
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             return Report.objects.filter(
-                party=obj.party,
+                party_id=obj.party_id,
                 reporter=request.user,
-                reported_user=obj.user
+                reported_user_id=obj.user_id
             ).exists()
         return False
 
-# 롱폴링 응답을 위한 새로운 시리얼라이저
+
+def reported_user_ids(party_id, user):
+    """user가 이 파티에서 이미 신고한 사용자 id 집합 (참가자 목록 전체에 쿼리 1번)"""
+    if not user or not user.is_authenticated:
+        return set()
+    return set(
+        Report.objects.filter(party_id=party_id, reporter=user).values_list("reported_user_id", flat=True)
+    )
+
+class WaitingParticipantSerializer(serializers.ModelSerializer):
+    """대기실 참가자 (여러 사용자가 같은 캐시를 받으므로 요청자별 값인 is_reported는 없음)"""
+    user = UserProfileSerializer(read_only=True)
+
+    class Meta:
+        model = Participation
+        fields = ["id", "user", "is_standby"]
+
+
+# 대기실 폴링 응답을 위한 새로운 시리얼라이저
 class StandbyStateSerializer(serializers.Serializer):
+    """instance = Party, context["version"] = 이 결과를 만들 때 읽은 PartyWaitState.version"""
     version = serializers.IntegerField()
     participation_count = serializers.IntegerField()
     standby_count = serializers.IntegerField()
     active_round_id = serializers.UUIDField(allow_null=True)
-    participants = PartyParticipantSerializer(many=True)
+    participants = WaitingParticipantSerializer(many=True)
 
     def to_representation(self, instance):
         party = instance
         # 활성화된 라운드 조회
-        active_round = BalanceRound.objects.filter(party=party, is_active=True).first()
-
-        # 참여자 목록
-        participants_qs = Participation.objects.filter(party=party).select_related("user", "user__extra_setting")
+        active_round_id = (
+            BalanceRound.objects.filter(party=party, is_active=True).values_list("id", flat=True).first()
+        )
+
+        # 참여자 목록 (취소한 신청 제외)
+        participants_qs = (
+            Participation.objects
+            .filter(party=party, status__in=Participation.ACTIVE_STATUSES)
+            .select_related("user", "user__extra_setting")
+            .order_by("id")
+        )
 
         return {
-            "version": party.wait_state.version,
-            "participation_count": party.participations.count(),
-            "standby_count": party.participations.filter(is_standby=True).count(),
-            "active_round_id": active_round.id if active_round else None,
-            "participants": PartyParticipantSerializer(participants_qs, many=True, context=self.context).data
+            "version": self.context["version"],
+            "participation_count": party.applied_count,
+            "standby_count": party.standby_count,
+            "active_round_id": str(active_round_id) if active_round_id else None,
+            "participants": WaitingParticipantSerializer(participants_qs, many=True).data
         }
 
 
+# 내 파티 목록 카드에 보여줄 참가자 수
+PARTICIPANT_PREVIEW_SIZE = 5
+
+
+class SimpleUserProfileSerializer(serializers.ModelSerializer):
+    """프로필 이미지와 ID만 필요한 경우 (내 파티 목록 참가자 미리보기)"""
+    class Meta:
+        model = User
+        fields = ["id", "profile_image"]
+
+
 class MyPartySerializer(serializers.ModelSerializer):
     participants = serializers.SerializerMethodField()
-    participation_count = serializers.SerializerMethodField()
+    participation_count = serializers.IntegerField(source="applied_count", read_only=True)
     place_name = serializers.CharField(source="place.name", read_only=True)
     place_photo = serializers.ImageField(source="place.photo", read_only=True)
     place_x_norm = serializers.FloatField(source="place.x_norm", read_only=True)
@@ -89,17 +131,11 @@ class MyPartySerializer(serializers.ModelSerializer):
             "participation_count", "participants",
         ]
 
-    def get_participation_count(self, obj):
-        return obj.participations.count()
-
     def get_participants(self, obj):
-        # UserProfileSerializer가 중복 정의되어 있어 하나를 수정합니다.
-        # 프로필 이미지와 ID만 필요한 경우를 위해 별도 정의
-        class SimpleUserProfileSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = User
-                fields = ["id", "profile_image"]
-
-        qs = obj.participations.select_related("user")[:5]
-        return SimpleUserProfileSerializer([p.user for p in qs], many=True).data
-    
\ No newline at end of file
+        # MyPartyViewSet에서 파티마다 앞의 PREVIEW_SIZE명을 한 번에 prefetch(preview_participations)
+        previews = getattr(obj, "preview_participations", None)
+        if previews is None:
+            previews = obj.participations.filter(
+                status__in=Participation.ACTIVE_STATUSES
+            ).select_related("user").order_by("id")[:PARTICIPANT_PREVIEW_SIZE]
+        return SimpleUserProfileSerializer([p.user for p in previews], many=True).data
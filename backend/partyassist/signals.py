@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from detailview.models import Participation
+from game.models import BalanceRound
+from .waitstate import bump_wait_version_on_commit
+
+
+# 대기실 상태(참가자/standby 인원/진행 중 라운드)가 바뀌면 대기실 버전 증가
+# (queryset.update()는 signal이 없으므로 호출하는 쪽에서 bump_wait_version_on_commit 사용)
+@receiver([post_save, post_delete], sender=Participation)
+@receiver([post_save, post_delete], sender=BalanceRound)
+def bump_party_wait_version(sender, instance, **kwargs):
+    bump_wait_version_on_commit(instance.party_id)
@@ -1,3 +1,480 @@
-from django.test import TestCase
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+import datetime
+
+from detailview.models import Place, Party, Participation
+from mypage.models import ExtraSetting, Report
+from game.models import BalanceRound, BalanceQuestionSet
+from game.tasks import generate_balance_round, is_round_pending, prefetch_balance_question_sets
+from utils.wsauth import JWTAuthMiddleware
+from .broadcast import standby_broadcaster
+from .models import PartyWaitState
+from .routing import websocket_urlpatterns
+
+User = get_user_model()
+
+
+class StandbyRoundGenerationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"standby{i}", email=f"standby{i}@test.com", password="password123")
+            for i in range(3)
+        ]
+        cls.party = Party.objects.create(
+            place=Place.objects.create(name="테스트 장소", capacity=10),
+            title="게임 파티",
+            start_time=timezone.now() + datetime.timedelta(hours=1),
+        )
+        for user in cls.users:
+            Participation.objects.create(party=cls.party, user=user, status=Participation.Status.CONFIRMED)
+
+    def setUp(self):
+        cache.clear()
+
+    def _toggle(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse("partyassist:standby-toggle", args=[self.party.id]))
+
+    @mock.patch("partyassist.views.generate_balance_round.delay")
+    def test_majority_enqueues_generation_once(self, delay):
+        """과반수가 되면 202로 바로 응답하고 생성 작업은 한 번만 등록"""
+        self.assertEqual(self._toggle(self.users[0]).status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self._toggle(self.users[1])
+            second = self._toggle(self.users[2])  # 생성 중에 들어온 토글
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data["status"], "game_pending")
+        # 202도 200과 같은 대기 상태를 담음
+        self.assertTrue(second.data["is_standby"])
+        self.assertEqual((second.data["standby_count"], second.data["participation_count"]), (3, 3))
+        delay.assert_called_once_with(self.party.id, self.users[1].id)
+        self.assertTrue(is_round_pending(self.party.id))
+        self.assertFalse(BalanceRound.objects.exists())
+
+    @mock.patch("game.tasks.generate_balance_by_ai", return_value={"items": [{"a": "산책", "b": "카페"}]})
+    def test_worker_creates_round_and_broadcasts(self, generate):
+        """워커가 라운드/문항을 만들고 party 그룹에 완료 알림"""
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"party_{self.party.id}", channel_name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            round_id = generate_balance_round(self.party.id, self.users[0].id)
+
+        new_round = BalanceRound.objects.get(party=self.party)
+        self.assertEqual(round_id, str(new_round.id))
+        self.assertEqual(list(new_round.questions.values_list("a_text", "b_text")), [("산책", "카페")])
+        self.assertFalse(is_round_pending(self.party.id))
+
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message["type"], "send_game_created")
+        self.assertEqual(message["data"]["round_id"], round_id)
+
+        # 이미 라운드가 있으면 다시 생성하지 않음
+        self.assertIsNone(generate_balance_round(self.party.id))
+        self.assertEqual(generate.call_count, 1)
+
+    @mock.patch("partyassist.views.generate_balance_round.delay")
+    def test_majority_claims_pooled_set_without_ai(self, delay):
+        """미리 만든 문항 세트가 있으면 AI 호출 없이 바로 라운드 생성"""
+        pooled = BalanceQuestionSet.objects.create(party=self.party, items=[{"a": "노을", "b": "야경"}])
+        self._toggle(self.users[0])
+
+        response = self._toggle(self.users[1])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        new_round = BalanceRound.objects.get(party=self.party)
+        self.assertEqual(response.data["round_id"], str(new_round.id))
+        self.assertEqual(list(new_round.questions.values_list("a_text", flat=True)), ["노을"])
+        pooled.refresh_from_db()
+        self.assertIsNotNone(pooled.claimed_at)
+        self.assertFalse(is_round_pending(self.party.id))
+        delay.assert_not_called()
+
+    @mock.patch("game.tasks.generate_balance_by_ai", return_value={"items": [{"a": "산책", "b": "카페"}]})
+    def test_prefetch_fills_pool_once_per_upcoming_party(self, generate):
+        """곧 시작하는 파티마다 남은 세트가 없을 때만 문항 세트를 만듦"""
+        Party.objects.create(
+            place=self.party.place, title="먼 파티",
+            start_time=timezone.now() + datetime.timedelta(days=3),
+        )
+
+        self.assertEqual(prefetch_balance_question_sets(), 1)
+        self.assertEqual(prefetch_balance_question_sets(), 0)
+
+        self.assertEqual(BalanceQuestionSet.objects.get().party, self.party)
+        self.assertEqual(generate.call_count, 1)
+
+    @mock.patch("game.tasks.generate_balance_by_ai")
+    def test_prefetch_skips_fallback_items(self, generate):
+        """AI가 실패해 폴백 문항이 나오면 저장하지 않고 다음 주기에 다시 시도"""
+        generate.return_value = {"items": [{"a": "돗자리 피크닉", "b": "노을 산책"}], "fallback": True}
+        self.assertEqual(prefetch_balance_question_sets(), 0)
+        self.assertFalse(BalanceQuestionSet.objects.exists())
+
+        generate.return_value = {"items": [{"a": "산책", "b": "카페"}], "fallback": False}
+        self.assertEqual(prefetch_balance_question_sets(), 1)
+        self.assertEqual(BalanceQuestionSet.objects.get().items, [{"a": "산책", "b": "카페"}])
+
+
+class PartyWaitStateTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"waiter{i}", email=f"waiter{i}@test.com", password="password123")
+            for i in range(3)
+        ]
+        cls.party = Party.objects.create(
+            place=Place.objects.create(name="대기 장소", capacity=10),
+            title="대기 파티",
+            start_time=timezone.now() + datetime.timedelta(hours=1),
+        )
+        for user in cls.users[:2]:
+            Participation.objects.create(party=cls.party, user=user, status=Participation.Status.CONFIRMED)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.users[0])
+        self.url = reverse("partyassist:party-wait-state", args=[self.party.id])
+
+    def test_returns_state_and_skips_unchanged_polls(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], '"1"')
+        self.assertEqual(response.data["participation_count"], 2)
+        self.assertEqual([p["user"]["id"] for p in response.data["participants"]], [u.id for u in self.users[:2]])
+
+        # 바뀐 것이 없으면 참가자 확인 1번만
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"since": 1})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_bump_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("partyassist:standby-toggle", args=[self.party.id]))
+
+        response = self.client.get(self.url, {"since": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(response.data["standby_count"], 1)
+        self.assertTrue(response.data["participants"][0]["is_standby"])
+
+    @override_settings(WAIT_STATE_RETRY_AFTER=7)
+    def test_unchanged_poll_returns_immediately_with_retry_after(self):
+        """기다리지 않고 바로 304, 다음 폴링 시점은 Retry-After로"""
+        with mock.patch("partyassist.views.current_wait_version", return_value=1) as current:
+            response = self.client.get(self.url, {"since": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["Retry-After"], "7")
+        self.assertEqual(current.call_count, 1)
+
+    def test_only_participants(self):
+        self.client.force_authenticate(user=self.users[2])
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.url, {"since": "x"}).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PartyParticipantsQueryTest(APITestCase):
+
+    def _party_with(self, size):
+        party = Party.objects.create(
+            place=Place.objects.create(name=f"장소 {size}", capacity=10),
+            title=f"{size}명 파티",
+            start_time=timezone.now() - datetime.timedelta(hours=1),  # 시작 이후에만 조회 가능
+        )
+        users = [
+            User.objects.create_user(username=f"member{size}_{i}", email=f"member{size}_{i}@test.com", password="pw")
+            for i in range(size)
+        ]
+        for user in users:
+            Participation.objects.create(party=party, user=user, status=Participation.Status.CONFIRMED)
+            ExtraSetting.objects.create(user=user, grade="1", college="공대", personality="E")
+        return party, users
+
+    def _participants(self, party, viewer, queries):
+        self.client.force_authenticate(user=viewer)
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse("partyassist:standby-participants", args=[party.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_query_count_constant_over_party_size(self):
+        """권한 확인, 파티, 신고 집합, 참가자(+프로필 join) = 인원수와 관계없이 4번"""
+        small, small_users = self._party_with(2)
+        large, large_users = self._party_with(8)
+        Report.objects.create(party=large, reporter=large_users[0], reported_user=large_users[3], category="OTHER")
+
+        self.assertEqual(len(self._participants(small, small_users[0], 4)), 2)
+        data = self._participants(large, large_users[0], 4)
+
+        self.assertEqual(len(data), 8)
+        self.assertEqual(
+            [p["user"]["id"] for p in data if p["is_reported"]], [large_users[3].id]
+        )
+        self.assertEqual(data[0]["user"]["extra_setting"]["college"], "공대")
+
+
+class MyPartyListQueryTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = User.objects.create_user(username="me", email="me@test.com", password="pw")
+        cls.others = User.objects.bulk_create([
+            User(username=f"crowd{i}", email=f"crowd{i}@test.com") for i in range(7)
+        ])
+        cls.place = Place.objects.create(name="목록 장소", capacity=20)
+
+    def _join_party(self, title, crowd, my_status=Participation.Status.CONFIRMED):
+        party = Party.objects.create(
+            place=self.place, title=title, start_time=timezone.now() + datetime.timedelta(days=1),
+        )
+        Participation.objects.create(party=party, user=self.me, status=my_status)
+        for user in self.others[:crowd]:
+            Participation.objects.create(party=party, user=user, status=Participation.Status.CONFIRMED)
+        return party
+
+    def _list(self, queries):
+        self.client.force_authenticate(user=self.me)
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse("partyassist:myparty-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_previews_batched_for_all_parties(self):
+        """파티 목록 1번 + 미리보기 1번 (파티 수와 관계없음), 파티마다 최대 5명"""
+        self._join_party("작은 파티", crowd=1)
+        self.assertEqual(len(self._list(2)), 1)
+
+        self._join_party("큰 파티", crowd=7)
+        self._join_party("또 다른 파티", crowd=3)
+        self._join_party("취소한 파티", crowd=2, my_status=Participation.Status.CANCELED)
+
+        data = {card["title"]: card for card in self._list(2)}
+        self.assertEqual(set(data), {"작은 파티", "큰 파티", "또 다른 파티"})
+        self.assertEqual(len(data["큰 파티"]["participants"]), 5)
+        self.assertEqual(data["큰 파티"]["participation_count"], 8)
+        self.assertEqual(data["큰 파티"]["participants"][0]["id"], self.me.id)
+        self.assertEqual(data["큰 파티"]["place_name"], "목록 장소")
+
+
+@override_settings(STANDBY_BROADCAST_WINDOW=60)  # 예약 전송 대신 flush()를 직접 호출
+class StandbyToggleTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"toggler{i}", email=f"toggler{i}@test.com", password="pw")
+            for i in range(5)
+        ]
+        cls.party = Party.objects.create(
+            place=Place.objects.create(name="토글 장소", capacity=10),
+            title="토글 파티",
+            start_time=timezone.now() + datetime.timedelta(hours=1),
+        )
+        for user in cls.users:
+            Participation.objects.create(party=cls.party, user=user, status=Participation.Status.CONFIRMED)
+
+    def setUp(self):
+        cache.clear()
+        self.channel_layer = get_channel_layer()
+        self.channel_name = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(f"party_{self.party.id}", self.channel_name)
+
+    def tearDown(self):
+        standby_broadcaster.flush(self.party.id)
+
+    def _toggle(self, user):
+        self.client.force_authenticate(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("partyassist:standby-toggle", args=[self.party.id]))
+
+    def test_toggle_updates_counter_and_debounces_broadcast(self):
+        first = self._toggle(self.users[0])
+        self.assertTrue(first.data["is_standby"])
+        self._toggle(self.users[1])
+        self._toggle(self.users[1])  # 다시 해제
+        last = self._toggle(self.users[2])
+
+        self.assertEqual(last.data["standby_count"], 2)
+        self.assertEqual(last.data["version"], first.data["version"] + 3)
+        self.party.refresh_from_db()
+        self.assertEqual(self.party.standby_count, 2)
+        self.assertFalse(Participation.objects.get(party=self.party, user=self.users[1]).is_standby)
+
+        # 네 번의 토글이 최신 상태 한 번으로 전송
+        standby_broadcaster.flush(self.party.id)
+        message = async_to_sync(self.channel_layer.receive)(self.channel_name)
+        self.assertEqual(message["type"], "send_standby_update")
+        self.assertEqual(message["data"]["version"], last.data["version"])
+        self.assertEqual(message["data"]["standby_count"], 2)
+        self.assertIsNone(standby_broadcaster.flush(self.party.id))
+
+    def test_older_state_does_not_replace_newer(self):
+        standby_broadcaster.queue(self.party.id, {"version": 5, "standby_count": 3})
+        standby_broadcaster.queue(self.party.id, {"version": 4, "standby_count": 2})  # 늦게 도착한 이전 상태
+        self.assertEqual(standby_broadcaster.flush(self.party.id)["standby_count"], 3)
+
+
+class CanceledParticipantStandbyTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"leaver{i}", email=f"leaver{i}@test.com", password="pw")
+            for i in range(3)
+        ]
+        cls.party = Party.objects.create(
+            place=Place.objects.create(name="취소 장소", capacity=10),
+            title="취소 파티",
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+        for user in cls.users:
+            Participation.objects.create(party=cls.party, user=user, status=Participation.Status.CONFIRMED)
+
+    def test_leaving_drops_standby_and_toggle_access(self):
+        """참가를 취소하면 standby에서 빠지고 더 이상 토글할 수 없음"""
+        self.client.force_authenticate(user=self.users[0])
+        toggle_url = reverse("partyassist:standby-toggle", args=[self.party.id])
+        self.client.post(toggle_url)
+
+        response = self.client.post(reverse("detailview:party-leave", args=[self.party.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.party.refresh_from_db()
+        self.assertEqual((self.party.applied_count, self.party.standby_count), (2, 0))
+        self.assertFalse(Participation.objects.get(party=self.party, user=self.users[0]).is_standby)
+        self.assertEqual(self.client.post(toggle_url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class StandbyToggleConcurrencyTest(TransactionTestCase):
+    TOGGLERS = 20
+
+    def setUp(self):
+        cache.clear()
+        self.users = User.objects.bulk_create([
+            User(username=f"rushtoggle{i}", email=f"rushtoggle{i}@test.com") for i in range(self.TOGGLERS)
+        ])
+        self.party = Party.objects.create(
+            place=Place.objects.create(name="혼잡 장소", capacity=50),
+            title="혼잡 파티",
+            max_participants=50,
+            start_time=timezone.now() + datetime.timedelta(hours=1),
+        )
+        for user in self.users:
+            Participation.objects.create(party=self.party, user=user, status=Participation.Status.CONFIRMED)
+
+    @override_settings(STANDBY_BROADCAST_WINDOW=0.01)
+    def test_parallel_toggles_keep_counter_exact(self):
+        """여러 명이 동시에 여러 번 토글해도 standby_count가 실제 값과 같음"""
+        start = threading.Barrier(self.TOGGLERS)
+        before = PartyWaitState.objects.get(party=self.party).version
+
+        def toggle(i, user):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            try:
+                start.wait()
+                for _ in range(i % 3 + 1):  # 1~3번 토글
+                    client.post(reverse("partyassist:standby-toggle", args=[self.party.id]))
+            finally:
+                connection.close()
+
+        with mock.patch("partyassist.views.claim_pooled_round", return_value=None), \
+                mock.patch("partyassist.views.generate_balance_round"):
+            threads = [threading.Thread(target=toggle, args=(i, u)) for i, u in enumerate(self.users)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.party.refresh_from_db()
+        actual = Participation.objects.filter(party=self.party, is_standby=True).count()
+        self.assertEqual(actual, sum(1 for i in range(self.TOGGLERS) if (i % 3 + 1) % 2))
+        self.assertEqual(self.party.standby_count, actual)
+        # 토글마다 버전이 한 번씩 올라감
+        after = PartyWaitState.objects.get(party=self.party).version
+        self.assertEqual(after - before, sum(i % 3 + 1 for i in range(self.TOGGLERS)))
+
+
+class PartySocketAuthTest(TransactionTestCase):
+    """consumer는 다른 스레드에서 DB를 읽으므로 TransactionTestCase"""
+
+    def setUp(self):
+        self.member = User.objects.create(username="socketmember", email="socketmember@test.com")
+        self.outsider = User.objects.create(username="socketoutsider", email="socketoutsider@test.com")
+        self.party = Party.objects.create(
+            place=Place.objects.create(name="소켓 장소", capacity=10),
+            title="소켓 파티",
+            start_time=timezone.now() + datetime.timedelta(hours=1),
+        )
+        Participation.objects.create(party=self.party, user=self.member, status=Participation.Status.CONFIRMED)
+
+    async def _connect(self, query=b"", headers=()):
+        scope = {
+            "type": "websocket", "path": f"/ws/party/{self.party.id}/",
+            "query_string": query, "headers": list(headers),
+        }
+        communicator = ApplicationCommunicator(JWTAuthMiddleware(URLRouter(websocket_urlpatterns)), scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        output = await communicator.receive_output(1)
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(1)
+        return output["type"]
+
+    async def test_only_party_members_join_group(self):
+        member_token = str(AccessToken.for_user(self.member))
+        self.assertEqual(await self._connect(f"token={member_token}".encode()), "websocket.accept")
+        self.assertEqual(
+            await self._connect(headers=[(b"authorization", f"Bearer {member_token}".encode())]),
+            "websocket.accept",
+        )
+        outsider_token = str(AccessToken.for_user(self.outsider))
+        self.assertEqual(await self._connect(f"token={outsider_token}".encode()), "websocket.close")
+        self.assertEqual(await self._connect(), "websocket.close")
+        self.assertEqual(await self._connect(f"token={member_token}x".encode()), "websocket.close")
+
+    async def test_group_events_are_sent_in_client_format(self):
+        """standby 갱신과 게임 생성 모두 클라이언트가 기다리는 {type, data} 형태로 전달"""
+        scope = {
+            "type": "websocket", "path": f"/ws/party/{self.party.id}/",
+            "query_string": f"token={AccessToken.for_user(self.member)}".encode(), "headers": [],
+        }
+        communicator = ApplicationCommunicator(JWTAuthMiddleware(URLRouter(websocket_urlpatterns)), scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(1))["type"], "websocket.accept")
+
+        state = {"version": 3, "standby_count": 1, "participation_count": 2}
+        await get_channel_layer().group_send(f"party_{self.party.id}", {"type": "send_standby_update", "data": state})
+        message = json.loads((await communicator.receive_output(1))["text"])
+        self.assertEqual(message, {"type": "send_standby_update", "data": state})
+
+        await get_channel_layer().group_send(
+            f"party_{self.party.id}", {"type": "send_game_created", "data": {"round_id": "abc"}}
+        )
+        message = json.loads((await communicator.receive_output(1))["text"])
+        self.assertEqual(message, {"type": "send_game_created", "data": {"round_id": "abc"}})
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(1)
@@ -3,15 +3,18 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from .permissions import IsPartyParticipant
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-from .serializers import MyPartySerializer, PartyParticipantSerializer
+from .serializers import MyPartySerializer, PartyParticipantSerializer, PARTICIPANT_PREVIEW_SIZE, reported_user_ids
 from django.utils.timezone import now
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
 from detailview.models import Party, Participation
-from game.models import BalanceRound, BalanceQuestion
-from utils.gameAI import generate_balance_by_ai  # AI 문항 생성 유틸
+from game.models import BalanceRound
+from game.tasks import generate_balance_round, claim_pooled_round, mark_round_pending, clear_round_pending
+from utils.db import lock_rows
+from .broadcast import standby_broadcaster
+from .waitstate import bump_wait_version, current_wait_version, get_wait_state, retry_after
 
 
 class MyPartyViewSet(viewsets.ReadOnlyModelViewSet):
@@ -20,10 +23,23 @@ class MyPartyViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = MyPartySerializer
 
     def get_queryset(self):
-        return Party.objects.filter(
-            participations__user=self.request.user,
-            start_time__gt=now(),
-            is_cancelled=False
+        # 참가자 미리보기는 파티 수와 관계없이 쿼리 1번 (슬라이스 Prefetch → 파티별 ROW_NUMBER 윈도 함수)
+        previews = (
+            Participation.objects
+            .filter(status__in=Participation.ACTIVE_STATUSES)
+            .select_related("user")
+            .order_by("id")[:PARTICIPANT_PREVIEW_SIZE]
+        )
+        return (
+            Party.objects
+            .filter(
+                participations__user=self.request.user,
+                participations__status__in=Participation.ACTIVE_STATUSES,
+                start_time__gt=now(),
+                is_cancelled=False
+            )
+            .select_related("place")
+            .prefetch_related(Prefetch("participations", queryset=previews, to_attr="preview_participations"))
         )
 
 
@@ -34,82 +50,78 @@ class StandbyViewSet(viewsets.ViewSet):
     @action(detail=True, methods=['post'])
     def toggle(self, request, pk=None):
         party_id = pk
-        participation = get_object_or_404(Participation, party_id=party_id, user=request.user)
-
-        # 1) standby 토글
-        participation.is_standby = not participation.is_standby
-        participation.save()
+        mine = Participation.objects.filter(
+            party_id=party_id, user=request.user, status__in=Participation.ACTIVE_STATUSES
+        )
 
-        # 2) 카운트 계산
-        participation_count = Participation.objects.filter(party_id=party_id).count()
-        standby_count = Participation.objects.filter(party_id=party_id, is_standby=True).count()
+        # 1) standby 토글: 읽은 값일 때만 바꾸는 조건부 UPDATE (그 사이 바뀌었으면 다시 읽고 재시도)
+        with transaction.atomic():
+            while True:
+                # 읽기 전에 잠금 (SQLite에서 읽은 뒤 쓰기로 올라가다 다른 쓰기와 부딪히지 않게)
+                current = lock_rows(mine).values_list("is_standby", flat=True).first()
+                if current is None:
+                    return Response({"detail": "참가 정보가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+                if mine.filter(is_standby=current).update(is_standby=not current):
+                    break
+            is_standby = not current
+            # update()는 signal이 없으므로 standby_count 직접 증감
+            Party.adjust_counts(party_id, standby_count=1 if is_standby else -1)
+
+        # 2) 대기실 버전 증가 (폴링과 WebSocket이 같은 버전을 봄)
+        version = bump_wait_version(party_id)
+
+        # 3) 카운트 + 라운드 존재 여부를 쿼리 1번으로 (Party에 유지되는 집계 컬럼)
+        participation_count, standby_count, has_round = (
+            Party.objects
+            .filter(pk=party_id)
+            .annotate(has_round=Exists(BalanceRound.objects.filter(party_id=OuterRef("pk"))))
+            .values_list("applied_count", "standby_count", "has_round")
+            .get()
+        )
 
-        # 3) WebSocket 채널 준비
-        channel_layer = get_channel_layer()
+        # 모든 응답(200/201/202)에 같은 대기 상태를 담음
+        state = {
+            "party_id": party_id,
+            "user_id": request.user.id,
+            "is_standby": is_standby,
+            "participation_count": participation_count,
+            "standby_count": standby_count,
+            "version": version,
+        }
 
-        # 4) 조건: standby 인원이 과반수 초과 & 아직 활성 라운드 없음
+        # 4) 조건: standby 인원이 과반수 초과 & 아직 라운드 없음
         condition_met = standby_count > (participation_count / 2)
-        has_active_round = BalanceRound.objects.filter(party_id=party_id, is_active=True).exists()
 
-        if condition_met and not has_active_round:
-            try:
-                with transaction.atomic():
-                    party = Party.objects.get(pk=party_id)
-                    ai_result = generate_balance_by_ai(party, count=5)
-                    items = ai_result.get("items", [])
-
-                    # 라운드 & 질문 생성
-                    new_round = BalanceRound.objects.create(
-                        party=party,
-                        created_by=request.user,
-                        is_active=True  # 명시적으로 활성화
+        if condition_met and not has_round:
+            # 생성 중 표시가 이미 있으면(동시에 들어온 토글) 새로 시작하지 않음
+            if mark_round_pending(party_id):
+                # 미리 만들어 둔 문항 세트가 있으면 AI 호출 없이 바로 라운드 생성
+                new_round = claim_pooled_round(party_id, request.user.id)
+                if new_round is not None:
+                    clear_round_pending(party_id)
+                    return Response(
+                        {**state, "status": "game_created", "round_id": str(new_round.id)},
+                        status=status.HTTP_201_CREATED
                     )
-                    BalanceQuestion.objects.bulk_create([
-                        BalanceQuestion(round=new_round, order=i + 1, a_text=it["a"], b_text=it["b"])
-                        for i, it in enumerate(items)
-                    ])
-
-                # WebSocket broadcast: 게임 시작 알림
-                async_to_sync(channel_layer.group_send)(
-                    f"party_{party_id}",
-                    {
-                        "type": "send_game_created",
-                        "data": {"round_id": str(new_round.id)}
-                    }
-                )
 
-                return Response(
-                    {"status": "game_created", "round_id": str(new_round.id)},
-                    status=status.HTTP_201_CREATED
+                # 없으면 워커에서 AI로 생성하고 완료되면 party_<id> 그룹으로 알림
+                transaction.on_commit(
+                    lambda: generate_balance_round.delay(int(party_id), request.user.id)
                 )
+            return Response(
+                {**state, "status": "game_pending"},
+                status=status.HTTP_202_ACCEPTED
+            )
 
-            except Exception as e:
-                print(f"게임 생성 실패: {e}")
-                return Response(
-                    {"status": "error", "message": "게임 생성에 실패했습니다."},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-
-        # 5) 조건 미충족 시: standby 인원 업데이트 broadcast
-        async_to_sync(channel_layer.group_send)(
-            f"party_{party_id}",
-            {
-                "type": "send_standby_update",
-                "data": {
-                    "party_id": party_id,
-                    "participation_count": participation_count,
-                    "standby_count": standby_count
-                }
-            }
-        )
-
-        return Response({
+        # 5) 조건 미충족 시: standby 인원 업데이트 broadcast (파티마다 짧게 모아서 최신 상태만)
+        standby_broadcaster.queue(party_id, {
             "party_id": party_id,
-            "user_id": request.user.id,
-            "is_standby": participation.is_standby,
             "participation_count": participation_count,
-            "standby_count": standby_count
-        }, status=status.HTTP_200_OK)
+            "standby_count": standby_count,
+            "version": version,
+        })
+
+        return Response(state, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
     def participants(self, request, pk=None):
@@ -122,11 +134,50 @@ class StandbyViewSet(viewsets.ViewSet):
                 status=403
             )
 
-        participants = Participation.objects.filter(party=party).select_related("user")
+        # 프로필(extra_setting)은 join으로, 신고 여부는 집합 한 번 조회로 → 인원수와 관계없이 쿼리 수 일정
+        participants = (
+            Participation.objects
+            .filter(party=party, status__in=Participation.ACTIVE_STATUSES)
+            .select_related("user", "user__extra_setting")
+        )
         serializer = PartyParticipantSerializer(
             participants,
             many=True,
-            context={"request": request}
+            context={"request": request, "reported_user_ids": reported_user_ids(party.pk, request.user)}
         )
         return Response(serializer.data, status=200)
-    
\ No newline at end of file
+
+
+class PartyWaitStateView(APIView):
+    """
+    GET /api/partyassist/wait-state/<party_id>/?since=<버전>
+    - since 없음: 현재 대기실 상태를 바로 반환
+    - since 있음: 버전이 since보다 크면 상태, 그대로면 바로 304 + Retry-After (기다리며 워커를 붙잡지 않음)
+    바뀐 것이 없으면 참가자 확인 1번(unique 인덱스) 외에는 캐시만 읽음
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, party_id):
+        if not Participation.objects.filter(
+            party_id=party_id, user=request.user, status__in=Participation.ACTIVE_STATUSES
+        ).exists():
+            return Response({"detail": "해당 파티 참가자만 볼 수 있습니다."}, status=status.HTTP_403_FORBIDDEN)
+
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return Response({"detail": "since는 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        version = current_wait_version(party_id)
+
+        if version is None:
+            return Response({"detail": "존재하지 않는 파티입니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        if since is not None and version <= since:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response["Retry-After"] = str(retry_after())
+        else:
+            response = Response(get_wait_state(party_id, version), status=status.HTTP_200_OK)
+        response["ETag"] = f'"{version}"'
+        return response
@@ -0,0 +1,70 @@
+"""
+대기실 상태 (PartyWaitState.version + 직렬화해 둔 상태 캐시).
+- 상태가 바뀌는 곳(standby 토글, 참가자 변경, 라운드 생성/종료)에서 bump_wait_version()
+- 현재 버전은 캐시에서 읽고, 없을 때만 party_id(unique 인덱스)로 한 번 조회
+- 상태 본문은 버전별로 한 번만 직렬화해서 캐시
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from detailview.models import Party
+from .models import PartyWaitState
+from .serializers import StandbyStateSerializer
+
+WAIT_STATE_TIMEOUT = 60 * 60
+
+
+def _version_key(party_id):
+    return f"party_wait_version:{party_id}"
+
+
+def _state_key(party_id, version):
+    return f"party_wait_state:{party_id}:{version}"
+
+
+def bump_wait_version(party_id):
+    """버전을 1 올리고 새 버전 반환 (캐시에는 커밋 후 반영). 파티가 삭제됐으면 None"""
+    with transaction.atomic():
+        if not PartyWaitState.objects.filter(party_id=party_id).update(version=F("version") + 1):
+            if not Party.objects.filter(pk=party_id).exists():
+                return None
+            PartyWaitState.objects.get_or_create(party_id=party_id, defaults={"version": 2})
+        version = PartyWaitState.objects.values_list("version", flat=True).get(party_id=party_id)
+    transaction.on_commit(lambda: cache.set(_version_key(party_id), version, WAIT_STATE_TIMEOUT))
+    return version
+
+
+def bump_wait_version_on_commit(party_id):
+    """지금 트랜잭션이 커밋된 뒤 버전 증가 (대기실 행 잠금을 호출한 트랜잭션 안에서 오래 잡지 않음)"""
+    transaction.on_commit(lambda: bump_wait_version(party_id))
+
+
+def current_wait_version(party_id):
+    """현재 버전 (파티가 없으면 None)"""
+    version = cache.get(_version_key(party_id))
+    if version is None:
+        version = PartyWaitState.objects.filter(party_id=party_id).values_list("version", flat=True).first()
+        if version is None:
+            if not Party.objects.filter(pk=party_id).exists():
+                return None
+            version = PartyWaitState.objects.get_or_create(party_id=party_id)[0].version
+        cache.add(_version_key(party_id), version, WAIT_STATE_TIMEOUT)
+    return version
+
+
+def get_wait_state(party_id, version):
+    """version의 대기실 상태 (버전마다 한 번만 직렬화)"""
+    key = _state_key(party_id, version)
+    state = cache.get(key)
+    if state is None:
+        party = Party.objects.get(pk=party_id)
+        state = StandbyStateSerializer(party, context={"version": version}).data
+        cache.add(key, state, WAIT_STATE_TIMEOUT)
+    return state
+
+
+def retry_after():
+    """바뀐 게 없을 때 다음 폴링까지 기다릴 시간(초) - 요청을 붙잡아 두지 않고 클라이언트가 다시 묻게 함"""
+    return settings.WAIT_STATE_RETRY_AFTER
@@ -2,6 +2,9 @@ from rest_framework import serializers
 from django.db import transaction
 from django.utils import timezone
 from detailview.models import Participation, Party
+from users import points
+from users.models import PointTransaction
+from utils.db import lock_rows
 from .models import Payment
 from django.contrib.auth import get_user_model
 
@@ -17,12 +20,16 @@ class ReserveJoinSerializer(serializers.Serializer):
             raise serializers.ValidationError("존재하지 않는 파티입니다.")
         return party
 
+    @transaction.atomic
     def create(self, validated_data):
         user = self.context["request"].user
-        party = validated_data["party_id"]
+
+        # 파티 행 잠금 → 같은 파티의 동시 신청은 여기서 한 줄로 처리되어 정원 초과 불가
+        party = lock_rows(Party.objects.filter(pk=validated_data["party_id"].pk)).get()
         
         same_day_exists = Participation.objects.filter(
             user=user,
+            status__in=Participation.ACTIVE_STATUSES,  # 취소/만료된 신청은 제외
             party__start_time__date=party.start_time.date()
         ).exists()
 
@@ -30,21 +37,26 @@ class ReserveJoinSerializer(serializers.Serializer):
             # 프론트에서 구분하기 쉽게 special key 추가
             raise serializers.ValidationError({"daily_limit": True})
 
-        # 정원 체크
-        confirmed_count = party.participations.filter(
-            status=Participation.Status.CONFIRMED
-        ).count()
-        if confirmed_count >= party.max_participants:
+        # 정원 체크: 확정 인원 + 아직 만료되지 않은 결제 대기 인원
+        if party.held_seats >= party.max_participants:
             raise serializers.ValidationError("정원이 가득 찼습니다.")
 
         # 이미 존재하는 신청 체크
         existing = Participation.objects.filter(user=user, party=party).first()
-        if existing:
+        if existing and existing.status != Participation.Status.CANCELED:
             raise serializers.ValidationError(
                 f"이미 신청한 파티입니다. 현재 상태: {existing.get_status_display()}"
             )
 
-        # 참여 생성 (결제 대기 상태)
+        # 취소/만료됐던 신청은 같은 행을 결제 대기로 되살림 (결제 대기 시간도 다시 시작)
+        if existing:
+            existing.status = Participation.Status.PENDING_PAYMENT
+            existing.created_at = timezone.now()
+            existing.paid_at = None
+            existing.save(update_fields=["status", "created_at", "paid_at"])
+            return existing
+
+        # 참여 생성 (결제 대기 상태, pending_count는 signals에서 함께 증가)
         participation = Participation.objects.create(
             user=user,
             party=party,
@@ -89,12 +101,13 @@ class ReservePaySerializer(serializers.Serializer):
         method = validated_data["payment_method"]
 
         try:
-            participation = Participation.objects.select_related("party").get(id=participation_id)
+            # 만료 스윕과 동시에 처리되지 않도록 행 잠금
+            participation = lock_rows(Participation.objects.filter(id=participation_id)).select_related("party").get()
         except Participation.DoesNotExist:
             raise serializers.ValidationError("존재하지 않는 예약 정보입니다.")
 
         # 본인 예약인지 확인
-        if participation.user != user:
+        if participation.user_id != user.id:
             raise serializers.ValidationError("본인의 예약만 결제할 수 있습니다.")
 
         # 상태 확인
@@ -103,34 +116,46 @@ class ReservePaySerializer(serializers.Serializer):
                 f"결제 대기 상태가 아닙니다. 현재 상태: {participation.get_status_display()}"
             )
 
+        if participation.is_hold_expired:
+            raise serializers.ValidationError("결제 가능 시간이 지났습니다. 다시 신청해 주세요.")
+
         party = participation.party
 
         # 결제 수단 확인
         if method != Payment.Method.POINT:
             raise serializers.ValidationError("현재는 포인트 결제만 지원합니다.")
 
-        # 포인트 확인
-        if user.points < party.deposit:
+        # 포인트 차감: 잔액 확인과 차감을 조건부 UPDATE 한 번으로 처리하고 원장에 기록
+        # (신청마다 키가 달라서 같은 신청의 결제가 재시도돼도 한 번만 차감)
+        try:
+            points.debit(
+                user.id,
+                party.deposit,
+                PointTransaction.Kind.PAYMENT,
+                idempotency_key=f"pay:{participation.id}:{participation.created_at:%Y%m%d%H%M%S%f}",
+                participation=participation,
+            )
+        except points.InsufficientPoints:
+            user.refresh_from_db(fields=["points"])
             raise serializers.ValidationError(
                 f"포인트가 부족합니다. 필요한 포인트: {party.deposit}, 보유 포인트: {user.points}"
             )
-
-        # 포인트 차감
-        user.points -= party.deposit
-        user.save(update_fields=["points"])
+        user.refresh_from_db(fields=["points"])
 
         # 참여 확정
         participation.status = Participation.Status.CONFIRMED
         participation.paid_at = timezone.now()
         participation.save(update_fields=["status", "paid_at"])
 
-        # 결제 기록 생성
-        payment = Payment.objects.create(
-            user=user,
+        # 결제 기록 생성 (취소 후 다시 신청한 경우 이전 결제 기록을 갱신, 이력은 원장에 남아 있음)
+        payment, _ = Payment.objects.update_or_create(
             participation=participation,
-            amount=party.deposit,
-            status=Payment.Status.SUCCESS,
-            method=method,
+            defaults={
+                "user": user,
+                "amount": party.deposit,
+                "status": Payment.Status.SUCCESS,
+                "method": method,
+            },
         )
         return payment
 
@@ -0,0 +1,65 @@
+from collections import Counter
+
+from celery import shared_task
+from django.db import transaction
+
+from detailview.models import Party, Participation
+from notice.models import Notice
+from notice.tasks import _push_notices
+from partyassist.waitstate import bump_wait_version_on_commit
+from utils.db import lock_rows
+
+EXPIRE_BATCH_SIZE = 500
+
+
+def _expire_hold_batch():
+    """
+    만료된 결제 대기 신청을 한 묶음 취소 처리하고 처리한 건수를 반환.
+    update()는 signal이 없으므로 인원 집계(목록 캐시 버전 포함)/대기실 버전 반영과 취소 알림 생성도 여기서 한 번에 처리
+    """
+    with transaction.atomic():
+        # 같은 행을 결제 중인 요청이 있으면 건너뛰고 다음 스윕에서 처리
+        holds = list(
+            lock_rows(Participation.expired_holds(), skip_locked=True)
+            .order_by("created_at")
+            .values_list("id", "party_id", "user_id", "is_standby")[:EXPIRE_BATCH_SIZE]
+        )
+        if not holds:
+            return 0
+
+        Participation.objects.filter(
+            pk__in=[hold_id for hold_id, _, _, _ in holds]
+        ).update(status=Participation.Status.CANCELED, is_standby=False)
+
+        released = Counter(party_id for _, party_id, _, _ in holds)
+        standby_released = Counter(party_id for _, party_id, _, is_standby in holds if is_standby)
+        for party_id, count in released.items():
+            Party.adjust_counts(
+                party_id,
+                applied_count=-count,
+                pending_count=-count,
+                standby_count=-standby_released[party_id],
+            )
+            bump_wait_version_on_commit(party_id)
+
+        party_titles = dict(Party.objects.filter(pk__in=released).values_list("id", "title"))
+        notices = Notice.objects.bulk_create([
+            Notice(
+                user_id=user_id,
+                target_party_id=party_id,
+                notice_type=Notice.PARTY_CANCELED,
+                message=f"'{party_titles[party_id]}' 파티 결제 시간이 지나 신청이 취소되었습니다.",
+            )
+            for _, party_id, user_id, _ in holds
+        ])
+        _push_notices(notices)
+    return len(holds)
+
+
+@shared_task
+def expire_pending_holds():
+    """결제 대기 시간이 지난 신청을 묶음 단위로 취소해서 정원을 돌려줌"""
+    expired = 0
+    while batch := _expire_hold_batch():
+        expired += batch
+    return expired
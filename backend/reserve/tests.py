@@ -1,3 +1,335 @@
-from django.test import TestCase
+import threading
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from io import StringIO
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import serializers, status
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+import datetime
+
+from detailview.models import Place, Party, Participation
+from notice.models import Notice
+from users import points
+from users.models import PointTransaction
+from .models import Payment
+from .serializers import ReserveJoinSerializer, ReservePaySerializer
+from .tasks import expire_pending_holds
+
+User = get_user_model()
+
+
+def _make_users(prefix, count):
+    return [
+        User.objects.create_user(username=f"{prefix}{i}", email=f"{prefix}{i}@test.com", password="password123")
+        for i in range(count)
+    ]
+
+
+class ReserveJoinCapacityTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = _make_users("join", 3)
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def setUp(self):
+        self.party = Party.objects.create(
+            place=self.place,
+            title="정원 파티",
+            max_participants=2,
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+
+    def _join(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse("reserve:reserve-join", args=[self.party.id]))
+
+    def test_pending_holds_count_against_capacity(self):
+        """결제 대기 중인 신청도 정원을 차지"""
+        self.assertEqual(self._join(self.users[0]).status_code, status.HTTP_200_OK)
+        self.assertEqual(self._join(self.users[1]).status_code, status.HTTP_200_OK)
+
+        response = self._join(self.users[2])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("정원이 가득 찼습니다.", response.data)
+        self.party.refresh_from_db()
+        self.assertEqual((self.party.pending_count, self.party.confirmed_count), (2, 0))
+
+    def test_join_query_count_does_not_grow_with_participants(self):
+        """신청 인원이 늘어도 신청 처리 쿼리 수는 그대로"""
+        self.party.max_participants = 10
+        self.party.save()
+        users = _make_users("many", 4)
+
+        with CaptureQueriesContext(connection) as first:
+            self._join(users[0])
+        for user in users[1:3]:
+            self._join(user)
+        with CaptureQueriesContext(connection) as last:
+            self._join(users[3])
+
+        self.assertEqual(len(first), len(last))
+
+
+class ExpirePendingHoldsTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = _make_users("hold", 3)
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def setUp(self):
+        self.party = Party.objects.create(
+            place=self.place,
+            title="만료 파티",
+            max_participants=2,
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+
+    def _hold(self, user, age, status=Participation.Status.PENDING_PAYMENT):
+        participation = Participation.objects.create(party=self.party, user=user, status=status)
+        Participation.objects.filter(pk=participation.pk).update(created_at=timezone.now() - age)
+        return participation
+
+    def test_sweeper_cancels_expired_holds_and_releases_seats(self):
+        """TTL이 지난 결제 대기만 취소하고 좌석/알림을 한 번에 처리"""
+        expired = self._hold(self.users[0], datetime.timedelta(hours=2))
+        fresh = self._hold(self.users[1], datetime.timedelta(minutes=1))
+        paid = self._hold(self.users[2], datetime.timedelta(hours=2), status=Participation.Status.CONFIRMED)
+
+        self.assertEqual(expire_pending_holds(), 1)
+        self.assertEqual(expire_pending_holds(), 0)
+
+        statuses = dict(Participation.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[expired.pk], Participation.Status.CANCELED)
+        self.assertEqual(statuses[fresh.pk], Participation.Status.PENDING_PAYMENT)
+        self.assertEqual(statuses[paid.pk], Participation.Status.CONFIRMED)
+        self.party.refresh_from_db()
+        self.assertEqual((self.party.applied_count, self.party.pending_count), (2, 1))
+        self.assertTrue(Notice.objects.filter(
+            user=self.users[0], notice_type=Notice.PARTY_CANCELED, target_party=self.party
+        ).exists())
+
+    def test_expired_hold_leaves_standby(self):
+        """만료된 신청의 게임 대기도 해제되고 standby_count에서 빠짐"""
+        expired = self._hold(self.users[0], datetime.timedelta(hours=2))
+        Participation.objects.filter(pk=expired.pk).update(is_standby=True)
+        Party.adjust_counts(self.party.id, standby_count=1)
+
+        expire_pending_holds()
+
+        self.assertFalse(Participation.objects.get(pk=expired.pk).is_standby)
+        self.party.refresh_from_db()
+        self.assertEqual(self.party.standby_count, 0)
+
+    def test_expired_user_can_join_again(self):
+        """만료된 신청자는 같은 파티/같은 날에 다시 신청 가능"""
+        self._hold(self.users[0], datetime.timedelta(hours=2))
+        expire_pending_holds()
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(reverse("reserve:reserve-join", args=[self.party.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], Participation.Status.PENDING_PAYMENT)
+        self.party.refresh_from_db()
+        self.assertEqual((self.party.applied_count, self.party.pending_count), (1, 1))
+
+    def test_expired_hold_cannot_be_paid(self):
+        """스윕 전이라도 TTL이 지난 신청은 결제 불가"""
+        hold = self._hold(self.users[0], datetime.timedelta(hours=2))
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(reverse("reserve:reserve-pay", args=[hold.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PointLedgerTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="payer", email="payer@test.com", password="password123")
+        cls.place = Place.objects.create(name="테스트 장소", capacity=10)
+
+    def setUp(self):
+        self.party = Party.objects.create(
+            place=self.place,
+            title="유료 파티",
+            deposit=3000,
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _join_and_pay(self):
+        self.client.post(reverse("reserve:reserve-join", args=[self.party.id]))
+        participation = Participation.objects.get(party=self.party, user=self.user)
+        return self.client.post(reverse("reserve:reserve-pay", args=[participation.id]))
+
+    def _audit(self):
+        out = StringIO()
+        call_command("audit_point_ledger", stdout=out)
+        return out.getvalue()
+
+    def test_pay_and_leave_are_recorded_in_ledger(self):
+        """결제/환불이 원장에 남고 잔액이 원장 합계와 일치"""
+        response = self._join_and_pay()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["remaining_points"], 7000)
+
+        response = self.client.post(reverse("detailview:party-leave", args=[self.party.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.points, 10000)
+        self.assertEqual(
+            list(self.user.point_transactions.order_by("id").values_list("kind", "amount")),
+            [("OPENING", 10000), ("PAYMENT", -3000), ("REFUND", 3000)],
+        )
+        self.assertEqual(Payment.objects.get().status, Payment.Status.REFUNDED)
+        self.assertIn("일치", self._audit())
+
+        # 취소된 신청은 다시 취소(환불)할 수 없음
+        response = self.client.post(reverse("detailview:party-leave", args=[self.party.id]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejoin_after_leave_can_pay_again(self):
+        """취소 후 다시 신청하면 새 결제로 차감"""
+        self._join_and_pay()
+        self.client.post(reverse("detailview:party-leave", args=[self.party.id]))
+
+        response = self._join_and_pay()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["remaining_points"], 7000)
+        self.assertEqual(self.user.point_transactions.filter(kind="PAYMENT").count(), 2)
+
+    def test_same_idempotency_key_applies_once(self):
+        """같은 키로 재시도된 차감은 한 번만 반영"""
+        first = points.debit(self.user.id, 1000, PointTransaction.Kind.PAYMENT, idempotency_key="retry-1")
+        again = points.debit(self.user.id, 1000, PointTransaction.Kind.PAYMENT, idempotency_key="retry-1")
+
+        self.assertEqual(first.pk, again.pk)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.points, 9000)
+
+    def test_user_with_ledger_can_be_deleted(self):
+        """원장이 있어도 유저 삭제(탈퇴)가 막히지 않고, 원장은 user_id와 함께 남음"""
+        user = User.objects.create_user(username="leaver", email="leaver@test.com", password="password123")
+        user_id = user.id
+
+        user.delete()
+
+        self.assertTrue(PointTransaction.objects.filter(user_id=user_id, kind="OPENING").exists())
+
+    def test_insufficient_points_rejected_without_ledger_entry(self):
+        """잔액 부족이면 차감/기록 없이 거절"""
+        self.party.deposit = 20000
+        self.party.save()
+
+        response = self._join_and_pay()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.user.point_transactions.filter(kind="PAYMENT").exists())
+
+
+class ReserveJoinConcurrencyTest(TransactionTestCase):
+    JOINERS = 100
+
+    def setUp(self):
+        # 비밀번호 해싱 없이 한 번에 생성
+        self.users = User.objects.bulk_create([
+            User(username=f"rush{i}", email=f"rush{i}@test.com") for i in range(self.JOINERS)
+        ])
+        self.party = Party.objects.create(
+            place=Place.objects.create(name="인기 장소", capacity=10),
+            title="인기 파티",
+            max_participants=5,
+            start_time=timezone.now() + datetime.timedelta(days=2),
+        )
+
+    def test_parallel_joins_never_oversell(self):
+        """동시에 몰린 신청도 정원만큼만 성공"""
+        results = []
+        start = threading.Barrier(self.JOINERS)
+
+        def join(user):
+            serializer = ReserveJoinSerializer(
+                data={"party_id": self.party.id},
+                context={"request": SimpleNamespace(user=user)},
+            )
+            try:
+                serializer.is_valid(raise_exception=True)
+                start.wait()
+                serializer.save()
+                results.append("joined")
+            except serializers.ValidationError:
+                results.append("full")
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=join, args=(u,)) for u in self.users]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.party.refresh_from_db()
+        self.assertEqual(results.count("joined"), self.party.max_participants)
+        self.assertEqual(results.count("full"), self.JOINERS - self.party.max_participants)
+        self.assertEqual(Participation.objects.filter(party=self.party).count(), self.party.max_participants)
+        self.assertEqual(self.party.pending_count, self.party.max_participants)
+
+    def test_parallel_payments_never_double_spend(self):
+        """잔액 하나로 여러 파티를 동시에 결제해도 잔액만큼만 성공"""
+        payer = User.objects.create_user(username="payer", email="payer@test.com", password="password123")
+        holds = [
+            Participation.objects.create(
+                user=payer,
+                party=Party.objects.create(
+                    place=self.party.place,
+                    title=f"유료 파티 {i}",
+                    deposit=4000,
+                    start_time=timezone.now() + datetime.timedelta(days=3 + i),
+                ),
+            )
+            for i in range(8)
+        ]
+        results = []
+        start = threading.Barrier(len(holds))
+
+        def pay(hold):
+            serializer = ReservePaySerializer(
+                data={"participation_id": hold.id},
+                context={"request": SimpleNamespace(user=User.objects.get(pk=payer.pk))},
+            )
+            try:
+                serializer.is_valid(raise_exception=True)
+                start.wait()
+                serializer.save()
+                results.append("paid")
+            except serializers.ValidationError:
+                results.append("rejected")
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=pay, args=(h,)) for h in holds]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        payer.refresh_from_db()
+        self.assertEqual(results.count("paid"), 2)
+        self.assertEqual(payer.points, 2000)
+        self.assertEqual(
+            sum(payer.point_transactions.values_list("amount", flat=True)),
+            payer.points,
+        )
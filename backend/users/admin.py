@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, SocialAccount
+from .models import User, SocialAccount, PointTransaction
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -14,3 +14,17 @@ class CustomUserAdmin(UserAdmin):
 class SocialAccountAdmin(admin.ModelAdmin):
     list_display = ("id", "provider", "social_id", "user")
     search_fields = ("provider", "social_id", "user__username", "user__email")
+
+
+@admin.register(PointTransaction)
+class PointTransactionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "kind", "amount", "balance_after", "participation", "created_at")
+    list_filter = ("kind",)
+    search_fields = ("user__username", "idempotency_key")
+
+    # 원장은 추가만 가능 (수정/삭제 불가)
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "유저 포인트가 포인트 원장(PointTransaction) 합계와 같은지 확인합니다."
+
+    def handle(self, *args, **options):
+        mismatched = list(
+            User.objects
+            .annotate(ledger_balance=Coalesce(Sum("point_transactions__amount"), Value(0)))
+            .exclude(points=F("ledger_balance"))
+            .values_list("pk", "points", "ledger_balance")
+        )
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS("모든 유저의 포인트가 원장과 일치합니다."))
+            return
+
+        for pk, points, ledger_balance in mismatched:
+            self.stdout.write(f"user {pk}: 포인트 {points}, 원장 합계 {ledger_balance}")
+        self.stdout.write(self.style.WARNING(f"원장과 어긋난 유저 {len(mismatched)}명"))
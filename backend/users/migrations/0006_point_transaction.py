@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def record_opening_balances(apps, schema_editor):
+    # 기존 유저는 현재 포인트를 원장의 기초 잔액으로 기록
+    User = apps.get_model("users", "User")
+    PointTransaction = apps.get_model("users", "PointTransaction")
+
+    PointTransaction.objects.bulk_create(
+        [
+            PointTransaction(
+                user_id=pk,
+                kind="OPENING",
+                amount=balance,
+                balance_after=balance,
+                idempotency_key=f"opening:{pk}",
+            )
+            for pk, balance in User.objects.values_list("pk", "points").iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detailview', '0008_participation_status_created_idx'),
+        ('users', '0005_alter_socialaccount_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('OPENING', '기초 잔액'), ('PAYMENT', '예약금 결제'), ('REFUND', '예약금 환불'), ('ADJUST', '관리자 조정')], max_length=20, verbose_name='종류')),
+                ('amount', models.IntegerField(verbose_name='변동 포인트')),
+                ('balance_after', models.PositiveIntegerField(verbose_name='변동 후 잔액')),
+                ('idempotency_key', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('participation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='point_transactions', to='detailview.participation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='point_transactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'created_at'], name='users_point_user_id_52fad6_idx')],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
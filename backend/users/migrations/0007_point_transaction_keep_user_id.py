@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_point_transaction'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pointtransaction',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='point_transactions', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_point_transaction_keep_user_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pointtransaction',
+            name='kind',
+            field=models.CharField(choices=[('OPENING', '기초 잔액'), ('PAYMENT', '예약금 결제'), ('REFUND', '예약금 환불')], max_length=20, verbose_name='종류'),
+        ),
+    ]
@@ -64,3 +64,39 @@ class SocialAccount(models.Model):
 
     def __str__(self):
         return f"{self.provider}:{self.social_id} -> {self.user_id}"
+
+
+class PointTransaction(models.Model):
+    """
+    포인트 변동 원장 (추가만 하고 수정/삭제하지 않음).
+    유저의 포인트는 항상 원장 합계와 같아야 함 → audit_point_ledger 명령으로 확인
+    """
+    class Kind(models.TextChoices):
+        OPENING = "OPENING", "기초 잔액"
+        PAYMENT = "PAYMENT", "예약금 결제"
+        REFUND = "REFUND", "예약금 환불"
+
+    # 탈퇴(유저 삭제)를 막지 않도록 FK 제약 없이 user_id만 남김 (삭제된 유저의 원장도 감사용으로 보존)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="point_transactions",
+    )
+    kind = models.CharField("종류", max_length=20, choices=Kind.choices)
+    amount = models.IntegerField("변동 포인트")  # 차감은 음수
+    balance_after = models.PositiveIntegerField("변동 후 잔액")
+    # 같은 요청이 재시도돼도 한 번만 반영되도록 하는 키 (예: pay:<참가 id>:<신청 시각>)
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    participation = models.ForeignKey(
+        "detailview.Participation", on_delete=models.SET_NULL, null=True, blank=True, related_name="point_transactions"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.amount:+d} ({self.get_kind_display()})"
@@ -0,0 +1,54 @@
+"""
+포인트 잔액 변경은 모두 이 모듈을 거쳐서 원장(PointTransaction)과 함께 기록.
+
+잠금 순서: 참가(Participation) 행 → 유저 포인트 → 결제(Payment) 순서로만 잠가서
+결제/환불이 동시에 몰려도 서로 기다리다 교착되지 않게 함
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import User, PointTransaction
+
+
+class InsufficientPoints(Exception):
+    """잔액이 부족해서 차감하지 못함"""
+
+
+def _apply(user_id, amount, kind, idempotency_key, participation=None):
+    try:
+        with transaction.atomic():
+            done = PointTransaction.objects.filter(idempotency_key=idempotency_key).first()
+            if done:
+                return done  # 이미 반영된 요청 → 다시 반영하지 않음
+
+            # 조건부 UPDATE 한 번으로 잔액 확인과 차감을 함께 처리 (읽고 빼고 저장하는 사이 경쟁 없음)
+            users = User.objects.filter(pk=user_id)
+            if amount < 0:
+                users = users.filter(points__gte=-amount)
+            if not users.update(points=F("points") + amount):
+                raise InsufficientPoints
+
+            return PointTransaction.objects.create(
+                user_id=user_id,
+                kind=kind,
+                amount=amount,
+                balance_after=User.objects.values_list("points", flat=True).get(pk=user_id),
+                idempotency_key=idempotency_key,
+                participation=participation,
+            )
+    except IntegrityError:
+        # 같은 키로 동시에 들어온 요청이 먼저 기록함 → 이쪽 변경은 롤백됐으니 먼저 기록된 결과 반환
+        done = PointTransaction.objects.filter(idempotency_key=idempotency_key).first()
+        if done is None:
+            raise  # 키 중복이 아닌 다른 제약 위반 → 원래 에러 그대로
+        return done
+
+
+def debit(user_id, amount, kind, idempotency_key, participation=None):
+    """포인트 차감. 잔액이 부족하면 InsufficientPoints"""
+    return _apply(user_id, -amount, kind, idempotency_key, participation)
+
+
+def credit(user_id, amount, kind, idempotency_key, participation=None):
+    """포인트 적립/환불"""
+    return _apply(user_id, amount, kind, idempotency_key, participation)
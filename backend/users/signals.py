@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import User, PointTransaction
+
+
+# 가입 시 지급된 기본 포인트를 원장의 첫 기록으로 남김 (이후 잔액 = 원장 합계)
+@receiver(post_save, sender=User)
+def record_opening_balance(sender, instance, created, **kwargs):
+    if created:
+        PointTransaction.objects.create(
+            user=instance,
+            kind=PointTransaction.Kind.OPENING,
+            amount=instance.points,
+            balance_after=instance.points,
+            idempotency_key=f"opening:{instance.pk}",
+        )
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import AIResponseCache
+
+
+@admin.register(AIResponseCache)
+class AIResponseCacheAdmin(admin.ModelAdmin):
+    list_display = ("key", "kind", "hit_count", "created_at", "last_used_at", "expires_at")
+    list_filter = ("kind",)
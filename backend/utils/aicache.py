@@ -0,0 +1,80 @@
+"""
+AI 응답 캐시: 같은 프롬프트면 OpenAI를 다시 부르지 않고 저장된 응답을 재사용.
+(같은 제목/장소/태그/시간대로 만든 파티, 관리자 재생성 등에서 네트워크 왕복과 토큰 비용 절약)
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AIResponseCache
+
+HIT_COUNTER_KEY = "ai_cache:hits"
+MISS_COUNTER_KEY = "ai_cache:misses"
+
+
+def prompt_key(kind, *parts):
+    """종류 + 프롬프트 구성 요소(모델, 시스템/유저 프롬프트 등)로 만든 sha256"""
+    raw = json.dumps([kind, *parts], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _count(counter_key):
+    cache.add(counter_key, 0, None)
+    try:
+        cache.incr(counter_key)
+    except ValueError:  # 그 사이 캐시에서 지워진 경우
+        cache.set(counter_key, 1, None)
+
+
+def _evict():
+    """만료된 항목과, 최대 개수를 넘는 오래 안 쓴 항목 삭제"""
+    AIResponseCache.objects.filter(expires_at__lte=timezone.now()).delete()
+    stale_ids = list(
+        AIResponseCache.objects
+        .order_by("-last_used_at")
+        .values_list("pk", flat=True)[settings.AI_CACHE_MAX_ENTRIES:]
+    )
+    if stale_ids:
+        AIResponseCache.objects.filter(pk__in=stale_ids).delete()
+
+
+def cached_ai_response(kind, parts, generate):
+    """
+    parts가 같은 요청이면 저장된 응답을 반환하고, 없으면 generate()를 호출해 저장.
+    generate()에서 난 예외는 그대로 올려 보냄 (실패 응답은 저장하지 않음)
+    """
+    key = prompt_key(kind, *parts)
+    now = timezone.now()
+
+    hit = AIResponseCache.objects.filter(key=key, expires_at__gt=now).values_list("response", flat=True).first()
+    if hit is not None:
+        AIResponseCache.objects.filter(key=key).update(hit_count=F("hit_count") + 1, last_used_at=now)
+        _count(HIT_COUNTER_KEY)
+        return hit
+
+    _count(MISS_COUNTER_KEY)
+    response = generate()
+    AIResponseCache.objects.update_or_create(
+        key=key,
+        defaults={
+            "kind": kind,
+            "response": response,
+            "hit_count": 0,
+            "last_used_at": now,
+            "expires_at": now + settings.AI_CACHE_TTL,
+        },
+    )
+    _evict()
+    return response
+
+
+def cache_stats():
+    return {
+        "hits": cache.get(HIT_COUNTER_KEY, 0),
+        "misses": cache.get(MISS_COUNTER_KEY, 0),
+        "entries": AIResponseCache.objects.count(),
+    }
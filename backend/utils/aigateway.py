@@ -0,0 +1,171 @@
+"""
+OpenAI 호출 관문 (gameAI/partyAI가 함께 사용).
+- 연결을 재사용하는 httpx 클라이언트 하나를 공유
+- 호출마다 제한 시간, 동시에 나가는 호출 수 제한(세마포어)
+- 연속 실패 시 회로 차단: 일정 시간 동안 호출하지 않고 바로 AIUnavailable → 호출하는 쪽 폴백
+- 지연 시간/실패 지표 수집 (metrics(), ai_gateway 로거)
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import httpx
+from django.conf import settings
+from openai import OpenAI
+
+logger = logging.getLogger("ai_gateway")
+
+
+class AIUnavailable(Exception):
+    """AI 호출을 하지 않았거나 실패함 → 호출하는 쪽에서 폴백 사용"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 나면 reset_timeout초 동안 열림(호출 차단).
+    시간이 지나면 한 번만 시험 호출을 허용하고, 성공하면 닫히고 실패하면 다시 열림
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True  # 시험 호출 1번만 허용
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def cancel_probe(self):
+        """시험 호출을 하지 못한 경우 다음 요청이 다시 시험할 수 있게 함"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class AIGateway:
+
+    LATENCY_WINDOW = 200  # 지연 시간 통계에 쓰는 최근 호출 수
+
+    def __init__(self, *, api_key, base_url=None, timeout, max_concurrency, acquire_timeout,
+                 failure_threshold, reset_timeout):
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        # 재시도는 하지 않음 → 제한 시간이 곧 호출 전체 마감 시간
+        self.client = OpenAI(
+            api_key=api_key or "missing",
+            base_url=base_url or None,
+            http_client=self._http_client,
+            timeout=timeout,
+            max_retries=0,
+        )
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._counts = {"calls": 0, "errors": 0, "short_circuited": 0, "rejected": 0}
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.AI_REQUEST_TIMEOUT,
+            max_concurrency=settings.AI_MAX_CONCURRENCY,
+            acquire_timeout=settings.AI_ACQUIRE_TIMEOUT,
+            failure_threshold=settings.AI_BREAKER_FAILURES,
+            reset_timeout=settings.AI_BREAKER_RESET,
+        )
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._counts[name] += 1
+
+    def chat_json(self, **kwargs):
+        """chat.completions 호출 후 JSON 본문을 dict로 반환. 실패/차단 시 AIUnavailable"""
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise AIUnavailable("circuit open")
+
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._count("rejected")
+            self.breaker.cancel_probe()
+            raise AIUnavailable("too many concurrent calls")
+
+        started = time.monotonic()
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+            data = json.loads(response.choices[0].message.content.strip())
+        except Exception as e:
+            self.breaker.record_failure()
+            self._record(started, ok=False)
+            raise AIUnavailable(str(e)) from e
+        finally:
+            self._slots.release()
+
+        self.breaker.record_success()
+        self._record(started, ok=True)
+        return data
+
+    def _record(self, started, ok):
+        elapsed = time.monotonic() - started
+        with self._stats_lock:
+            self._counts["calls"] += 1
+            if not ok:
+                self._counts["errors"] += 1
+            self._latencies.append(elapsed)
+        logger.info("ai_call ok=%s latency_ms=%d", ok, elapsed * 1000)
+
+    def metrics(self):
+        """호출/실패/차단 횟수와 최근 호출 지연 시간(p50/p95, 초)"""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            snapshot = dict(self._counts)
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else None
+
+        snapshot.update(latency_p50=pct(0.5), latency_p95=pct(0.95), circuit_open=self.breaker.is_open)
+        return snapshot
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """프로세스마다 하나만 만들어 공유 (처음 쓸 때 설정값으로 생성)"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = AIGateway.from_settings()
+    return _gateway
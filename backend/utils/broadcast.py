@@ -0,0 +1,88 @@
+"""
+채널 그룹 브로드캐스트 묶음 전송 (game 투표 집계, partyassist standby 인원 등).
+짧은 시간(window초) 동안 같은 그룹에 보낼 내용을 모아 두었다가 한 번만 group_send
+"""
+import asyncio
+import logging
+import threading
+
+from asgiref.sync import SyncToAsync, async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SEND_TIMEOUT = 5
+
+
+def _server_loop():
+    """ASGI 서버 이벤트 루프 (consumer/ASGI 요청을 처리 중인 스레드가 아니면 None)"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return getattr(SyncToAsync.threadlocal, "main_event_loop", None)
+
+
+class DebouncedBroadcaster:
+    """
+    프로세스마다 하나씩 만들어 사용. queue()로 key(라운드/파티 id)별 내용을 모으고,
+    key의 첫 queue 후 window초가 지나면 flush()가 build() 결과를 한 번에 전송.
+    하위 클래스에서 event_type, window_setting, group_name/merge/build를 정함
+    """
+    event_type = None
+    window_setting = None  # 기본 window(초)를 읽을 settings 이름
+
+    def __init__(self, window=None):
+        self.window = window
+        self._pending = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def group_name(self, key):
+        raise NotImplementedError
+
+    def merge(self, pending, item):
+        """모아 둔 내용(처음이면 None)에 item을 합친 결과"""
+        raise NotImplementedError
+
+    def build(self, key, pending):
+        """전송할 data"""
+        return pending
+
+    def queue(self, key, item):
+        key = str(key)
+        with self._lock:
+            self._pending[key] = self.merge(self._pending.get(key), item)
+
+            if key not in self._timers:
+                window = getattr(settings, self.window_setting) if self.window is None else self.window
+                # ASGI 요청/consumer에서 들어온 것이면 서버 이벤트 루프에서 전송
+                # (InMemoryChannelLayer는 다른 루프에서 넣은 메시지로는 대기 중인 consumer를 깨우지 못함)
+                timer = threading.Timer(window, self.flush, args=(key, _server_loop()))
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+
+    def flush(self, key, loop=None):
+        """모아 둔 내용을 전송하고 보낸 data를 반환 (보낼 것이 없으면 None)"""
+        key = str(key)
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            pending = self._pending.pop(key, None)
+        if timer is not None:
+            timer.cancel()  # 직접 호출한 경우 예약된 전송 취소
+        if not pending:
+            return None
+
+        data = self.build(key, pending)
+        group_send = get_channel_layer().group_send
+        message = {"type": self.event_type, "data": data}
+        try:
+            if loop is not None and loop.is_running():
+                asyncio.run_coroutine_threadsafe(group_send(self.group_name(key), message), loop).result(SEND_TIMEOUT)
+            else:
+                async_to_sync(group_send)(self.group_name(key), message)
+        except Exception:
+            # 전송 실패는 요청 처리에 영향 없음 (다음 묶음이나 조회로 최신 상태를 받음)
+            logger.exception("%s broadcast failed key=%s", self.event_type, key)
+        return data
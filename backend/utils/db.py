@@ -0,0 +1,20 @@
+"""
+행 잠금 도우미 (정원 체크, 결제/환불, 만료 스윕처럼 읽고 나서 쓰는 구간에서만 사용).
+PostgreSQL 등은 SELECT ... FOR UPDATE, SQLite는 FOR UPDATE가 없으므로
+값이 그대로인 UPDATE를 먼저 실행해 DB 쓰기 잠금을 잡음 → 이후 읽기/쓰기가 다른 쓰기 트랜잭션과 겹치지 않음
+(모든 트랜잭션을 IMMEDIATE로 열지 않고, 잠금이 필요한 트랜잭션만 줄을 세움)
+"""
+from django.db import connections
+from django.db.models import F
+
+
+def lock_rows(queryset, skip_locked=False):
+    """
+    트랜잭션 안에서 첫 쿼리로 호출. 잠금을 거는 queryset을 반환하므로 바로 평가해서 사용
+    (SQLite는 skip_locked를 지원하지 않으므로 건너뛰지 않고 기다림)
+    """
+    if connections[queryset.db].features.has_select_for_update:
+        return queryset.select_for_update(skip_locked=skip_locked)
+    pk = queryset.model._meta.pk.attname
+    queryset.model._default_manager.filter(pk__in=queryset.values(pk)).update(**{pk: F(pk)})
+    return queryset
@@ -1,10 +1,8 @@
-from openai import OpenAI
-from django.conf import settings
-import json, re
+from django.utils import timezone
+import re
 from datetime import datetime
-
-client = OpenAI(api_key=settings.OPENAI_API_KEY) # 최신 버전 설정 방식
-
+from .aicache import cached_ai_response
+from .aigateway import get_gateway
 
 MODEL = "gpt-4o-mini"  # 해커톤용 하드코딩(원하면 문자열만 교체)
 
@@ -107,10 +105,14 @@ def _place_name(party):
             return str(getattr(party.place, field))
     return str(party.place)
 
+WEEKDAYS = "월화수목금토일"
+
+
 def _fmt_start_time(dt):
     try:
-        # "YYYY-MM-DD HH:MM" 포맷으로 맞춤
-        return dt.strftime("%Y-%m-%d %H:%M")
+        # "토요일 18시대"처럼 요일+시간대로 맞춤 → 날짜만 다른 같은 파티는 같은 프롬프트(캐시 재사용)
+        dt = timezone.localtime(dt)
+        return f"{WEEKDAYS[dt.weekday()]}요일 {dt.hour}시대"
     except Exception:
         return str(dt)
 
@@ -120,8 +122,8 @@ def generate_balance_by_ai(party, count: int = 5) -> dict:
     """
     Party 인스턴스(제목/설명/태그/장소/시간/정원)를 맥락으로 사용해
     밸런스 게임 문항을 생성해 dict로 반환합니다.
-    반환: {"items": [{"a": "...", "b": "..."}, ...]}
-    실패해도 폴백으로 count개 보장.
+    반환: {"items": [{"a": "...", "b": "..."}, ...], "fallback": bool}
+    실패해도 폴백으로 count개 보장. AI 응답 없이 폴백 문항만 쓴 경우 fallback=True
     """
     cnt = max(1, min(int(count or 5), 20))
     title = _clip(getattr(party, "title", ""), 50)
@@ -142,8 +144,9 @@ def generate_balance_by_ai(party, count: int = 5) -> dict:
         count=cnt,
     )
 
-    try:
-        response = client.chat.completions.create(
+    def request():
+        # 제한 시간/동시 호출 수/회로 차단은 관문에서 처리 (차단 중이면 바로 예외 → 폴백)
+        return get_gateway().chat_json(
             model=MODEL,
             messages=[
                 {"role": "system", "content": SYSTEM},
@@ -153,13 +156,16 @@ def generate_balance_by_ai(party, count: int = 5) -> dict:
             max_tokens=400,  # 충분
             response_format={"type": "json_object"},
         )
-        data = json.loads(response.choices[0].message.content.strip())
+
+    try:
+        # 같은 프롬프트면 저장된 응답 재사용 (실패는 저장하지 않고 아래 폴백으로)
+        data = cached_ai_response("balance", [MODEL, SYSTEM, prompt], request)
         items = _clean_items(data.get("items"), cnt)
         if not items:
-            items = _fallback_items(cnt)
+            return {"items": _fallback_items(cnt), "fallback": True}
         items = _topoff_with_fallback(items, cnt)  # 정확히 cnt개 보장
-        return {"items": items}
+        return {"items": items, "fallback": False}
     except Exception as e:
         # 운영 시엔 logging 사용하는게 좋지만, 해커톤에선 print로 대체
         print(f"[AI 생성 실패]: {e}")
-        return {"items": _fallback_items(cnt)}
\ No newline at end of file
+        return {"items": _fallback_items(cnt), "fallback": True}
\ No newline at end of file
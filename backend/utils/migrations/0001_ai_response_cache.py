@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIResponseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(max_length=20, verbose_name='종류')),
+                ('response', models.JSONField(verbose_name='응답')),
+                ('hit_count', models.PositiveIntegerField(default=0, verbose_name='재사용 횟수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, verbose_name='마지막 사용')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='만료 시각')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class AIResponseCache(models.Model):
+    """
+    같은 프롬프트의 AI 응답을 저장해 두는 캐시 (재시작해도 유지).
+    key는 모델/프롬프트 내용의 sha256, 오래 안 쓴 항목부터 지움(LRU)
+    """
+    key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField("종류", max_length=20)  # balance / party 등
+    response = models.JSONField("응답")
+    hit_count = models.PositiveIntegerField("재사용 횟수", default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField("마지막 사용", db_index=True)
+    expires_at = models.DateTimeField("만료 시각", db_index=True)
+
+    def __str__(self):
+        return f"[{self.kind}] {self.key[:12]} (hit {self.hit_count})"
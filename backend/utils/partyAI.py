@@ -1,14 +1,28 @@
-from openai import OpenAI
-from django.conf import settings
-import json
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+from django.utils import timezone
 
-def generate_party_by_ai(place) -> dict:
+from .aicache import cached_ai_response
+from .aigateway import get_gateway
+
+MODEL = "gpt-4o-mini"
+
+
+def _default_start_time():
+    """시작 시각을 안 줬을 때: 내일 같은 시간대(정시)"""
+    return (timezone.localtime() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+
+
+def generate_party_by_ai(place, start_time=None, use_cache=True) -> dict:
     """
     place 객체를 받아 AI가 파티 정보를 JSON으로 생성.
+    start_time을 주면 그 시각, 없으면 내일 같은 시간대로 만들고 응답의 start_time은 항상 그 값
+    (시작 시각이 프롬프트에 들어가므로 캐시도 시간대별로 나뉘고, 모델이 준 start_time은 쓰지 않음)
+    use_cache=False면 응답 캐시를 거치지 않고 항상 새로 생성
     """
+    if start_time is None:
+        start_time = _default_start_time()
+
     prompt = f"""
     국민대 근처의 장소 "{place.name}"에서 열릴 수 있는 파티를 만들어줘.
     장소 설명: {place.address}, 수용 인원: {place.capacity}
@@ -22,20 +36,24 @@ def generate_party_by_ai(place) -> dict:
         "tags": ["음악", "친목"]
     }}
     """
+    prompt += f"\n    파티 시작 시각은 {start_time:%Y-%m-%d %H:%M}이야. 시간대에 어울리게 만들어줘.\n"
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+    def request():
+        return get_gateway().chat_json(
+            model=MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
             response_format={"type": "json_object"},
         )
-        data = json.loads(response.choices[0].message.content.strip())
+
+    try:
+        # 같은 장소 정보 + 같은 시작 시각으로 다시 만들면 저장된 초안 재사용
+        data = cached_ai_response("party", [MODEL, prompt], request) if use_cache else request()
         # 기본값 보정
         return {
             "title": data.get("title", f"{place.name} 파티"),
             "description": data.get("description", ""),
-            "start_time": data.get("start_time", (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d %H:%M")),
+            "start_time": start_time,
             "max_participants": data.get("max_participants", place.capacity or 4),
             "tags": data.get("tags", []),
         }
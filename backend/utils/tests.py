@@ -0,0 +1,227 @@
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import datetime
+import json
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .aicache import cached_ai_response, cache_stats
+from .aigateway import AIGateway, AIUnavailable
+from .models import AIResponseCache
+
+
+class AIResponseCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_same_prompt_calls_ai_once(self):
+        """같은 프롬프트는 한 번만 생성하고 이후에는 저장된 응답 사용"""
+        generate = mock.Mock(return_value={"items": [{"a": "산책", "b": "카페"}]})
+
+        first = cached_ai_response("balance", ["model", "prompt"], generate)
+        second = cached_ai_response("balance", ["model", "prompt"], generate)
+        cached_ai_response("balance", ["model", "다른 prompt"], generate)
+
+        self.assertEqual(first, second)
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 2, "entries": 2})
+
+    def test_expired_entry_is_regenerated(self):
+        """보관 기간이 지난 응답은 다시 생성"""
+        generate = mock.Mock(side_effect=[{"v": 1}, {"v": 2}])
+        cached_ai_response("party", ["prompt"], generate)
+        AIResponseCache.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+
+        self.assertEqual(cached_ai_response("party", ["prompt"], generate), {"v": 2})
+        self.assertEqual(AIResponseCache.objects.count(), 1)
+
+    def test_failures_are_not_cached(self):
+        """생성 실패는 저장하지 않고 예외를 그대로 전달"""
+        with self.assertRaises(RuntimeError):
+            cached_ai_response("party", ["prompt"], mock.Mock(side_effect=RuntimeError))
+
+        self.assertFalse(AIResponseCache.objects.exists())
+
+    @override_settings(AI_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        """최대 개수를 넘으면 가장 오래 안 쓴 항목부터 삭제"""
+        generate = mock.Mock(return_value={})
+        for prompt in ["a", "b"]:
+            cached_ai_response("party", [prompt], generate)
+        AIResponseCache.objects.update(last_used_at=timezone.now() - datetime.timedelta(minutes=1))
+        cached_ai_response("party", ["a"], generate)  # a를 최근에 사용
+
+        cached_ai_response("party", ["c"], generate)
+
+        self.assertEqual(AIResponseCache.objects.count(), 2)
+        self.assertEqual(generate.call_count, 3)
+        cached_ai_response("party", ["a"], generate)
+        self.assertEqual(generate.call_count, 3)  # a는 남아 있음
+
+    def test_party_draft_cache_is_split_by_start_time(self):
+        """시작 시각 없이 만든 파티도 시간대별로 캐시되고, 모델이 준 start_time은 쓰지 않음"""
+        from . import partyAI
+
+        gateway = mock.Mock()
+        gateway.chat_json.return_value = {"title": "초안", "start_time": "2020-01-01 18:00"}
+        place = mock.Mock(address="주소", capacity=6)
+        place.name = "장소"
+        today = timezone.make_aware(datetime.datetime(2026, 10, 18, 18, 30))
+
+        with mock.patch("utils.partyAI.get_gateway", return_value=gateway), \
+                mock.patch("django.utils.timezone.localtime", return_value=today):
+            first = partyAI.generate_party_by_ai(place)
+            again = partyAI.generate_party_by_ai(place)
+        with mock.patch("utils.partyAI.get_gateway", return_value=gateway), \
+                mock.patch("django.utils.timezone.localtime", return_value=today + datetime.timedelta(days=1)):
+            next_day = partyAI.generate_party_by_ai(place)
+
+        self.assertEqual(gateway.chat_json.call_count, 2)
+        self.assertEqual(first["start_time"], again["start_time"])
+        self.assertEqual(first["start_time"], today.replace(minute=0) + datetime.timedelta(days=1))
+        self.assertEqual(next_day["start_time"], first["start_time"] + datetime.timedelta(days=1))
+
+
+class StubUpstream(BaseHTTPRequestHandler):
+    """OpenAI chat.completions 흉내 (느린 응답/실패를 서버 속성으로 조절)"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.calls += 1
+        time.sleep(self.server.delay)
+        if self.server.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps({"items": [{"a": "산책", "b": "카페"}]})},
+            }],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            pass  # 클라이언트가 제한 시간으로 먼저 끊은 경우
+
+    def log_message(self, *args):
+        pass
+
+
+class AIGatewayTest(TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstream)
+        self.server.calls, self.server.delay, self.server.fail = 0, 0, False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _gateway(self, **overrides):
+        options = dict(
+            api_key="test", base_url=f"http://127.0.0.1:{self.server.server_port}/v1",
+            timeout=0.5, max_concurrency=2, acquire_timeout=0.05,
+            failure_threshold=2, reset_timeout=60,
+        )
+        options.update(overrides)
+        return AIGateway(**options)
+
+    def _call(self, gateway):
+        return gateway.chat_json(model="stub", messages=[{"role": "user", "content": "hi"}])
+
+    def test_successful_call_records_latency(self):
+        """정상 응답은 JSON으로 반환하고 지연 시간을 기록"""
+        gateway = self._gateway()
+
+        self.assertEqual(self._call(gateway), {"items": [{"a": "산책", "b": "카페"}]})
+
+        metrics = gateway.metrics()
+        self.assertEqual((metrics["calls"], metrics["errors"]), (1, 0))
+        self.assertIsNotNone(metrics["latency_p95"])
+
+    def test_slow_upstream_hits_deadline(self):
+        """제한 시간을 넘기면 기다리지 않고 AIUnavailable"""
+        self.server.delay = 1
+        gateway = self._gateway(timeout=0.2)
+
+        started = time.monotonic()
+        with self.assertRaises(AIUnavailable):
+            self._call(gateway)
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_breaker_opens_after_failures_and_short_circuits(self):
+        """연속 실패하면 회로가 열려 upstream을 부르지 않음"""
+        self.server.fail = True
+        gateway = self._gateway()
+        for _ in range(2):
+            with self.assertRaises(AIUnavailable):
+                self._call(gateway)
+
+        with self.assertRaises(AIUnavailable):
+            self._call(gateway)
+
+        self.assertEqual(self.server.calls, 2)
+        self.assertTrue(gateway.metrics()["circuit_open"])
+        self.assertEqual(gateway.metrics()["short_circuited"], 1)
+
+    def test_breaker_closes_after_successful_probe(self):
+        """차단 시간이 지나면 시험 호출 1번, 성공하면 다시 정상"""
+        self.server.fail = True
+        gateway = self._gateway(reset_timeout=0)
+        for _ in range(2):
+            with self.assertRaises(AIUnavailable):
+                self._call(gateway)
+
+        self.server.fail = False
+        self._call(gateway)
+
+        self.assertFalse(gateway.metrics()["circuit_open"])
+
+    def test_concurrency_is_bounded(self):
+        """동시 호출 수를 넘는 요청은 자리를 오래 기다리지 않고 거절"""
+        self.server.delay = 0.3
+        gateway = self._gateway(max_concurrency=1)
+        results = []
+
+        def call():
+            try:
+                self._call(gateway)
+                results.append("ok")
+            except AIUnavailable:
+                results.append("rejected")
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(sorted(results), ["ok", "rejected", "rejected"])
+        self.assertEqual(gateway.metrics()["rejected"], 2)
+
+    def test_balance_generation_falls_back_when_circuit_open(self):
+        """회로가 열려 있으면 문항 생성은 네트워크 없이 폴백 문항 사용"""
+        from . import gameAI
+
+        gateway = self._gateway()
+        gateway.breaker.record_failure()
+        gateway.breaker.record_failure()
+        party = mock.Mock(title="파티", description="", start_time=timezone.now(), max_participants=4)
+        party.tags.all.return_value = []
+        party.place.name = "장소"
+
+        with mock.patch("utils.gameAI.get_gateway", return_value=gateway):
+            result = gameAI.generate_balance_by_ai(party, count=2)
+
+        self.assertEqual(result, {"items": gameAI._fallback_items(2), "fallback": True})
+        self.assertEqual(self.server.calls, 0)
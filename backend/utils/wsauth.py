@@ -0,0 +1,81 @@
+"""
+웹소켓 JWT 인증 (API와 같은 SimpleJWT access 토큰).
+- 연결할 때 ?token=<access> 또는 Authorization: Bearer <access> 를 한 번만 검증 (서명/만료 확인은 DB 조회 없음)
+- 유저와 참가 중인 파티 id를 연결할 때 한 번 읽어 scope["user"], scope["party_ids"]에 둠
+- consumer는 그룹 가입 전에 is_party_member()로 확인하고, 이후 메시지마다 다시 조회하지 않음
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from detailview.models import Participation
+
+
+def _raw_token(scope):
+    """query string의 token, 없으면 Authorization 헤더 (브라우저 WebSocket은 헤더를 못 붙임)"""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    token = (query.get("token") or [""])[0]
+    if token:
+        return token
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, credentials = value.decode().partition(" ")
+            if scheme.lower() == "bearer":
+                return credentials.strip()
+    return None
+
+
+@database_sync_to_async
+def _load_user(user_id):
+    """(유저, 참가 중인 파티 id) - 연결마다 한 번"""
+    user = (
+        get_user_model().objects
+        .filter(**{api_settings.USER_ID_FIELD: user_id, "is_active": True})
+        .first()
+    )
+    if user is None:
+        return AnonymousUser(), frozenset()
+    party_ids = frozenset(
+        Participation.objects
+        .filter(user=user, status__in=Participation.ACTIVE_STATUSES)
+        .values_list("party_id", flat=True)
+    )
+    return user, party_ids
+
+
+async def authenticate(scope):
+    """토큰이 없거나 유효하지 않으면 (AnonymousUser, 빈 집합)"""
+    raw = _raw_token(scope)
+    if not raw:
+        return AnonymousUser(), frozenset()
+    try:
+        token = AccessToken(raw)
+    except TokenError:
+        return AnonymousUser(), frozenset()
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return AnonymousUser(), frozenset()
+    return await _load_user(user_id)
+
+
+def is_party_member(scope, party_id):
+    """연결할 때 읽어 둔 참가 파티에 party_id가 있는지 (DB 조회 없음)"""
+    try:
+        return int(party_id) in scope.get("party_ids", ())
+    except (TypeError, ValueError):
+        return False
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """config.asgi에서 AuthMiddlewareStack(세션 인증) 대신 사용"""
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        scope["user"], scope["party_ids"] = await authenticate(scope)
+        return await super().__call__(scope, receive, send)
@@ -12,6 +12,9 @@ export default function Balancegame() {
   const { roundId } = useParams();
   const wsRef = useRef(null);
   const intervalRef = useRef(null);
+  const lastSeqRef = useRef(null); // 마지막으로 받은 vote_update seq (건너뛰면 라운드 다시 조회)
+  const pendingAcksRef = useRef(new Map()); // 소켓 투표 메시지 id → vote_ack를 기다리는 resolve
+  const nextVoteIdRef = useRef(1);
 
   const [questions, setQuestions] = useState([]);
   const [activeIndex, setActiveIndex] = useState(0);
@@ -36,22 +39,37 @@ export default function Balancegame() {
     fetchRound();
 
     const wsProtocol = window.location.protocol === "https:" ? "wss" : "ws";
-    const wsUrl = `${wsProtocol}://${window.location.host}/ws/game/round/${roundId}/`;
+    // 브라우저 WebSocket은 헤더를 못 붙이므로 access 토큰을 쿼리로 전달 (연결할 때 한 번 인증)
+    const token = encodeURIComponent(localStorage.getItem("access") || "");
+    const wsUrl = `${wsProtocol}://${window.location.host}/ws/game/round/${roundId}/?token=${token}`;
     const ws = new WebSocket(wsUrl);
     wsRef.current = ws;
 
     ws.onmessage = (event) => {
       try {
         const msg = JSON.parse(event.data);
-        if (msg.type === "vote_update") {
-          const d = msg.data;
+        if (msg.type === "vote_ack") {
+          const resolve = pendingAcksRef.current.get(msg.id);
+          if (resolve) {
+            pendingAcksRef.current.delete(msg.id);
+            resolve(msg);
+          }
+        } else if (msg.type === "vote_update") {
+          // data: {round_id, seq, questions: [{question_id, vote_a_count, vote_b_count}, ...]}
+          const { seq, questions: updates = [] } = msg.data;
+          const lastSeq = lastSeqRef.current;
+          if (lastSeq !== null && seq <= lastSeq) return; // 이미 반영한(늦게 도착한) 메시지
+          lastSeqRef.current = seq;
+
+          const counts = new Map(updates.map((u) => [u.question_id, u]));
           setQuestions((prev) =>
-            prev.map((q) =>
-              q.id === d.question_id
-                ? { ...q, vote_a_count: d.vote_a_count, vote_b_count: d.vote_b_count }
-                : q
-            )
+            prev.map((q) => {
+              const u = counts.get(q.id);
+              return u ? { ...q, vote_a_count: u.vote_a_count, vote_b_count: u.vote_b_count } : q;
+            })
           );
+          // seq가 1보다 크게 건너뛰었으면 빠진 메시지가 있으므로 전체를 다시 조회
+          if (lastSeq !== null && seq > lastSeq + 1) fetchRound();
         }
       } catch (e) {
         console.error("WS parse error", e);
@@ -59,6 +77,11 @@ export default function Balancegame() {
     };
 
     ws.onclose = () => {
+      // 응답을 못 받은 소켓 투표는 실패로 처리
+      pendingAcksRef.current.forEach((resolve) =>
+        resolve({ ok: false, errors: ["연결이 끊겼습니다. 다시 시도해주세요."] })
+      );
+      pendingAcksRef.current.clear();
       console.log("WebSocket closed, fallback polling ON");
       intervalRef.current = setInterval(fetchRound, 10000);
     };
@@ -69,18 +92,62 @@ export default function Balancegame() {
     };
   }, [roundId]);
 
-  // 투표하기 (HTTP POST)
+  // 소켓으로 투표하고 vote_ack 기다리기
+  const voteOverSocket = (ws, questionId, choice) =>
+    new Promise((resolve) => {
+      const id = nextVoteIdRef.current++;
+      const timer = setTimeout(() => {
+        pendingAcksRef.current.delete(id);
+        resolve({ ok: false, errors: ["응답이 없습니다. 다시 시도해주세요."] });
+      }, 5000);
+      pendingAcksRef.current.set(id, (ack) => {
+        clearTimeout(timer);
+        resolve(ack);
+      });
+      ws.send(JSON.stringify({ type: "vote", id, question_id: questionId, choice }));
+    });
+
+  const firstError = (errors) => {
+    if (Array.isArray(errors)) return firstError(errors[0]);
+    if (errors && typeof errors === "object") return firstError(Object.values(errors)[0]);
+    return errors;
+  };
+
+  // 응답 집계보다 vote_update가 먼저 도착했을 수 있으므로 큰 값 유지 (집계는 줄지 않음)
+  const markVoted = (questionId, { vote_a_count, vote_b_count }) =>
+    setQuestions((prev) =>
+      prev.map((q) =>
+        q.id === questionId
+          ? {
+              ...q,
+              vote_a_count: Math.max(q.vote_a_count, vote_a_count ?? 0),
+              vote_b_count: Math.max(q.vote_b_count, vote_b_count ?? 0),
+              has_voted: true,
+            }
+          : q
+      )
+    );
+
+  // 투표하기 (소켓이 열려 있으면 소켓, 아니면 HTTP POST)
   const handleVote = async (questionId, choice) => {
     if (votingMap.get(questionId)) return; // 이미 투표 중
     setVotingMap((m) => new Map(m).set(questionId, true));
 
     try {
-      await api.post(`/api/v1/game/questions/${questionId}/vote/`, { choice });
-      setQuestions((prev) =>
-        prev.map((q) =>
-          q.id === questionId ? { ...q, has_voted: true } : q
-        )
-      );
+      const ws = wsRef.current;
+      if (ws && ws.readyState === WebSocket.OPEN) {
+        const ack = await voteOverSocket(ws, questionId, choice);
+        if (ack.ok) {
+          const { vote_a_count, vote_b_count } = ack.question;
+          markVoted(questionId, { vote_a_count, vote_b_count });
+        } else {
+          setErrorMsg(firstError(ack.errors) || "이미 투표했거나 잘못된 요청입니다.");
+        }
+        return;
+      }
+
+      const { data } = await api.post(`/api/v1/game/questions/${questionId}/vote/`, { choice });
+      markVoted(questionId, { vote_a_count: data.vote_a_count, vote_b_count: data.vote_b_count });
     } catch (err) {
       const status = err.response?.status;
       if (status === 403) setErrorMsg("파티 참가자만 투표할 수 있습니다.");
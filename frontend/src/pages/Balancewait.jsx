@@ -45,7 +45,9 @@ export default function BalanceWait() {
     setWsStatus("connecting");
 
     try {
-      const url = `${wsBase()}/ws/party/${partyId}/`;
+      // 재연결할 때마다 최신 access 토큰 사용 (서버는 연결할 때 한 번만 인증)
+      const token = encodeURIComponent(localStorage.getItem("access") || "");
+      const url = `${wsBase()}/ws/party/${partyId}/?token=${token}`;
       const sock = new WebSocket(url);
       wsRef.current = sock;
 
@@ -103,6 +105,8 @@ export default function BalanceWait() {
       setStandbyCount(res.data.standby_count ?? 0);
       setParticipationCount(res.data.participation_count ?? 0);
       setIsStandby(res.data.is_standby);
+      // 준비된 문항으로 바로 만들어졌으면 이동 (생성 대기(202)면 send_game_created 알림을 기다림)
+      if (res.data.status === "game_created") navigate(`/balancegame/${res.data.round_id}`);
     } catch (err) {
       const status = err.response?.status;
       if (status === 403) setErrorMsg("이 파티의 참가자만 대기할 수 있습니다.");